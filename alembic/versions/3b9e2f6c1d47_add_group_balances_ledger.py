@@ -0,0 +1,52 @@
+"""add group balances ledger
+
+Revision ID: 3b9e2f6c1d47
+Revises: 133f1afd01a6
+Create Date: 2026-10-18 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e2f6c1d47'
+down_revision: Union[str, Sequence[str], None] = '133f1afd01a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('group_balances',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('balance', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('group_id', 'user_id')
+    )
+    op.execute(
+        """
+        INSERT INTO group_balances (group_id, user_id, balance)
+        SELECT group_id, user_id, ROUND(CAST(SUM(amount) AS NUMERIC), 2)
+        FROM (
+            SELECT group_id, paid_by AS user_id, amount
+            FROM expenses
+            WHERE group_id IS NOT NULL
+            UNION ALL
+            SELECT e.group_id, s.user_id, -s.share_amount
+            FROM expense_shares s
+            JOIN expenses e ON e.id = s.expense_id
+            WHERE e.group_id IS NOT NULL
+        ) AS movements
+        GROUP BY group_id, user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('group_balances')
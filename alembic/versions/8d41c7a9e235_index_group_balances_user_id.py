@@ -0,0 +1,28 @@
+"""index group_balances user_id
+
+Revision ID: 8d41c7a9e235
+Revises: 3b9e2f6c1d47
+Create Date: 2026-10-18 10:02:17.540391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41c7a9e235'
+down_revision: Union[str, Sequence[str], None] = '3b9e2f6c1d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_group_balances_user_id'), 'group_balances', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_group_balances_user_id'), table_name='group_balances')
@@ -0,0 +1,43 @@
+"""add currencies and fx rates
+
+Revision ID: a58e0d7c3b96
+Revises: f19b6d3c8e42
+Create Date: 2026-10-18 19:26:08.715342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a58e0d7c3b96'
+down_revision: Union[str, Sequence[str], None] = 'f19b6d3c8e42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('fx_rates',
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('rate_date', sa.Date(), nullable=False),
+    sa.Column('rate', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('currency', 'rate_date')
+    )
+    op.add_column('groups', sa.Column('base_currency', sa.String(length=3), server_default=settings.DEFAULT_CURRENCY, nullable=False))
+    op.add_column('expenses', sa.Column('currency', sa.String(length=3), nullable=True))
+    op.add_column('expenses', sa.Column('original_amount', sa.Float(), nullable=True))
+    op.add_column('expenses', sa.Column('fx_rate', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('expenses', 'fx_rate')
+    op.drop_column('expenses', 'original_amount')
+    op.drop_column('expenses', 'currency')
+    op.drop_column('groups', 'base_currency')
+    op.drop_table('fx_rates')
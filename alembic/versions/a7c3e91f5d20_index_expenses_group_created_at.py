@@ -0,0 +1,28 @@
+"""index expenses on group_id, created_at, id
+
+Revision ID: a7c3e91f5d20
+Revises: f4c81d9a6b27
+Create Date: 2026-10-18 14:02:17.381552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91f5d20'
+down_revision: Union[str, Sequence[str], None] = 'f4c81d9a6b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_expenses_group_created_at', 'expenses', ['group_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_expenses_group_created_at', table_name='expenses')
@@ -0,0 +1,28 @@
+"""add occurrence date to expenses
+
+Revision ID: b7d2e9f41c58
+Revises: f2a83d5c9b14
+Create Date: 2026-10-18 23:41:17.208553
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e9f41c58'
+down_revision: Union[str, Sequence[str], None] = 'f2a83d5c9b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('expenses', sa.Column('occurrence_date', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('expenses', 'occurrence_date')
@@ -0,0 +1,59 @@
+"""add expense description search
+
+Revision ID: b81d4f2e6a93
+Revises: a7c3e91f5d20
+Create Date: 2026-10-18 15:21:44.902733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d4f2e6a93'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e91f5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_index('ix_expenses_description_tsv', 'expenses', [sa.text("to_tsvector('simple', coalesce(description, ''))")], unique=False, postgresql_using='gin')
+    else:
+        op.execute("CREATE VIRTUAL TABLE expenses_fts USING fts5(description, content='expenses', content_rowid='id')")
+        op.execute(
+            """
+            CREATE TRIGGER expenses_fts_ai AFTER INSERT ON expenses BEGIN
+                INSERT INTO expenses_fts(rowid, description) VALUES (new.id, new.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER expenses_fts_ad AFTER DELETE ON expenses BEGIN
+                INSERT INTO expenses_fts(expenses_fts, rowid, description) VALUES ('delete', old.id, old.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER expenses_fts_au AFTER UPDATE OF description ON expenses BEGIN
+                INSERT INTO expenses_fts(expenses_fts, rowid, description) VALUES ('delete', old.id, old.description);
+                INSERT INTO expenses_fts(rowid, description) VALUES (new.id, new.description);
+            END
+            """
+        )
+        op.execute("INSERT INTO expenses_fts(expenses_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_expenses_description_tsv', table_name='expenses', postgresql_using='gin')
+    else:
+        for trigger in ('expenses_fts_ai', 'expenses_fts_ad', 'expenses_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS expenses_fts')
@@ -0,0 +1,40 @@
+"""add spending daily rollups
+
+Revision ID: c2f71a8d4e05
+Revises: a58e0d7c3b96
+Create Date: 2026-10-18 20:02:47.318254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f71a8d4e05'
+down_revision: Union[str, Sequence[str], None] = 'a58e0d7c3b96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('spending_daily_rollups',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('paid', sa.Float(), nullable=False),
+    sa.Column('share', sa.Float(), nullable=False),
+    sa.Column('expense_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('group_id', 'user_id', 'day')
+    )
+    op.create_index('ix_spending_daily_rollups_user_day', 'spending_daily_rollups', ['user_id', 'day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_spending_daily_rollups_user_day', table_name='spending_daily_rollups')
+    op.drop_table('spending_daily_rollups')
@@ -0,0 +1,28 @@
+"""add version to groups
+
+Revision ID: c5a0e4d2b918
+Revises: 8d41c7a9e235
+Create Date: 2026-10-18 11:26:53.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a0e4d2b918'
+down_revision: Union[str, Sequence[str], None] = '8d41c7a9e235'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('groups', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('groups', 'version')
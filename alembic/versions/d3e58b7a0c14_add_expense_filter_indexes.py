@@ -0,0 +1,32 @@
+"""add expense filter indexes
+
+Revision ID: d3e58b7a0c14
+Revises: b81d4f2e6a93
+Create Date: 2026-10-18 16:05:12.517906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3e58b7a0c14'
+down_revision: Union[str, Sequence[str], None] = 'b81d4f2e6a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_expenses_group_payer_created_at', 'expenses', ['group_id', 'paid_by', 'created_at'], unique=False)
+    op.create_index('ix_expense_shares_expense_user', 'expense_shares', ['expense_id', 'user_id'], unique=False)
+    op.create_index('ix_expense_shares_user_expense', 'expense_shares', ['user_id', 'expense_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_expense_shares_user_expense', table_name='expense_shares')
+    op.drop_index('ix_expense_shares_expense_user', table_name='expense_shares')
+    op.drop_index('ix_expenses_group_payer_created_at', table_name='expenses')
@@ -0,0 +1,44 @@
+"""add activity feed
+
+Revision ID: d84b2c6e1f37
+Revises: c2f71a8d4e05
+Create Date: 2026-10-18 20:31:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd84b2c6e1f37'
+down_revision: Union[str, Sequence[str], None] = 'c2f71a8d4e05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('activity_feed',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=True),
+    sa.Column('event_type', sa.Enum('EXPENSE_CREATED', 'EXPENSE_UPDATED', 'EXPENSE_DELETED', 'MEMBER_ADDED', 'MEMBER_REMOVED', 'SETTLEMENT_RECORDED', name='activitytype'), nullable=False),
+    sa.Column('expense_id', sa.Integer(), nullable=True),
+    sa.Column('data', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_activity_feed_user_id_id', 'activity_feed', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activity_feed_user_id_id', table_name='activity_feed')
+    op.drop_table('activity_feed')
+    sa.Enum(name='activitytype').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,42 @@
+"""add is_settlement to expenses
+
+Revision ID: e2f7b3a95c06
+Revises: c5a0e4d2b918
+Create Date: 2026-10-18 12:40:09.271583
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f7b3a95c06'
+down_revision: Union[str, Sequence[str], None] = 'c5a0e4d2b918'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('expenses', sa.Column('is_settlement', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    # Settlements used to be recognised only by their description; their
+    # shares are the only ones ever written with is_paid set.
+    op.execute(
+        """
+        UPDATE expenses SET is_settlement = true
+        WHERE description LIKE 'Settlement payment from %'
+          AND EXISTS (
+              SELECT 1 FROM expense_shares s
+              WHERE s.expense_id = expenses.id AND s.is_paid
+          )
+        """
+    )
+    op.create_index('ix_expenses_group_settlements', 'expenses', ['group_id', 'created_at', 'id'], unique=False, postgresql_where=sa.text('is_settlement'), sqlite_where=sa.text('is_settlement'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_expenses_group_settlements', table_name='expenses', postgresql_where=sa.text('is_settlement'), sqlite_where=sa.text('is_settlement'))
+    op.drop_column('expenses', 'is_settlement')
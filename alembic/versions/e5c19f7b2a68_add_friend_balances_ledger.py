@@ -0,0 +1,62 @@
+"""add friend balances ledger
+
+Revision ID: e5c19f7b2a68
+Revises: d84b2c6e1f37
+Create Date: 2026-10-18 20:58:33.470192
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c19f7b2a68'
+down_revision: Union[str, Sequence[str], None] = 'd84b2c6e1f37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('friend_balances',
+    sa.Column('user_low', sa.Integer(), nullable=False),
+    sa.Column('user_high', sa.Integer(), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('balance', sa.Float(), nullable=False),
+    sa.CheckConstraint('user_low < user_high', name='ck_friend_balances_pair_order'),
+    sa.ForeignKeyConstraint(['user_high'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_low'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_low', 'user_high', 'currency')
+    )
+    op.create_index(op.f('ix_friend_balances_user_high'), 'friend_balances', ['user_high'], unique=False)
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO friend_balances (user_low, user_high, currency, balance)
+            SELECT user_low, user_high, currency,
+                   ROUND(CAST(SUM(amount) AS NUMERIC), 2)
+            FROM (
+                SELECT LEAST(s.user_id, e.paid_by) AS user_low,
+                       GREATEST(s.user_id, e.paid_by) AS user_high,
+                       COALESCE(e.currency, :default_currency) AS currency,
+                       CASE WHEN e.paid_by < s.user_id
+                            THEN s.share_amount ELSE -s.share_amount END AS amount
+                FROM expense_shares s
+                JOIN expenses e ON e.id = s.expense_id
+                WHERE e.group_id IS NULL AND s.user_id <> e.paid_by
+            ) AS debts
+            GROUP BY user_low, user_high, currency
+            HAVING ROUND(CAST(SUM(amount) AS NUMERIC), 2) <> 0
+            """
+        ).bindparams(default_currency=settings.DEFAULT_CURRENCY)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_friend_balances_user_high'), table_name='friend_balances')
+    op.drop_table('friend_balances')
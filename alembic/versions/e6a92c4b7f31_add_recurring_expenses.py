@@ -0,0 +1,61 @@
+"""add recurring expenses
+
+Revision ID: e6a92c4b7f31
+Revises: d3e58b7a0c14
+Create Date: 2026-10-18 17:12:30.664018
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a92c4b7f31'
+down_revision: Union[str, Sequence[str], None] = 'd3e58b7a0c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('recurring_expenses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('expense_type', postgresql.ENUM('EQUAL', 'EXACT', 'PERCENTAGE', name='expensetype', create_type=False), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('cadence', sa.Enum('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY', name='recurrencecadence'), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('next_run_on', sa.Date(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), server_default=sa.text('true'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recurring_expenses_id'), 'recurring_expenses', ['id'], unique=False)
+    op.create_index(op.f('ix_recurring_expenses_group_id'), 'recurring_expenses', ['group_id'], unique=False)
+    op.create_index('ix_recurring_expenses_due', 'recurring_expenses', ['next_run_on', 'id'], unique=False, postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+    op.create_table('recurring_expense_occurrences',
+    sa.Column('template_id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('expense_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['expense_id'], ['expenses.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['template_id'], ['recurring_expenses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('template_id', 'period')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('recurring_expense_occurrences')
+    op.drop_index('ix_recurring_expenses_due', table_name='recurring_expenses', postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+    op.drop_index(op.f('ix_recurring_expenses_group_id'), table_name='recurring_expenses')
+    op.drop_index(op.f('ix_recurring_expenses_id'), table_name='recurring_expenses')
+    op.drop_table('recurring_expenses')
+    sa.Enum(name='recurrencecadence').drop(op.get_bind(), checkfirst=True)
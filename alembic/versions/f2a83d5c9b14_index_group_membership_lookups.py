@@ -0,0 +1,32 @@
+"""index group membership lookups
+
+Revision ID: f2a83d5c9b14
+Revises: e5c19f7b2a68
+Create Date: 2026-10-18 21:24:05.661938
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a83d5c9b14'
+down_revision: Union[str, Sequence[str], None] = 'e5c19f7b2a68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_group_members_group_user', 'group_members', ['group_id', 'user_id'], unique=False)
+    op.create_index('ix_group_members_user_group', 'group_members', ['user_id', 'group_id'], unique=False)
+    op.create_index(op.f('ix_groups_creator_id'), 'groups', ['creator_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_groups_creator_id'), table_name='groups')
+    op.drop_index('ix_group_members_user_group', table_name='group_members')
+    op.drop_index('ix_group_members_group_user', table_name='group_members')
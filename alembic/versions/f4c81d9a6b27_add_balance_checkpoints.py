@@ -0,0 +1,36 @@
+"""add balance checkpoints
+
+Revision ID: f4c81d9a6b27
+Revises: e2f7b3a95c06
+Create Date: 2026-10-18 13:58:36.402915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c81d9a6b27'
+down_revision: Union[str, Sequence[str], None] = 'e2f7b3a95c06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('balance_checkpoints',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('as_of_expense_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('balance', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('group_id', 'as_of_expense_id', 'user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('balance_checkpoints')
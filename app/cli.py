@@ -0,0 +1,195 @@
+import argparse
+from datetime import date
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.settlement_repository import SettlementRepository
+from app.repositories.balance_repository import BalanceRepository
+from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.group_repository import GroupRepository
+from app.repositories.recurring_expense_repository import RecurringExpenseRepository
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.repositories.fx_rate_repository import FxRateRepository
+from app.repositories.spending_rollup_repository import SpendingRollupRepository
+from app.services.settlement_service import SettlementService
+from app.services.expense_service import ExpenseService
+from app.services.recurring_expense_service import RecurringExpenseService
+from app.services.idempotency_service import IdempotencyService
+from app.services.fx_service import FxService
+from app.services.analytics_service import AnalyticsService
+
+
+def rebuild_balances(args):
+    service = SettlementService(SettlementRepository(), BalanceRepository())
+    db = SessionLocal()
+    try:
+        group_ids = args.group_id or service.settlement_repo.get_all_group_ids(db)
+        for group_id in group_ids:
+            balances = service.rebuild_group_ledger(
+                db, group_id, from_checkpoint=not args.full
+            )
+            print(f"Group {group_id}: rebuilt {len(balances)} balance(s)")
+    finally:
+        db.close()
+
+
+def rebuild_friend_balances(args):
+    service = SettlementService(SettlementRepository(), BalanceRepository())
+    db = SessionLocal()
+    try:
+        count = service.rebuild_friend_ledger(db)
+        print(f"Rebuilt {count} friend balance(s)")
+    finally:
+        db.close()
+
+
+def checkpoint_balances(args):
+    service = SettlementService(SettlementRepository(), BalanceRepository())
+    db = SessionLocal()
+    try:
+        group_ids = args.group_id or service.settlement_repo.get_all_group_ids(db)
+        for group_id in group_ids:
+            as_of_expense_id = service.create_group_checkpoint(
+                db, group_id, min_expenses=args.min_expenses
+            )
+            if as_of_expense_id is not None:
+                print(f"Group {group_id}: checkpoint at expense {as_of_expense_id}")
+    finally:
+        db.close()
+
+
+def run_recurring(args):
+    service = RecurringExpenseService(
+        RecurringExpenseRepository(),
+        ExpenseService(ExpenseRepository(), GroupRepository(), BalanceRepository()),
+    )
+    db = SessionLocal()
+    try:
+        result = service.run_due(db, args.as_of, batch_size=args.batch_size)
+        for error in result["errors"]:
+            print(
+                f"Recurring expense {error['template_id']} ({error['period']}): "
+                f"skipped: {error['error']}"
+            )
+        print(
+            f"{result['templates']} template(s) due: created {result['created']} "
+            f"expense(s), skipped {result['skipped']}"
+        )
+    finally:
+        db.close()
+
+
+def purge_idempotency_keys(args):
+    service = IdempotencyService(
+        IdempotencyRepository(),
+        ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+        lock_timeout_seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS,
+    )
+    db = SessionLocal()
+    try:
+        print(f"Deleted {service.purge_expired(db)} expired idempotency key(s)")
+    finally:
+        db.close()
+
+
+def load_fx_rates(args):
+    service = FxService(FxRateRepository(), settings.FX_REFERENCE_CURRENCY)
+    db = SessionLocal()
+    try:
+        for path in args.path:
+            count = service.load_rates_file(db, path)
+            print(f"{path}: loaded {count} rate(s)")
+    finally:
+        db.close()
+
+
+def backfill_rollups(args):
+    service = AnalyticsService(SpendingRollupRepository(), GroupRepository())
+    db = SessionLocal()
+    try:
+        group_ids = args.group_id or SettlementRepository().get_all_group_ids(db)
+        for group_id in group_ids:
+            count = service.backfill_group(db, group_id, args.chunk_size)
+            print(f"Group {group_id}: rolled up {count} expense(s)")
+    finally:
+        db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = subparsers.add_parser(
+        "rebuild-balances", help="Recompute the group balance ledger from expenses"
+    )
+    rebuild.add_argument("--group-id", type=int, action="append")
+    rebuild.add_argument(
+        "--full", action="store_true", help="Ignore checkpoints and rescan everything"
+    )
+    rebuild.set_defaults(func=rebuild_balances)
+
+    rebuild_friends = subparsers.add_parser(
+        "rebuild-friend-balances",
+        help="Recompute the friend ledger from expenses outside any group",
+    )
+    rebuild_friends.set_defaults(func=rebuild_friend_balances)
+
+    checkpoint = subparsers.add_parser(
+        "checkpoint-balances", help="Snapshot group balances for fast recompute"
+    )
+    checkpoint.add_argument("--group-id", type=int, action="append")
+    checkpoint.add_argument(
+        "--min-expenses",
+        type=int,
+        default=settings.BALANCE_CHECKPOINT_MIN_EXPENSES,
+        help="Only checkpoint groups with at least this many new expenses",
+    )
+    checkpoint.set_defaults(func=checkpoint_balances)
+
+    recurring = subparsers.add_parser(
+        "run-recurring", help="Create all due occurrences of recurring expenses"
+    )
+    recurring.add_argument(
+        "--as-of",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="Create occurrences due on or before this date (YYYY-MM-DD)",
+    )
+    recurring.add_argument(
+        "--batch-size", type=int, default=settings.RECURRING_BATCH_SIZE
+    )
+    recurring.set_defaults(func=run_recurring)
+
+    purge = subparsers.add_parser(
+        "purge-idempotency-keys", help="Delete expired Idempotency-Key records"
+    )
+    purge.set_defaults(func=purge_idempotency_keys)
+
+    fx = subparsers.add_parser(
+        "load-fx-rates",
+        help=(
+            "Load exchange rates from CSV files with date,currency,rate columns, "
+            f"rate being units of currency per 1 {settings.FX_REFERENCE_CURRENCY}"
+        ),
+    )
+    fx.add_argument("path", nargs="+")
+    fx.set_defaults(func=load_fx_rates)
+
+    backfill = subparsers.add_parser(
+        "backfill-rollups", help="Rebuild the daily spending rollups from expenses"
+    )
+    backfill.add_argument("--group-id", type=int, action="append")
+    backfill.add_argument(
+        "--chunk-size",
+        type=int,
+        default=settings.ROLLUP_BACKFILL_CHUNK_SIZE,
+        help="Expense id range aggregated per query",
+    )
+    backfill.set_defaults(func=backfill_rollups)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,39 @@ class Settings:
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(
         os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES") or 60
     )
+    SETTLEMENT_CACHE_SIZE: int = int(os.getenv("SETTLEMENT_CACHE_SIZE") or 1024)
+    BALANCE_CHECKPOINT_MIN_EXPENSES: int = int(
+        os.getenv("BALANCE_CHECKPOINT_MIN_EXPENSES") or 1000
+    )
+    # Expenses younger than this may still belong to uncommitted transactions
+    # with lower ids, so checkpoints never cover them.
+    BALANCE_CHECKPOINT_LAG_SECONDS: int = int(
+        os.getenv("BALANCE_CHECKPOINT_LAG_SECONDS") or 300
+    )
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE") or 500)
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS") or 1000)
+    EXPENSE_STREAM_BATCH_SIZE: int = int(os.getenv("EXPENSE_STREAM_BATCH_SIZE") or 500)
+    RECURRING_BATCH_SIZE: int = int(os.getenv("RECURRING_BATCH_SIZE") or 200)
+    ROLLUP_BACKFILL_CHUNK_SIZE: int = int(
+        os.getenv("ROLLUP_BACKFILL_CHUNK_SIZE") or 5000
+    )
+    DEFAULT_CURRENCY: str = os.getenv("DEFAULT_CURRENCY") or "USD"
+    # fx_rates are stored as units of each currency per one unit of this one
+    FX_REFERENCE_CURRENCY: str = os.getenv("FX_REFERENCE_CURRENCY") or "USD"
+    FX_RATE_CACHE_SIZE: int = int(os.getenv("FX_RATE_CACHE_SIZE") or 4096)
+    # Rates are loaded by the CLI, so the API only sees them once cached ones expire
+    FX_RATE_CACHE_TTL_SECONDS: float = float(
+        os.getenv("FX_RATE_CACHE_TTL_SECONDS") or 300
+    )
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS") or 86400)
+    # Retry-After sent with the 409 for a duplicate of a request still running
+    IDEMPOTENCY_RETRY_AFTER_SECONDS: int = int(
+        os.getenv("IDEMPOTENCY_RETRY_AFTER_SECONDS") or 1
+    )
+    # A key still in progress after this long is assumed abandoned
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS: int = int(
+        os.getenv("IDEMPOTENCY_LOCK_TIMEOUT_SECONDS") or 300
+    )
 
 
 settings = Settings()
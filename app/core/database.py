@@ -1,8 +1,18 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.core.config import settings
 
 engine = create_engine(settings.DATABASE_URL, future=True)
+if engine.dialect.name == "sqlite":
+    # SQLite only enforces foreign keys (and ON DELETE CASCADE) when asked to
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 Base = declarative_base()
 
@@ -13,3 +23,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def upsert_insert(db: Session, model):
+    """Dialect-specific INSERT that supports ``on_conflict_do_*``."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -6,6 +6,9 @@ from app.routes.expenses_routes import ExpenseRoutes
 from app.routes.user_routes import UserRoutes
 from app.routes.groups_routes import GroupRoutes
 from app.routes.settlement_routes import SettlementRoutes
+from app.routes.recurring_expense_routes import RecurringExpenseRoutes
+from app.routes.analytics_routes import AnalyticsRoutes
+from app.routes.activity_routes import ActivityRoutes
 from app.core.database import Base, engine
 
 Base.metadata.create_all(bind=engine)
@@ -23,15 +26,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 
 expenses_routes = ExpenseRoutes()
 groups_routes = GroupRoutes()
 user_routes = UserRoutes()
 settlement_routes = SettlementRoutes()
+recurring_expense_routes = RecurringExpenseRoutes()
+analytics_routes = AnalyticsRoutes()
+activity_routes = ActivityRoutes()
 
 app.include_router(auth_routes.router)
 app.include_router(expenses_routes.router)
 app.include_router(user_routes.router)
 app.include_router(groups_routes.router)
 app.include_router(settlement_routes.router)
+app.include_router(recurring_expense_routes.router)
+app.include_router(analytics_routes.router)
+app.include_router(activity_routes.router)
@@ -3,3 +3,12 @@ from app.models.group import Group
 from app.models.group_member import GroupMember
 from app.models.expense import Expense, ExpenseType
 from app.models.expense_share import ExpenseShare
+from app.models.group_balance import GroupBalance
+from app.models.balance_checkpoint import BalanceCheckpoint
+from app.models.recurring_expense import RecurringExpense, RecurrenceCadence
+from app.models.recurring_expense_occurrence import RecurringExpenseOccurrence
+from app.models.idempotency_key import IdempotencyKey
+from app.models.fx_rate import FxRate
+from app.models.spending_rollup import SpendingRollup
+from app.models.activity import Activity, ActivityType
+from app.models.friend_balance import FriendBalance
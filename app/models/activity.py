@@ -0,0 +1,48 @@
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    func,
+)
+from app.core.database import Base
+import enum
+
+
+class ActivityType(str, enum.Enum):
+    EXPENSE_CREATED = "expense_created"
+    EXPENSE_UPDATED = "expense_updated"
+    EXPENSE_DELETED = "expense_deleted"
+    MEMBER_ADDED = "member_added"
+    MEMBER_REMOVED = "member_removed"
+    SETTLEMENT_RECORDED = "settlement_recorded"
+
+
+class Activity(Base):
+    """One row per event per group member, so a user's feed is a range scan
+    of (user_id, id)."""
+
+    __tablename__ = "activity_feed"
+
+    id = Column(Integer, primary_key=True)
+    # The member whose feed this row belongs to
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    group_id = Column(
+        Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False
+    )
+    # NULL for events without a requesting user, e.g. recurring expenses
+    actor_id = Column(
+        Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    event_type = Column(Enum(ActivityType), nullable=False)
+    # Not a foreign key: deleted expenses stay referenced in the feed
+    expense_id = Column(Integer, nullable=True)
+    data = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("ix_activity_feed_user_id_id", "user_id", "id"),)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey
+from app.core.database import Base
+
+
+class BalanceCheckpoint(Base):
+    __tablename__ = "balance_checkpoints"
+
+    group_id = Column(
+        Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True
+    )
+    as_of_expense_id = Column(Integer, primary_key=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    balance = Column(Float, nullable=False)
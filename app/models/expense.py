@@ -1,4 +1,20 @@
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, Enum, func
+from sqlalchemy import (
+    DDL,
+    Column,
+    Integer,
+    Float,
+    String,
+    Boolean,
+    Date,
+    ForeignKey,
+    DateTime,
+    Enum,
+    Index,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum
@@ -23,10 +39,78 @@ class Expense(Base):
         Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=True
     )
     expense_type = Column(Enum(ExpenseType), nullable=False, default=ExpenseType.EQUAL)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # amount and share amounts are in the group's base currency; these record
+    # what was entered. NULL currency means it was entered in the base currency.
+    currency = Column(String(3), nullable=True)
+    original_amount = Column(Float, nullable=True)
+    fx_rate = Column(Float, nullable=True)
+    is_settlement = Column(
+        Boolean, nullable=False, default=False, server_default=text("false")
+    )
+    # The period a recurring template generated this expense for. created_at
+    # stays the insert time, since checkpoints rely on ids following it.
+    occurrence_date = Column(Date, nullable=True)
+    # SQLite stores CURRENT_TIMESTAMP without microseconds; bind cursor values
+    # in the same format so keyset comparisons on ties stay exact.
+    created_at = Column(
+        DateTime(timezone=True).with_variant(
+            sqlite.DATETIME(truncate_microseconds=True), "sqlite"
+        ),
+        server_default=func.now(),
+    )
 
     group = relationship("Group", back_populates="expenses")
     payer = relationship("User", back_populates="payments")
     shares = relationship(
         "ExpenseShare", back_populates="expense", cascade="all, delete-orphan"
     )
+
+    # Fetch created_at in the INSERT, since the rollup day is derived from it
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        Index("ix_expenses_group_created_at", "group_id", "created_at", "id"),
+        Index(
+            "ix_expenses_group_payer_created_at", "group_id", "paid_by", "created_at"
+        ),
+        Index(
+            "ix_expenses_description_tsv",
+            func.to_tsvector(text("'simple'"), func.coalesce(description, text("''"))),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_expenses_group_settlements",
+            "group_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_settlement"),
+            sqlite_where=text("is_settlement"),
+        ),
+    )
+
+
+# SQLite has no tsvector; keep an external-content FTS5 index over
+# description in sync with triggers instead.
+EXPENSES_FTS_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS expenses_fts USING fts5("
+    "description, content='expenses', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS expenses_fts_ai AFTER INSERT ON expenses BEGIN "
+    "INSERT INTO expenses_fts(rowid, description) VALUES (new.id, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS expenses_fts_ad AFTER DELETE ON expenses BEGIN "
+    "INSERT INTO expenses_fts(expenses_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS expenses_fts_au AFTER UPDATE OF description ON expenses BEGIN "
+    "INSERT INTO expenses_fts(expenses_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    "INSERT INTO expenses_fts(rowid, description) VALUES (new.id, new.description); "
+    "END",
+)
+
+for statement in EXPENSES_FTS_SQLITE_DDL:
+    event.listen(
+        Expense.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, Float, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -18,3 +18,8 @@ class ExpenseShare(Base):
 
     expense = relationship("Expense", back_populates="shares")
     user = relationship("User", back_populates="shares")
+
+    __table_args__ = (
+        Index("ix_expense_shares_expense_user", "expense_id", "user_id"),
+        Index("ix_expense_shares_user_expense", "user_id", "expense_id"),
+    )
@@ -0,0 +1,28 @@
+from sqlalchemy import CheckConstraint, Column, Float, ForeignKey, Integer, String
+from app.core.database import Base
+
+
+class FriendBalance(Base):
+    """Net of the non-group expenses between two users, stored once per
+    pair and currency with user_low < user_high."""
+
+    __tablename__ = "friend_balances"
+
+    user_low = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_high = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    # Non-group expenses have no base currency to convert to, so each pair
+    # keeps one balance per currency the expenses were entered in
+    currency = Column(String(3), primary_key=True)
+    # Positive when user_high owes user_low
+    balance = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        CheckConstraint("user_low < user_high", name="ck_friend_balances_pair_order"),
+    )
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Date, Float, String
+from app.core.database import Base
+
+
+class FxRate(Base):
+    __tablename__ = "fx_rates"
+
+    # Units of `currency` per one unit of settings.FX_REFERENCE_CURRENCY
+    currency = Column(String(3), primary_key=True)
+    rate_date = Column(Date, primary_key=True)
+    rate = Column(Float, nullable=False)
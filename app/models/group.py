@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
+from app.core.config import settings
 from app.core.database import Base
 
 
@@ -10,7 +11,15 @@ class Group(Base):
     name = Column(String(150), nullable=False)
     description = Column(String(500), nullable=True)
 
-    creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    creator_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Expense amounts and balances in this group are stored in this currency
+    base_currency = Column(
+        String(3),
+        nullable=False,
+        default=settings.DEFAULT_CURRENCY,
+        server_default=settings.DEFAULT_CURRENCY,
+    )
 
     members = relationship(
         "GroupMember", back_populates="group", cascade="all, delete-orphan"
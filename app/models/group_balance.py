@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey
+from app.core.database import Base
+
+
+class GroupBalance(Base):
+    __tablename__ = "group_balances"
+
+    group_id = Column(
+        Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    balance = Column(Float, nullable=False, default=0.0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -18,3 +18,8 @@ class GroupMember(Base):
 
     group = relationship("Group", back_populates="members")
     user = relationship("User", back_populates="group_memberships")
+
+    __table_args__ = (
+        Index("ix_group_members_group_user", "group_id", "user_id"),
+        Index("ix_group_members_user_group", "user_id", "group_id"),
+    )
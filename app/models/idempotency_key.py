@@ -0,0 +1,18 @@
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    key = Column(String(255), primary_key=True)
+    # sha256 of the method, path and body the key was first used with
+    request_hash = Column(String(64), nullable=False)
+    # NULL while the original request is still running
+    response_status = Column(Integer, nullable=True)
+    response_body = Column(JSON, nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, func
+from app.core.database import Base
+
+
+class RecurringExpenseOccurrence(Base):
+    __tablename__ = "recurring_expense_occurrences"
+
+    template_id = Column(
+        Integer,
+        ForeignKey("recurring_expenses.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    period = Column(Date, primary_key=True)
+    expense_id = Column(
+        Integer, ForeignKey("expenses.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
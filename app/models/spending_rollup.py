@@ -0,0 +1,36 @@
+from datetime import date, datetime, timezone
+from typing import Optional
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer
+from app.core.database import Base
+
+
+class SpendingRollup(Base):
+    """Per-day spending of one member in one group, settlements excluded."""
+
+    __tablename__ = "spending_daily_rollups"
+
+    group_id = Column(
+        Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    # Total of the expenses this user paid for
+    paid = Column(Float, nullable=False, default=0.0)
+    # Total of this user's shares
+    share = Column(Float, nullable=False, default=0.0)
+    expense_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_spending_daily_rollups_user_day", "user_id", "day"),)
+
+
+def rollup_day(created_at: datetime, occurrence_date: Optional[date] = None) -> date:
+    """The day an expense is rolled up under: its recurring occurrence date
+    if it has one, else the UTC day of ``created_at``. SQLite hands back
+    naive timestamps, which are already UTC."""
+    if occurrence_date is not None:
+        return occurrence_date
+    if created_at.tzinfo is None:
+        return created_at.date()
+    return created_at.astimezone(timezone.utc).date()
@@ -0,0 +1,18 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from app.models.activity import Activity
+
+
+class ActivityRepository:
+    def add_bulk(self, db: Session, rows: List[Dict]):
+        if rows:
+            db.execute(insert(Activity), rows)
+
+    def list_for_user(
+        self, db: Session, user_id: int, limit: int, before_id: Optional[int] = None
+    ) -> List[Activity]:
+        query = db.query(Activity).filter(Activity.user_id == user_id)
+        if before_id is not None:
+            query = query.filter(Activity.id < before_id)
+        return query.order_by(Activity.id.desc()).limit(limit).all()
@@ -0,0 +1,208 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import case, exists, func, or_, select
+from sqlalchemy.orm import Session
+from app.core.database import upsert_insert
+from app.models.group import Group
+from app.models.group_balance import GroupBalance
+from app.models.friend_balance import FriendBalance
+from app.models.user import User
+from app.models.balance_checkpoint import BalanceCheckpoint
+from app.models.expense import Expense
+from app.models.group_member import GroupMember
+
+
+class BalanceRepository:
+    def get_group_balances(self, db: Session, group_id: int) -> Dict[int, float]:
+        rows = (
+            db.query(GroupBalance.user_id, GroupBalance.balance)
+            .filter(GroupBalance.group_id == group_id)
+            .all()
+        )
+        return {row.user_id: row.balance for row in rows}
+
+    def get_user_group_balances(self, db: Session, user_id: int) -> List:
+        return (
+            db.query(
+                GroupBalance.group_id,
+                Group.name,
+                Group.base_currency,
+                GroupBalance.balance,
+            )
+            .join(Group, Group.id == GroupBalance.group_id)
+            .filter(
+                GroupBalance.user_id == user_id,
+                exists().where(
+                    GroupMember.group_id == GroupBalance.group_id,
+                    GroupMember.user_id == user_id,
+                ),
+            )
+            .all()
+        )
+
+    def get_balances_in_user_groups(self, db: Session, user_id: int) -> List:
+        """(group_id, group_name, base_currency, user_id, balance) for every
+        member of each group the user belongs to and has an open balance in."""
+        open_groups = select(GroupBalance.group_id).where(
+            GroupBalance.user_id == user_id,
+            func.abs(GroupBalance.balance) >= 0.01,
+            exists().where(
+                GroupMember.group_id == GroupBalance.group_id,
+                GroupMember.user_id == user_id,
+            ),
+        )
+        return (
+            db.query(
+                GroupBalance.group_id,
+                Group.name.label("group_name"),
+                Group.base_currency,
+                GroupBalance.user_id,
+                GroupBalance.balance,
+            )
+            .join(Group, Group.id == GroupBalance.group_id)
+            .filter(GroupBalance.group_id.in_(open_groups))
+            .all()
+        )
+
+    def apply_deltas(self, db: Session, group_id: int, deltas: Dict[int, float]):
+        rows = [
+            {"group_id": group_id, "user_id": user_id, "balance": round(delta, 2)}
+            for user_id, delta in deltas.items()
+            if round(delta, 2) != 0
+        ]
+        if not rows:
+            return
+        stmt = upsert_insert(db, GroupBalance).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[GroupBalance.group_id, GroupBalance.user_id],
+            set_={"balance": GroupBalance.balance + stmt.excluded.balance},
+        )
+        db.execute(stmt)
+
+    def replace_group_balances(
+        self, db: Session, group_id: int, balances: Dict[int, float]
+    ):
+        db.query(GroupBalance).filter(GroupBalance.group_id == group_id).delete(
+            synchronize_session=False
+        )
+        rows = [
+            {"group_id": group_id, "user_id": user_id, "balance": round(balance, 2)}
+            for user_id, balance in balances.items()
+        ]
+        if rows:
+            db.execute(upsert_insert(db, GroupBalance).values(rows))
+
+    def apply_friend_deltas(
+        self, db: Session, deltas: Dict[Tuple[int, int, str], float]
+    ):
+        """Add deltas keyed by (user_low, user_high, currency); positive means
+        user_high owes user_low more."""
+        rows = [
+            {
+                "user_low": low,
+                "user_high": high,
+                "currency": currency,
+                "balance": round(delta, 2),
+            }
+            for (low, high, currency), delta in deltas.items()
+            if round(delta, 2) != 0
+        ]
+        if not rows:
+            return
+        stmt = upsert_insert(db, FriendBalance).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                FriendBalance.user_low,
+                FriendBalance.user_high,
+                FriendBalance.currency,
+            ],
+            set_={"balance": FriendBalance.balance + stmt.excluded.balance},
+        )
+        db.execute(stmt)
+
+    def get_user_friend_balances(self, db: Session, user_id: int) -> List:
+        """(friend_id, username, currency, balance) for every pair the user is
+        in, with balance positive when the friend owes the user."""
+        is_low = FriendBalance.user_low == user_id
+        friend_id = case(
+            (is_low, FriendBalance.user_high), else_=FriendBalance.user_low
+        )
+        return (
+            db.query(
+                friend_id.label("friend_id"),
+                User.username,
+                FriendBalance.currency,
+                case(
+                    (is_low, FriendBalance.balance), else_=-FriendBalance.balance
+                ).label("balance"),
+            )
+            .join(User, User.id == friend_id)
+            .filter(or_(is_low, FriendBalance.user_high == user_id))
+            .all()
+        )
+
+    def replace_friend_balances(
+        self, db: Session, balances: Dict[Tuple[int, int, str], float]
+    ):
+        db.query(FriendBalance).delete(synchronize_session=False)
+        rows = [
+            {
+                "user_low": low,
+                "user_high": high,
+                "currency": currency,
+                "balance": round(balance, 2),
+            }
+            for (low, high, currency), balance in balances.items()
+            if round(balance, 2) != 0
+        ]
+        if rows:
+            db.execute(upsert_insert(db, FriendBalance).values(rows))
+
+    def get_latest_checkpoint(
+        self, db: Session, group_id: int, until: Optional[datetime] = None
+    ) -> Tuple[int, Dict[int, float]]:
+        query = db.query(func.max(BalanceCheckpoint.as_of_expense_id)).filter(
+            BalanceCheckpoint.group_id == group_id
+        )
+        if until is not None:
+            query = query.join(
+                Expense, Expense.id == BalanceCheckpoint.as_of_expense_id
+            ).filter(Expense.created_at <= until)
+        as_of_expense_id = query.scalar()
+        if as_of_expense_id is None:
+            return 0, {}
+
+        rows = (
+            db.query(BalanceCheckpoint.user_id, BalanceCheckpoint.balance)
+            .filter(
+                BalanceCheckpoint.group_id == group_id,
+                BalanceCheckpoint.as_of_expense_id == as_of_expense_id,
+            )
+            .all()
+        )
+        return as_of_expense_id, {row.user_id: row.balance for row in rows}
+
+    def create_checkpoint(
+        self,
+        db: Session,
+        group_id: int,
+        as_of_expense_id: int,
+        balances: Dict[int, float],
+    ):
+        rows = [
+            {
+                "group_id": group_id,
+                "as_of_expense_id": as_of_expense_id,
+                "user_id": user_id,
+                "balance": round(balance, 2),
+            }
+            for user_id, balance in balances.items()
+        ]
+        if rows:
+            db.execute(upsert_insert(db, BalanceCheckpoint).values(rows))
+
+    def invalidate_checkpoints(self, db: Session, group_id: int, expense_id: int):
+        db.query(BalanceCheckpoint).filter(
+            BalanceCheckpoint.group_id == group_id,
+            BalanceCheckpoint.as_of_expense_id >= expense_id,
+        ).delete(synchronize_session=False)
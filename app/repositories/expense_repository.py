@@ -1,40 +1,181 @@
-from sqlalchemy.orm import Session
-from typing import Optional, List
+from datetime import datetime
+from sqlalchemy import (
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.orm import Session, selectinload
+from typing import Dict, Iterator, Optional, List, Tuple
 from app.models.expense import Expense
 from app.models.expense_share import ExpenseShare
+from app.models.group import Group
+from app.models.group_member import GroupMember
+from app.schemas.expense_schema import ExpenseFilters
+
+expenses_fts = table("expenses_fts", column("rowid"))
 
 
 class ExpenseRepository:
     def create(self, db: Session, expense: Expense) -> Expense:
         db.add(expense)
-        db.commit()
-        db.refresh(expense)
+        db.flush()
         return expense
 
+    def create_bulk(
+        self, db: Session, expenses: List[Dict]
+    ) -> List[Tuple[int, datetime]]:
+        """Insert the expenses and return their (id, created_at), in order."""
+        if not expenses:
+            return []
+        return db.execute(
+            insert(Expense).returning(
+                Expense.id, Expense.created_at, sort_by_parameter_order=True
+            ),
+            expenses,
+        ).all()
+
     def get_by_id(self, db: Session, expense_id: int) -> Optional[Expense]:
         return db.query(Expense).filter(Expense.id == expense_id).first()
 
-    def list_for_group(self, db: Session, group_id: int):
-        return db.query(Expense).filter(Expense.group_id == group_id).all()
+    def _apply_filters(self, query, filters: Optional[ExpenseFilters]):
+        if filters is None:
+            return query
+        if filters.start_date is not None:
+            query = query.where(Expense.created_at >= filters.start_date)
+        if filters.end_date is not None:
+            query = query.where(Expense.created_at < filters.end_date)
+        if filters.paid_by is not None:
+            query = query.where(Expense.paid_by == filters.paid_by)
+        if filters.participant_id is not None:
+            query = query.where(
+                exists().where(
+                    ExpenseShare.expense_id == Expense.id,
+                    ExpenseShare.user_id == filters.participant_id,
+                )
+            )
+        if filters.expense_type is not None:
+            query = query.where(Expense.expense_type == filters.expense_type)
+        if filters.min_amount is not None:
+            query = query.where(Expense.amount >= filters.min_amount)
+        if filters.max_amount is not None:
+            query = query.where(Expense.amount <= filters.max_amount)
+        return query
+
+    def list_for_group(
+        self,
+        db: Session,
+        group_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+        filters: Optional[ExpenseFilters] = None,
+    ) -> List[Expense]:
+        query = (
+            db.query(Expense)
+            .options(selectinload(Expense.shares))
+            .filter(Expense.group_id == group_id)
+        )
+        query = self._apply_filters(query, filters)
+        if after is not None:
+            query = query.filter(tuple_(Expense.created_at, Expense.id) < after)
+        return (
+            query.order_by(Expense.created_at.desc(), Expense.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def stream_for_group(
+        self,
+        db: Session,
+        group_id: int,
+        batch_size: int,
+        filters: Optional[ExpenseFilters] = None,
+    ) -> Iterator[Expense]:
+        query = (
+            select(Expense)
+            .options(selectinload(Expense.shares))
+            .where(Expense.group_id == group_id)
+        )
+        return db.scalars(
+            self._apply_filters(query, filters)
+            .order_by(Expense.created_at, Expense.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+    def search(
+        self,
+        db: Session,
+        user_id: int,
+        terms: List[str],
+        limit: int,
+        group_id: Optional[int] = None,
+    ) -> List[Expense]:
+        """Expenses in the user's groups whose description matches every term
+        as a prefix, best match first."""
+        member_groups = select(GroupMember.group_id).where(
+            GroupMember.user_id == user_id
+        )
+        created_groups = select(Group.id).where(Group.creator_id == user_id)
+
+        query = db.query(Expense).options(selectinload(Expense.shares))
+        if db.get_bind().dialect.name == "postgresql":
+            document = func.to_tsvector(
+                text("'simple'"), func.coalesce(Expense.description, text("''"))
+            )
+            ts_query = func.to_tsquery(
+                text("'simple'"), " & ".join(f"{term}:*" for term in terms)
+            )
+            query = query.filter(document.op("@@")(ts_query))
+            rank = func.ts_rank(document, ts_query).desc()
+        else:
+            query = query.join(expenses_fts, expenses_fts.c.rowid == Expense.id).filter(
+                literal_column("expenses_fts").match(
+                    " ".join(f'"{term}"*' for term in terms)
+                )
+            )
+            # bm25() is lower for better matches
+            rank = func.bm25(literal_column("expenses_fts"))
+
+        if group_id is not None:
+            query = query.filter(Expense.group_id == group_id)
+        return (
+            query.filter(Expense.group_id.in_(member_groups.union(created_groups)))
+            .order_by(rank, Expense.created_at.desc(), Expense.id.desc())
+            .limit(limit)
+            .all()
+        )
 
     def update(self, db: Session, expense: Expense):
-        db.commit()
-        db.refresh(expense)
+        db.flush()
         return expense
 
-    def add_share(self, db: Session, share: ExpenseShare) -> ExpenseShare:
-        db.add(share)
-        db.commit()
-        db.refresh(share)
-        return share
+    def add_shares_bulk(self, db: Session, shares: List[Dict]):
+        # No RETURNING: callers never need the new ids, and without it SQLite
+        # batches the rows into one statement as PostgreSQL does.
+        if shares:
+            db.execute(insert(ExpenseShare), shares)
 
     def delete_shares_for_expense(self, db: Session, expense_id: int):
         db.query(ExpenseShare).filter(ExpenseShare.expense_id == expense_id).delete()
-        db.commit()
+
+    def delete_shares(self, db: Session, share_ids: List[int]):
+        if not share_ids:
+            return
+        db.query(ExpenseShare).filter(ExpenseShare.id.in_(share_ids)).delete(
+            synchronize_session=False
+        )
 
     def delete(self, db: Session, expense: Expense):
         db.delete(expense)
-        db.commit()
+        db.flush()
 
     def list_shares(self, db: Session, expense_id: int) -> List[ExpenseShare]:
         return (
@@ -46,3 +187,54 @@ class ExpenseRepository:
         if not exp:
             return None
         return exp, self.list_shares(db, expense_id)
+
+    def get_accessible_with_shares(
+        self, db: Session, expense_ids: List[int], user_id: int
+    ) -> List[Expense]:
+        """The given expenses that the user may change, with their shares: those
+        in the user's groups, and non-group ones the user paid or shares."""
+        member_groups = select(GroupMember.group_id).where(
+            GroupMember.user_id == user_id
+        )
+        created_groups = select(Group.id).where(Group.creator_id == user_id)
+        participant = exists().where(
+            ExpenseShare.expense_id == Expense.id, ExpenseShare.user_id == user_id
+        )
+        return (
+            db.query(Expense)
+            .options(selectinload(Expense.shares))
+            .filter(
+                Expense.id.in_(expense_ids),
+                or_(
+                    Expense.group_id.in_(member_groups.union(created_groups)),
+                    Expense.group_id.is_(None)
+                    & or_(Expense.paid_by == user_id, participant),
+                ),
+            )
+            .order_by(Expense.id)
+            .all()
+        )
+
+    def delete_bulk(self, db: Session, expense_ids: List[int]):
+        """Shares go with their expenses through ON DELETE CASCADE."""
+        if expense_ids:
+            db.execute(
+                delete(Expense)
+                .where(Expense.id.in_(expense_ids))
+                .execution_options(synchronize_session=False)
+            )
+
+    def move_bulk(self, db: Session, expense_ids: List[int], group_id: int):
+        if expense_ids:
+            db.execute(
+                update(Expense)
+                .where(Expense.id.in_(expense_ids))
+                .values(group_id=group_id)
+                .execution_options(synchronize_session=False)
+            )
+
+    def commit(self, db: Session):
+        db.commit()
+
+    def rollback(self, db: Session):
+        db.rollback()
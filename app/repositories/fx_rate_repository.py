@@ -0,0 +1,27 @@
+from datetime import date
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from app.core.database import upsert_insert
+from app.models.fx_rate import FxRate
+
+
+class FxRateRepository:
+    def get_latest(self, db: Session, currency: str, on_date: date) -> Optional[FxRate]:
+        return (
+            db.query(FxRate)
+            .filter(FxRate.currency == currency, FxRate.rate_date <= on_date)
+            .order_by(FxRate.rate_date.desc())
+            .first()
+        )
+
+    def upsert_rates(self, db: Session, rates: List[Dict]):
+        if not rates:
+            return
+        stmt = upsert_insert(db, FxRate).values(rates)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[FxRate.currency, FxRate.rate_date],
+                set_={"rate": stmt.excluded.rate},
+            )
+        )
+        db.commit()
@@ -1,7 +1,9 @@
+from sqlalchemy import case, exists, func, null, or_, select, union
 from sqlalchemy.orm import Session
 from app.models.group import Group
 from app.models.group_member import GroupMember
-from typing import List, Optional
+from app.models.group_balance import GroupBalance
+from typing import Dict, List, Optional, Tuple
 
 
 class GroupRepository:
@@ -66,17 +68,79 @@ class GroupRepository:
         self.remove_member(db, gm)
         return True
 
+    def bump_version(self, db: Session, group_id: int):
+        db.query(Group).filter(Group.id == group_id).update(
+            {Group.version: Group.version + 1}, synchronize_session=False
+        )
+
+    def get_member_ids(self, db: Session, group_id: int) -> set[int]:
+        """Ids of every member of the group, creator included; empty if the
+        group does not exist."""
+        creator = select(Group.creator_id).where(Group.id == group_id)
+        members = select(GroupMember.user_id).where(GroupMember.group_id == group_id)
+        return set(db.scalars(union(creator, members)).all())
+
+    def list_for_user(
+        self,
+        db: Session,
+        user_id: int,
+        limit: int,
+        after_id: Optional[int] = None,
+        with_member_count: bool = False,
+        with_balance: bool = False,
+    ) -> List[Tuple]:
+        """(group, member_count, balance) for the groups the user belongs to
+        or created, in id order. member_count and balance are None unless
+        asked for."""
+        my_groups = union(
+            select(GroupMember.group_id.label("group_id")).where(
+                GroupMember.user_id == user_id
+            ),
+            select(Group.id.label("group_id")).where(Group.creator_id == user_id),
+        ).subquery()
+
+        columns = [Group]
+        if with_member_count:
+            # Same membership rule as get_member_ids: members plus the creator
+            members = (
+                select(func.count())
+                .where(GroupMember.group_id == Group.id)
+                .scalar_subquery()
+            )
+            creator_is_member = exists().where(
+                GroupMember.group_id == Group.id,
+                GroupMember.user_id == Group.creator_id,
+            )
+            columns.append(
+                (members + case((creator_is_member, 0), else_=1)).label("member_count")
+            )
+        else:
+            columns.append(null().label("member_count"))
+        if with_balance:
+            columns.append(func.coalesce(GroupBalance.balance, 0.0).label("balance"))
+        else:
+            columns.append(null().label("balance"))
+
+        query = db.query(*columns).join(my_groups, my_groups.c.group_id == Group.id)
+        if with_balance:
+            query = query.outerjoin(
+                GroupBalance,
+                (GroupBalance.group_id == Group.id) & (GroupBalance.user_id == user_id),
+            )
+        if after_id is not None:
+            query = query.filter(Group.id > after_id)
+        return query.order_by(Group.id).limit(limit).all()
+
+    def get_base_currencies(self, db: Session, group_ids) -> Dict[int, str]:
+        rows = db.query(Group.id, Group.base_currency).filter(Group.id.in_(group_ids))
+        return {row.id: row.base_currency for row in rows}
+
     def get_group(self, db: Session, group_id: int) -> Group | None:
         return db.query(Group).filter(Group.id == group_id).first()
 
     def is_user_in_group(self, db: Session, group_id: int, user_id: int) -> bool:
-        group = self.get_group(db, group_id)
-        if group and group.creator_id == user_id:
-            return True
-
-        return (
-            db.query(GroupMember)
-            .filter(GroupMember.group_id == group_id, GroupMember.user_id == user_id)
-            .count()
-            > 0
+        is_creator = exists().where(Group.id == group_id, Group.creator_id == user_id)
+        is_member = exists().where(
+            GroupMember.group_id == group_id, GroupMember.user_id == user_id
         )
+        return db.query(or_(is_creator, is_member)).scalar()
@@ -0,0 +1,107 @@
+from datetime import datetime
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+from typing import Any, Optional
+from app.core.database import upsert_insert
+from app.models.idempotency_key import IdempotencyKey
+
+
+class IdempotencyRepository:
+    def claim(
+        self,
+        db: Session,
+        user_id: int,
+        key: str,
+        request_hash: str,
+        now: datetime,
+        expires_at: datetime,
+    ) -> bool:
+        stmt = (
+            upsert_insert(db, IdempotencyKey)
+            .values(
+                user_id=user_id,
+                key=key,
+                request_hash=request_hash,
+                locked_at=now,
+                expires_at=expires_at,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[IdempotencyKey.user_id, IdempotencyKey.key]
+            )
+            .returning(IdempotencyKey.key)
+        )
+        claimed = db.execute(stmt).first() is not None
+        db.commit()
+        return claimed
+
+    def reclaim(
+        self,
+        db: Session,
+        user_id: int,
+        key: str,
+        request_hash: str,
+        now: datetime,
+        expires_at: datetime,
+        stale_before: datetime,
+    ) -> bool:
+        """Take over a key that expired, or whose request stopped running
+        before storing a response."""
+        result = db.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                (IdempotencyKey.expires_at <= now)
+                | (
+                    IdempotencyKey.response_status.is_(None)
+                    & (IdempotencyKey.locked_at <= stale_before)
+                ),
+            )
+            .values(
+                request_hash=request_hash,
+                response_status=None,
+                response_body=None,
+                locked_at=now,
+                expires_at=expires_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def get(self, db: Session, user_id: int, key: str) -> Optional[IdempotencyKey]:
+        return (
+            db.query(IdempotencyKey)
+            .populate_existing()
+            .filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .first()
+        )
+
+    def complete(
+        self, db: Session, user_id: int, key: str, status_code: int, body: Any
+    ):
+        db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .values(response_status=status_code, response_body=body)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    def release(self, db: Session, user_id: int, key: str):
+        db.rollback()
+        db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.response_status.is_(None),
+            )
+        )
+        db.commit()
+
+    def purge_expired(self, db: Session, now: datetime) -> int:
+        result = db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now)
+        )
+        db.commit()
+        return result.rowcount
@@ -0,0 +1,86 @@
+from datetime import date
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.database import upsert_insert
+from app.models.recurring_expense import RecurringExpense
+from app.models.recurring_expense_occurrence import RecurringExpenseOccurrence
+
+
+class RecurringExpenseRepository:
+    def create(self, db: Session, template: RecurringExpense) -> RecurringExpense:
+        db.add(template)
+        db.commit()
+        db.refresh(template)
+        return template
+
+    def get_by_id(self, db: Session, template_id: int) -> Optional[RecurringExpense]:
+        return (
+            db.query(RecurringExpense)
+            .filter(RecurringExpense.id == template_id)
+            .first()
+        )
+
+    def list_for_group(self, db: Session, group_id: int) -> List[RecurringExpense]:
+        return (
+            db.query(RecurringExpense)
+            .filter(RecurringExpense.group_id == group_id)
+            .order_by(RecurringExpense.id)
+            .all()
+        )
+
+    def deactivate(self, db: Session, template: RecurringExpense):
+        template.is_active = False
+        db.commit()
+
+    def get_due(
+        self, db: Session, today: date, limit: int, after_id: int = 0
+    ) -> List[RecurringExpense]:
+        return (
+            db.query(RecurringExpense)
+            .filter(
+                RecurringExpense.is_active.is_(True),
+                RecurringExpense.next_run_on <= today,
+                RecurringExpense.id > after_id,
+            )
+            .order_by(RecurringExpense.id)
+            .limit(limit)
+            .all()
+        )
+
+    def claim_occurrences(
+        self, db: Session, occurrences: List[Dict]
+    ) -> Set[Tuple[int, date]]:
+        """Insert (template_id, period) rows, skipping ones that already exist,
+        and return the keys this call inserted."""
+        if not occurrences:
+            return set()
+        stmt = (
+            upsert_insert(db, RecurringExpenseOccurrence)
+            .values(occurrences)
+            .on_conflict_do_nothing(
+                index_elements=[
+                    RecurringExpenseOccurrence.template_id,
+                    RecurringExpenseOccurrence.period,
+                ]
+            )
+            .returning(
+                RecurringExpenseOccurrence.template_id,
+                RecurringExpenseOccurrence.period,
+            )
+        )
+        return {(row.template_id, row.period) for row in db.execute(stmt)}
+
+    def set_occurrence_expenses(self, db: Session, occurrences: List[Dict]):
+        if occurrences:
+            db.execute(update(RecurringExpenseOccurrence), occurrences)
+
+    def update_schedules(self, db: Session, schedules: List[Dict]):
+        if schedules:
+            db.execute(update(RecurringExpense), schedules)
+
+    def commit(self, db: Session):
+        db.commit()
+
+    def rollback(self, db: Session):
+        db.rollback()
@@ -1,6 +1,7 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, insert, select, tuple_, union_all
 from app.models.user import User
 from app.models.group import Group
 from app.models.expense import Expense, ExpenseType
@@ -9,26 +10,98 @@ from app.models.group_member import GroupMember
 
 
 class SettlementRepository:
-    def get_group_expenses(self, db: Session, group_id: int) -> List[Expense]:
-        return db.query(Expense).filter(Expense.group_id == group_id).all()
+    def get_group_net_balances(
+        self,
+        db: Session,
+        group_id: int,
+        after_expense_id: Optional[int] = None,
+        up_to_expense_id: Optional[int] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict[int, float]:
+        conditions = [Expense.group_id == group_id]
+        if after_expense_id is not None:
+            conditions.append(Expense.id > after_expense_id)
+        if up_to_expense_id is not None:
+            conditions.append(Expense.id <= up_to_expense_id)
+        if until is not None:
+            conditions.append(Expense.created_at <= until)
 
-    def get_user_group_memberships(
-        self, db: Session, user_id: int
-    ) -> List[GroupMember]:
-        return db.query(GroupMember).filter(GroupMember.user_id == user_id).all()
+        credits = select(
+            Expense.paid_by.label("user_id"), Expense.amount.label("amount")
+        ).where(*conditions)
+        debits = (
+            select(
+                ExpenseShare.user_id.label("user_id"),
+                (-ExpenseShare.share_amount).label("amount"),
+            )
+            .join(Expense, Expense.id == ExpenseShare.expense_id)
+            .where(*conditions)
+        )
+        movements = union_all(credits, debits).subquery()
+        rows = db.execute(
+            select(movements.c.user_id, func.sum(movements.c.amount)).group_by(
+                movements.c.user_id
+            )
+        ).all()
+        return {user_id: float(balance) for user_id, balance in rows}
+
+    def get_friend_debts(self, db: Session, default_currency: str) -> List:
+        """(debtor_id, creditor_id, currency, amount) summed over all
+        non-group expenses, with no currency meaning ``default_currency``."""
+        currency = func.coalesce(Expense.currency, default_currency)
+        return (
+            db.query(
+                ExpenseShare.user_id.label("debtor_id"),
+                Expense.paid_by.label("creditor_id"),
+                currency.label("currency"),
+                func.sum(ExpenseShare.share_amount).label("amount"),
+            )
+            .join(Expense, Expense.id == ExpenseShare.expense_id)
+            .filter(Expense.group_id.is_(None), ExpenseShare.user_id != Expense.paid_by)
+            .group_by(ExpenseShare.user_id, Expense.paid_by, currency)
+            .all()
+        )
+
+    def get_checkpoint_candidate(
+        self,
+        db: Session,
+        group_id: int,
+        after_expense_id: int,
+        settled_before: datetime,
+    ):
+        return (
+            db.query(
+                func.max(Expense.id).label("expense_id"),
+                func.count(Expense.id).label("expense_count"),
+            )
+            .filter(
+                Expense.group_id == group_id,
+                Expense.id > after_expense_id,
+                Expense.created_at <= settled_before,
+            )
+            .one()
+        )
+
+    def get_all_group_ids(self, db: Session) -> List[int]:
+        return [row.id for row in db.query(Group.id).order_by(Group.id).all()]
 
     def get_group_by_id(self, db: Session, group_id: int) -> Optional[Group]:
         return db.query(Group).filter(Group.id == group_id).first()
 
+    def get_group_version(self, db: Session, group_id: int) -> Optional[int]:
+        return db.query(Group.version).filter(Group.id == group_id).scalar()
+
+    def bump_group_version(self, db: Session, group_id: int):
+        db.query(Group).filter(Group.id == group_id).update(
+            {Group.version: Group.version + 1}, synchronize_session=False
+        )
+
     def get_user_by_id(self, db: Session, user_id: int) -> Optional[User]:
         return db.query(User).filter(User.id == user_id).first()
 
     def get_users_by_ids(self, db: Session, user_ids: List[int]) -> List[User]:
         return db.query(User).filter(User.id.in_(user_ids)).all()
 
-    def get_groups_by_ids(self, db: Session, group_ids: List[int]) -> List[Group]:
-        return db.query(Group).filter(Group.id.in_(group_ids)).all()
-
     def is_user_group_member(self, db: Session, user_id: int, group_id: int) -> bool:
         membership = (
             db.query(GroupMember)
@@ -52,6 +125,7 @@ class SettlementRepository:
             paid_by=paid_by,
             group_id=group_id,
             expense_type=ExpenseType.EXACT,
+            is_settlement=True,
         )
         db.add(settlement_expense)
         db.flush()
@@ -66,14 +140,59 @@ class SettlementRepository:
         db.add(settlement_share)
         return settlement_share
 
-    def get_settlement_history(self, db: Session, group_id: int) -> List[Expense]:
-        return (
+    def create_settlements_bulk(
+        self, db: Session, group_id: int, transfers: List[Tuple[int, int, float, str]]
+    ) -> List[int]:
+        expense_ids = db.scalars(
+            insert(Expense).returning(Expense.id, sort_by_parameter_order=True),
+            [
+                {
+                    "description": description,
+                    "amount": amount,
+                    "paid_by": from_user_id,
+                    "group_id": group_id,
+                    "expense_type": ExpenseType.EXACT,
+                    "is_settlement": True,
+                }
+                for from_user_id, _, amount, description in transfers
+            ],
+        ).all()
+        db.execute(
+            insert(ExpenseShare),
+            [
+                {
+                    "expense_id": expense_id,
+                    "user_id": to_user_id,
+                    "share_amount": amount,
+                    "is_paid": True,
+                }
+                for expense_id, (_, to_user_id, amount, _) in zip(
+                    expense_ids, transfers
+                )
+            ],
+        )
+        return expense_ids
+
+    def get_settlement_history(
+        self,
+        db: Session,
+        group_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Expense]:
+        query = (
             db.query(Expense)
-            .filter(
-                Expense.group_id == group_id,
-                Expense.description.like("%Settlement payment%"),
+            .options(
+                joinedload(Expense.payer),
+                selectinload(Expense.shares).joinedload(ExpenseShare.user),
             )
-            .order_by(Expense.created_at.desc())
+            .filter(Expense.group_id == group_id, Expense.is_settlement.is_(True))
+        )
+        if after is not None:
+            query = query.filter(tuple_(Expense.created_at, Expense.id) < after)
+        return (
+            query.order_by(Expense.created_at.desc(), Expense.id.desc())
+            .limit(limit)
             .all()
         )
 
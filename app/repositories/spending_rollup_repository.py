@@ -0,0 +1,180 @@
+from datetime import date
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from app.core.database import upsert_insert
+from app.models.expense import Expense
+from app.models.expense_share import ExpenseShare
+from app.models.group import Group
+from app.models.spending_rollup import SpendingRollup, rollup_day
+
+
+class SpendingRollupRepository:
+    def apply_deltas(self, db: Session, rows: List[Dict]):
+        """Add ``paid``/``share``/``expense_count`` deltas to (group_id,
+        user_id, day) rows, creating missing ones and deleting the ones a
+        reversal brings back to zero."""
+        rows = [
+            row
+            for row in rows
+            if round(row["paid"], 2) or round(row["share"], 2) or row["expense_count"]
+        ]
+        if not rows:
+            return
+        stmt = upsert_insert(db, SpendingRollup).values(rows)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    SpendingRollup.group_id,
+                    SpendingRollup.user_id,
+                    SpendingRollup.day,
+                ],
+                set_={
+                    "paid": SpendingRollup.paid + stmt.excluded.paid,
+                    "share": SpendingRollup.share + stmt.excluded.share,
+                    "expense_count": SpendingRollup.expense_count
+                    + stmt.excluded.expense_count,
+                },
+            )
+        )
+        reversed_keys = [
+            (row["group_id"], row["user_id"], row["day"])
+            for row in rows
+            if row["paid"] < 0 or row["share"] < 0 or row["expense_count"] < 0
+        ]
+        if reversed_keys:
+            db.query(SpendingRollup).filter(
+                tuple_(
+                    SpendingRollup.group_id, SpendingRollup.user_id, SpendingRollup.day
+                ).in_(reversed_keys),
+                SpendingRollup.expense_count == 0,
+                func.abs(SpendingRollup.paid) < 0.005,
+                func.abs(SpendingRollup.share) < 0.005,
+            ).delete(synchronize_session=False)
+
+    def delete_for_group(self, db: Session, group_id: int):
+        db.query(SpendingRollup).filter(SpendingRollup.group_id == group_id).delete(
+            synchronize_session=False
+        )
+
+    def get_expense_id_range(
+        self, db: Session, group_id: int
+    ) -> Tuple[Optional[int], Optional[int]]:
+        return (
+            db.query(func.min(Expense.id), func.max(Expense.id))
+            .filter(Expense.group_id == group_id, Expense.is_settlement.is_(False))
+            .one()
+        )
+
+    def aggregate_expenses(
+        self, db: Session, group_id: int, first_id: int, last_id: int
+    ) -> List[Dict]:
+        """Rollup rows for the group's non-settlement expenses with ids in
+        [first_id, last_id], each on the same UTC day expense writes use."""
+        in_chunk = (
+            Expense.group_id == group_id,
+            Expense.is_settlement.is_(False),
+            Expense.id.between(first_id, last_id),
+        )
+        rows: Dict[Tuple, Dict] = {}
+
+        def row(user_id, expense_day):
+            key = (user_id, expense_day)
+            if key not in rows:
+                rows[key] = {
+                    "group_id": group_id,
+                    "user_id": user_id,
+                    "day": expense_day,
+                    "paid": 0.0,
+                    "share": 0.0,
+                    "expense_count": 0,
+                }
+            return rows[key]
+
+        # Grouped by created_at rather than by a SQL date(): the day is then
+        # computed by rollup_day, exactly as for live writes, on every dialect.
+        for user_id, created_at, occurrence_date, paid, count in (
+            db.query(
+                Expense.paid_by,
+                Expense.created_at,
+                Expense.occurrence_date,
+                func.sum(Expense.amount),
+                func.count(),
+            )
+            .filter(*in_chunk)
+            .group_by(Expense.paid_by, Expense.created_at, Expense.occurrence_date)
+        ):
+            entry = row(user_id, rollup_day(created_at, occurrence_date))
+            entry["paid"] += paid
+            entry["expense_count"] += count
+
+        for user_id, created_at, occurrence_date, share in (
+            db.query(
+                ExpenseShare.user_id,
+                Expense.created_at,
+                Expense.occurrence_date,
+                func.sum(ExpenseShare.share_amount),
+            )
+            .join(Expense, Expense.id == ExpenseShare.expense_id)
+            .filter(*in_chunk)
+            .group_by(ExpenseShare.user_id, Expense.created_at, Expense.occurrence_date)
+        ):
+            row(user_id, rollup_day(created_at, occurrence_date))["share"] += share
+
+        return list(rows.values())
+
+    def get_group_daily_totals(
+        self, db: Session, group_id: int, start: Optional[date], end: Optional[date]
+    ):
+        query = db.query(
+            SpendingRollup.day,
+            func.sum(SpendingRollup.paid).label("total"),
+            func.sum(SpendingRollup.expense_count).label("expense_count"),
+        ).filter(SpendingRollup.group_id == group_id)
+        query = self._in_range(query, start, end)
+        return query.group_by(SpendingRollup.day).order_by(SpendingRollup.day).all()
+
+    def get_group_member_totals(
+        self, db: Session, group_id: int, start: Optional[date], end: Optional[date]
+    ):
+        query = db.query(
+            SpendingRollup.user_id,
+            func.sum(SpendingRollup.paid).label("paid"),
+            func.sum(SpendingRollup.share).label("share"),
+            func.sum(SpendingRollup.expense_count).label("expense_count"),
+        ).filter(SpendingRollup.group_id == group_id)
+        query = self._in_range(query, start, end)
+        return query.group_by(SpendingRollup.user_id).all()
+
+    def get_user_daily_totals(
+        self, db: Session, user_id: int, start: Optional[date], end: Optional[date]
+    ):
+        query = (
+            db.query(
+                SpendingRollup.day,
+                Group.base_currency,
+                func.sum(SpendingRollup.paid).label("paid"),
+                func.sum(SpendingRollup.share).label("share"),
+            )
+            .join(Group, Group.id == SpendingRollup.group_id)
+            .filter(SpendingRollup.user_id == user_id)
+        )
+        query = self._in_range(query, start, end)
+        return (
+            query.group_by(SpendingRollup.day, Group.base_currency)
+            .order_by(SpendingRollup.day)
+            .all()
+        )
+
+    def _in_range(self, query, start: Optional[date], end: Optional[date]):
+        if start is not None:
+            query = query.filter(SpendingRollup.day >= start)
+        if end is not None:
+            query = query.filter(SpendingRollup.day < end)
+        return query
+
+    def commit(self, db: Session):
+        db.commit()
+
+    def rollback(self, db: Session):
+        db.rollback()
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.database import get_db
+from app.core.pagination import InvalidCursorError
+from app.repositories.activity_repository import ActivityRepository
+from app.repositories.group_repository import GroupRepository
+from app.routes.auth_routes import get_current_user
+from app.schemas.activity_schema import ActivityOut
+from app.services.activity_service import ActivityService
+
+
+class ActivityRoutes:
+    def __init__(self):
+        self.router = APIRouter(prefix="/activity", tags=["activity"])
+        self.service = ActivityService(ActivityRepository(), GroupRepository())
+
+        self.router.add_api_route(
+            "/",
+            self.get_feed,
+            response_model=list[ActivityOut],
+            methods=["GET"],
+            description="Recent activity across all of the caller's groups, newest first. Pass the X-Next-Cursor response header back as `cursor` for the next page",
+        )
+
+    def get_feed(
+        self,
+        response: Response,
+        limit: int = Query(50, ge=1, le=200),
+        cursor: Optional[str] = None,
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ):
+        try:
+            items, next_cursor = self.service.get_feed(
+                db, current_user.id, limit=limit, cursor=cursor
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return items
@@ -0,0 +1,70 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.database import get_db
+from app.repositories.group_repository import GroupRepository
+from app.repositories.spending_rollup_repository import SpendingRollupRepository
+from app.routes.auth_routes import get_current_user
+from app.schemas.analytics_schema import GroupSpendingOut, UserSpendingOut
+from app.services.analytics_service import AnalyticsService
+
+
+def _check_range(start: Optional[date], end: Optional[date]):
+    if start is not None and end is not None and end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+
+class AnalyticsRoutes:
+    def __init__(self):
+        self.router = APIRouter(prefix="/analytics", tags=["analytics"])
+        self.service = AnalyticsService(SpendingRollupRepository(), GroupRepository())
+
+        self.router.add_api_route(
+            "/groups/{group_id}",
+            self.get_group_spending,
+            response_model=GroupSpendingOut,
+            methods=["GET"],
+            description="Monthly totals, top payers and each member's share of spend, settlements excluded. `start` is inclusive, `end` exclusive",
+        )
+
+        self.router.add_api_route(
+            "/users/{user_id}",
+            self.get_user_spending,
+            response_model=UserSpendingOut,
+            methods=["GET"],
+            description="Monthly amounts paid and owed across all of the user's groups, per group base currency",
+        )
+
+    def get_group_spending(
+        self,
+        group_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        top: int = Query(5, ge=1, le=50),
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ):
+        _check_range(start, end)
+        try:
+            return self.service.get_group_spending(
+                db, group_id, current_user.id, start=start, end=end, top=top
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+
+    def get_user_spending(
+        self,
+        user_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ):
+        _check_range(start, end)
+        try:
+            return self.service.get_user_spending(
+                db, user_id, current_user.id, start=start, end=end
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=403, detail=str(e))
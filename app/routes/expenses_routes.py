@@ -1,32 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Header,
+    Query,
+    Request,
+    Response,
+    status,
+    Body,
+)
+from fastapi.responses import StreamingResponse
+from typing import Optional
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.pagination import InvalidCursorError
 from app.services.expense_service import ExpenseService
+from app.services.expense_import_service import (
+    ExpenseImportService,
+    GroupNotFoundError,
+    ImportFormat,
+)
 from app.repositories.expense_repository import ExpenseRepository
 from app.repositories.group_repository import GroupRepository
+from app.repositories.balance_repository import BalanceRepository
 from app.routes.auth_routes import get_current_user
+from app.routes.idempotency import idempotent_response
 from app.models.expense import ExpenseType
 from app.schemas.expense_schema import (
-    EqualExpenseCreate,
-    ExactExpenseCreate,
-    PercentageExpenseCreate,
+    CREATE_SCHEMAS,
     ExpenseWithSharesOut,
     EqualExpenseUpdate,
     ExactExpenseUpdate,
     PercentageExpenseUpdate,
+    ExpenseFilters,
+    ExpenseBatchDelete,
+    ExpenseBatchMove,
+    ExpenseBatchResult,
 )
 
 
 class ExpenseRoutes:
     def __init__(self):
         self.router = APIRouter(prefix="/expenses", tags=["expenses"])
-        self.service = ExpenseService(ExpenseRepository(), GroupRepository())
+        self.service = ExpenseService(
+            ExpenseRepository(), GroupRepository(), BalanceRepository()
+        )
+        self.import_service = ExpenseImportService(self.service, GroupRepository())
 
-        self.payload_mapping = {
-            ExpenseType.EQUAL: EqualExpenseCreate,
-            ExpenseType.EXACT: ExactExpenseCreate,
-            ExpenseType.PERCENTAGE: PercentageExpenseCreate,
-        }
+        self.payload_mapping = CREATE_SCHEMAS
 
         self.update_payload_mapping = {
             ExpenseType.EQUAL: EqualExpenseUpdate,
@@ -42,11 +64,53 @@ class ExpenseRoutes:
             methods=["POST"],
         )
 
+        self.router.add_api_route(
+            "/import/{group_id}",
+            self.import_expenses,
+            methods=["POST"],
+            summary="Import expenses into a group",
+            description="Stream a CSV (with a header row) or NDJSON body, one expense per line. Each row needs an `expense_type` plus the fields of the matching create schema; in CSV, `participant_ids` is `1;2;3` and `shares` is `user_id:value;...`. Rows are inserted and committed in batches of `batch_size`, and rows that fail validation are reported by line number",
+        )
+
         self.router.add_api_route(
             "/group/{group_id}",
             self.list_group_expenses,
             response_model=list[ExpenseWithSharesOut],
             methods=["GET"],
+            description="List a group's expenses, newest first. Pass the X-Next-Cursor response header back as `cursor` to fetch the next page. Optional filters narrow by date range (`start_date` inclusive, `end_date` exclusive), payer, participant, type and amount range",
+        )
+
+        self.router.add_api_route(
+            "/group/{group_id}/stream",
+            self.stream_group_expenses,
+            methods=["GET"],
+            response_class=StreamingResponse,
+            responses={200: {"content": {"application/x-ndjson": {}}}},
+            description="Stream every expense of a group, oldest first, as NDJSON: one `ExpenseWithSharesOut` object per line",
+        )
+
+        self.router.add_api_route(
+            "/search",
+            self.search_expenses,
+            response_model=list[ExpenseWithSharesOut],
+            methods=["GET"],
+            description="Full-text search over expense descriptions in the caller's groups. Every word in `q` must match the start of a word in the description; results are ranked by relevance",
+        )
+
+        self.router.add_api_route(
+            "/batch/delete",
+            self.delete_expenses_bulk,
+            response_model=ExpenseBatchResult,
+            methods=["POST"],
+            description="Delete up to 1000 expenses in one transaction. Nothing is deleted if any of them is missing or not accessible",
+        )
+
+        self.router.add_api_route(
+            "/batch/move",
+            self.move_expenses_bulk,
+            response_model=ExpenseBatchResult,
+            methods=["POST"],
+            description="Move up to 1000 expenses into a group in one transaction. Payers and participants must all be members of it, and the expenses must be in its base currency",
         )
 
         self.router.add_api_route(
@@ -73,40 +137,140 @@ class ExpenseRoutes:
     def create_expense(
         self,
         expense_type: ExpenseType,
+        request: Request,
         payload: dict = Body(...),
+        idempotency_key: Optional[str] = Header(None, max_length=255),
         db: Session = Depends(get_db),
         current_user=Depends(get_current_user),
     ):
         Schema = self.payload_mapping.get(expense_type)
         if not Schema:
             raise HTTPException(status_code=400, detail="Invalid expense type")
+
+        def create(commit: bool = True):
+            try:
+                validated_payload = Schema(**payload)
+                return self.service.create_expense(
+                    db,
+                    validated_payload,
+                    expense_type,
+                    requester_id=current_user.id,
+                    commit=commit,
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        if idempotency_key is None:
+            return create()
+        return idempotent_response(
+            db,
+            current_user.id,
+            idempotency_key,
+            request.method,
+            request.url.path,
+            payload,
+            lambda: (
+                status.HTTP_201_CREATED,
+                ExpenseWithSharesOut.model_validate(create(commit=False)).model_dump(
+                    mode="json"
+                ),
+            ),
+        )
+
+    async def import_expenses(
+        self,
+        group_id: int,
+        request: Request,
+        format: ImportFormat = Query(ImportFormat.CSV),
+        batch_size: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=5000),
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ):
         try:
-            validated_payload = Schema(**payload)
-            return self.service.create_expense(
-                db, validated_payload, expense_type, requester_id=current_user.id
+            return await self.import_service.import_expenses(
+                db,
+                group_id,
+                request.stream(),
+                format,
+                requester_id=current_user.id,
+                batch_size=batch_size,
+                max_errors=settings.IMPORT_MAX_ERRORS,
             )
+        except GroupNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
         except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+            raise HTTPException(status_code=403, detail=str(e))
 
     def list_group_expenses(
         self,
         group_id: int,
+        response: Response,
+        limit: int = Query(100, ge=1, le=500),
+        cursor: Optional[str] = None,
+        filters: ExpenseFilters = Depends(),
         db: Session = Depends(get_db),
         current_user=Depends(get_current_user),
     ):
         try:
-            expenses = self.service.list_expenses_for_group(
-                db, group_id, requester_id=current_user.id
+            expenses, next_cursor = self.service.list_expenses_for_group(
+                db,
+                group_id,
+                requester_id=current_user.id,
+                limit=limit,
+                cursor=cursor,
+                filters=filters,
             )
-            return [
-                self.service.get_expense_with_shares(
-                    db, e.id, requester_id=current_user.id
-                )
-                for e in expenses
-            ]
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except ValueError as e:
             raise HTTPException(status_code=403, detail=str(e))
 
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return expenses
+
+    def stream_group_expenses(
+        self,
+        group_id: int,
+        filters: ExpenseFilters = Depends(),
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ):
+        if not self.service.group_repo.is_user_in_group(db, group_id, current_user.id):
+            raise HTTPException(
+                status_code=403, detail="You are not a member of this group"
+            )
+
+        def lines():
+            # The request session may be closed before the body is sent,
+            # so the stream reads through its own.
+            stream_db = SessionLocal()
+            try:
+                for item in self.service.stream_expenses_for_group(
+                    stream_db,
+                    group_id,
+                    settings.EXPENSE_STREAM_BATCH_SIZE,
+                    filters=filters,
+                ):
+                    out = ExpenseWithSharesOut.model_validate(item)
+                    yield out.model_dump_json() + "\n"
+            finally:
+                stream_db.close()
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    def search_expenses(
+        self,
+        q: str = Query(..., min_length=1, max_length=200),
+        group_id: Optional[int] = None,
+        limit: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ):
+        return self.service.search_expenses(
+            db, q, requester_id=current_user.id, limit=limit, group_id=group_id
+        )
+
     def get_expense(
         self,
         expense_id: int,
@@ -135,15 +299,18 @@ class ExpenseRoutes:
             existing_expense = self.service.get_expense_with_shares(
                 db, expense_id, requester_id=current_user.id
             )
-            if not existing_expense:
-                raise HTTPException(status_code=404, detail="Expense not found")
+        except ValueError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+        if not existing_expense:
+            raise HTTPException(status_code=404, detail="Expense not found")
 
-            Schema = self.update_payload_mapping.get(expense_type)
-            if not Schema:
-                raise HTTPException(
-                    status_code=400, detail="Invalid expense type for update"
-                )
+        Schema = self.update_payload_mapping.get(expense_type)
+        if not Schema:
+            raise HTTPException(
+                status_code=400, detail="Invalid expense type for update"
+            )
 
+        try:
             validated_payload = Schema(**payload)
             return self.service.update_expense(
                 db,
@@ -151,6 +318,7 @@ class ExpenseRoutes:
                 validated_payload,
                 expense_type,
                 requester_id=current_user.id,
+                existing_result=existing_expense,
             )
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -172,3 +340,31 @@ class ExpenseRoutes:
                 raise HTTPException(status_code=404, detail="Expense not found")
         except ValueError as e:
             raise HTTPException(status_code=403, detail=str(e))
+
+    def delete_expenses_bulk(
+        self,
+        payload: ExpenseBatchDelete,
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ):
+        try:
+            expense_ids = self.service.delete_expenses_bulk(
+                db, payload.expense_ids, requester_id=current_user.id
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+        return {"expense_ids": expense_ids}
+
+    def move_expenses_bulk(
+        self,
+        payload: ExpenseBatchMove,
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ):
+        try:
+            expense_ids = self.service.move_expenses_bulk(
+                db, payload.expense_ids, payload.group_id, requester_id=current_user.id
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"expense_ids": expense_ids}
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.core.database import get_db
+from app.core.pagination import InvalidCursorError
 from app.services.group_service import GroupService
 from app.repositories.group_repository import GroupRepository
-from app.schemas.group_schema import GroupCreate, GroupOut
+from app.schemas.group_schema import GroupCreate, GroupListItem, GroupOut
 from app.routes.auth_routes import get_current_user
 from app.models.user import User
 
@@ -26,7 +28,11 @@ class GroupRoutes:
         )
 
         self.router.add_api_route(
-            "/", self.get_all_groups, response_model=list[GroupOut], methods=["GET"]
+            "/",
+            self.get_all_groups,
+            response_model=list[GroupListItem],
+            methods=["GET"],
+            description="Groups the caller belongs to or created, in id order. Pass the X-Next-Cursor response header back as `cursor` for the next page",
         )
 
         self.router.add_api_route(
@@ -90,10 +96,29 @@ class GroupRoutes:
 
     def get_all_groups(
         self,
+        response: Response,
+        limit: int = Query(100, ge=1, le=500),
+        cursor: Optional[str] = None,
+        with_member_count: bool = False,
+        with_balance: bool = False,
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user),
     ):
-        return self.service.get_groups_for_user(db, current_user.id)
+        try:
+            groups, next_cursor = self.service.get_groups_for_user(
+                db,
+                current_user.id,
+                limit=limit,
+                cursor=cursor,
+                with_member_count=with_member_count,
+                with_balance=with_balance,
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return groups
 
     def update_group(
         self,
@@ -182,7 +207,9 @@ class GroupRoutes:
             )
 
         try:
-            removed = self.service.remove_member(db, group_id, user_id)
+            removed = self.service.remove_member(
+                db, group_id, user_id, removed_by=current_user.id
+            )
             if not removed:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,43 @@
+from typing import Any, Callable, Tuple
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.services.idempotency_service import (
+    IdempotencyInProgressError,
+    IdempotencyKeyMismatchError,
+    IdempotencyService,
+    request_fingerprint,
+)
+
+idempotency_service = IdempotencyService(
+    IdempotencyRepository(),
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    lock_timeout_seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS,
+)
+
+
+def idempotent_response(
+    db,
+    user_id: int,
+    key: str,
+    method: str,
+    path: str,
+    body: Any,
+    handler: Callable[[], Tuple[int, Any]],
+) -> JSONResponse:
+    try:
+        status_code, content, replayed = idempotency_service.execute(
+            db, user_id, key, request_fingerprint(method, path, body), handler
+        )
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"Retry-After": str(settings.IDEMPOTENCY_RETRY_AFTER_SECONDS)},
+        )
+
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return JSONResponse(status_code=status_code, content=content, headers=headers)
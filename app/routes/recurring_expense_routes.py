@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.repositories.balance_repository import BalanceRepository
+from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.group_repository import GroupRepository
+from app.repositories.recurring_expense_repository import RecurringExpenseRepository
+from app.routes.auth_routes import get_current_user
+from app.schemas.recurring_expense_schema import (
+    RecurringExpenseCreate,
+    RecurringExpenseOut,
+)
+from app.services.expense_service import ExpenseService
+from app.services.recurring_expense_service import RecurringExpenseService
+
+
+class RecurringExpenseRoutes:
+    def __init__(self):
+        self.router = APIRouter(
+            prefix="/recurring-expenses", tags=["recurring-expenses"]
+        )
+        self.service = RecurringExpenseService(
+            RecurringExpenseRepository(),
+            ExpenseService(ExpenseRepository(), GroupRepository(), BalanceRepository()),
+        )
+
+        self.router.add_api_route(
+            "/",
+            self.create_template,
+            response_model=RecurringExpenseOut,
+            status_code=status.HTTP_201_CREATED,
+            methods=["POST"],
+            description="Create a recurring expense. `expense` holds the fields of the create payload for `expense_type` (without group_id); occurrences are generated by `python -m app.cli run-recurring`",
+        )
+
+        self.router.add_api_route(
+            "/group/{group_id}",
+            self.list_templates,
+            response_model=list[RecurringExpenseOut],
+            methods=["GET"],
+        )
+
+        self.router.add_api_route(
+            "/{template_id}",
+            self.deactivate_template,
+            status_code=status.HTTP_204_NO_CONTENT,
+            methods=["DELETE"],
+        )
+
+    def create_template(
+        self,
+        payload: RecurringExpenseCreate,
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ):
+        try:
+            return self.service.create_template(
+                db, payload, requester_id=current_user.id
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def list_templates(
+        self,
+        group_id: int,
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ):
+        try:
+            return self.service.list_templates(
+                db, group_id, requester_id=current_user.id
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+
+    def deactivate_template(
+        self,
+        template_id: int,
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ):
+        try:
+            if not self.service.deactivate_template(
+                db, template_id, requester_id=current_user.id
+            ):
+                raise HTTPException(
+                    status_code=404, detail="Recurring expense not found"
+                )
+        except ValueError as e:
+            raise HTTPException(status_code=403, detail=str(e))
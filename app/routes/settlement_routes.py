@@ -1,23 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from app.core.database import get_db
+from app.core.cache import settlement_cache
+from app.core.pagination import InvalidCursorError
 from app.repositories.settlement_repository import SettlementRepository
+from app.repositories.balance_repository import BalanceRepository
 from app.services.settlement_service import SettlementService
+from app.services.settlement_optimizers import SettlementMode
 from app.schemas.settlement_schema import (
     GroupSettlementResponse,
     UserSettlementSummaryResponse,
     MarkSettlementRequest,
+    SettleUpRequest,
+    UserNetPositionsResponse,
+    NetSettleRequest,
     SettlementHistoryResponse,
+    FriendBalancesResponse,
 )
 from app.routes.auth_routes import get_current_user
+from app.routes.idempotency import idempotent_response
 from app.models.user import User
 
 
 class SettlementRoutes:
     def __init__(self):
         self.router = APIRouter(prefix="/settlements", tags=["Settlements"])
-        self.settlement_service = SettlementService(SettlementRepository())
+        self.settlement_service = SettlementService(
+            SettlementRepository(), BalanceRepository(), cache=settlement_cache
+        )
 
         self.router.add_api_route(
             "/groups/{group_id}",
@@ -33,7 +54,7 @@ class SettlementRoutes:
             self.get_group_balances,
             methods=["GET"],
             summary="Get group balances only",
-            description="Get only the balance information for a group (without settlement suggestions)",
+            description="Get only the balance information for a group (without settlement suggestions). Pass `as_of` to get the balances at a point in time",
         )
 
         self.router.add_api_route(
@@ -42,7 +63,7 @@ class SettlementRoutes:
             response_model=List[SettlementHistoryResponse],
             methods=["GET"],
             summary="Get settlement history",
-            description="Get history of all settlements for a group",
+            description="Get history of settlements for a group, newest first. Pass the X-Next-Cursor response header back as `cursor` to fetch the next page",
         )
 
         self.router.add_api_route(
@@ -51,7 +72,16 @@ class SettlementRoutes:
             status_code=status.HTTP_200_OK,
             methods=["POST"],
             summary="Mark settlement as paid",
-            description="Mark a settlement between two users as paid",
+            description="Mark a settlement between two users as paid. Send an `Idempotency-Key` header to make retries safe: a repeated key replays the stored response instead of recording the settlement again",
+        )
+
+        self.router.add_api_route(
+            "/groups/{group_id}/settle-up",
+            self.settle_up,
+            status_code=status.HTTP_200_OK,
+            methods=["POST"],
+            summary="Settle up a group",
+            description="Record a list of settlements, or the current suggestions when no transfers are given, in a single transaction",
         )
 
         self.router.add_api_route(
@@ -60,7 +90,7 @@ class SettlementRoutes:
             response_model=UserSettlementSummaryResponse,
             methods=["GET"],
             summary="Get user settlement summary",
-            description="Get settlement summary for a user across all groups",
+            description="Get settlement summary for a user across all groups, with totals per group base currency",
         )
 
         self.router.add_api_route(
@@ -71,15 +101,46 @@ class SettlementRoutes:
             description="Get user's balance information across all groups",
         )
 
+        self.router.add_api_route(
+            "/users/{user_id}/net",
+            self.get_user_net_positions,
+            response_model=UserNetPositionsResponse,
+            methods=["GET"],
+            summary="Get user's net positions across groups",
+            description="Net what the user owes and is owed per counterparty across all shared groups with the same base currency and suggest one payment per counterparty and currency",
+        )
+
+        self.router.add_api_route(
+            "/users/{user_id}/net/settle",
+            self.settle_user_net_positions,
+            response_model=UserNetPositionsResponse,
+            methods=["POST"],
+            summary="Settle user's net positions",
+            description="Record offsetting settlements in every shared group so each counterparty is settled with a single net payment per currency",
+        )
+
+        self.router.add_api_route(
+            "/friends",
+            self.get_friend_balances,
+            response_model=FriendBalancesResponse,
+            methods=["GET"],
+            summary="Get friend balances",
+            description="Get the current user's balance with every friend from expenses outside any group, per currency. A positive balance means the friend owes the user",
+        )
+
     def get_group_settlements(
         self,
         group_id: int,
+        mode: SettlementMode = Query(
+            SettlementMode.GREEDY,
+            description="'minimal' finds the fewest transfers for small groups and falls back to 'greedy' above that size",
+        ),
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user),
     ):
         try:
             settlement_summary = self.settlement_service.get_group_settlement_summary(
-                db, group_id, current_user.id
+                db, group_id, current_user.id, mode=mode
             )
         except ValueError as e:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
@@ -121,12 +182,90 @@ class SettlementRoutes:
 
         return user_summary
 
+    def get_user_net_positions(
+        self,
+        user_id: int,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user),
+    ):
+        try:
+            positions = self.settlement_service.get_user_net_positions(
+                db, user_id, current_user.id
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to get user net positions",
+            )
+
+        if not positions:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+
+        return positions
+
+    def settle_user_net_positions(
+        self,
+        user_id: int,
+        request: NetSettleRequest,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user),
+    ):
+        try:
+            positions = self.settlement_service.settle_user_net_positions(
+                db, user_id, current_user.id, request.counterparty_ids
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to settle user net positions",
+            )
+
+        if not positions:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+
+        return positions
+
     def mark_settlement_paid(
         self,
         group_id: int,
         request: MarkSettlementRequest,
+        http_request: Request,
+        idempotency_key: Optional[str] = Header(None, max_length=255),
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user),
+    ):
+        if idempotency_key is None:
+            return self._mark_settlement_paid(group_id, request, db, current_user)
+        return idempotent_response(
+            db,
+            current_user.id,
+            idempotency_key,
+            http_request.method,
+            http_request.url.path,
+            request.model_dump(mode="json"),
+            lambda: (
+                status.HTTP_200_OK,
+                self._mark_settlement_paid(
+                    group_id, request, db, current_user, commit=False
+                ),
+            ),
+        )
+
+    def _mark_settlement_paid(
+        self,
+        group_id: int,
+        request: MarkSettlementRequest,
+        db: Session,
+        current_user: User,
+        commit: bool = True,
     ):
         if request.amount <= 0:
             raise HTTPException(
@@ -148,6 +287,7 @@ class SettlementRoutes:
                 to_user_id=request.to_user_id,
                 amount=request.amount,
                 requesting_user_id=current_user.id,
+                commit=commit,
             )
         except ValueError as e:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
@@ -165,16 +305,59 @@ class SettlementRoutes:
 
         return {"message": "Settlement marked as paid successfully"}
 
+    def settle_up(
+        self,
+        group_id: int,
+        request: SettleUpRequest,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user),
+    ):
+        transfers = None
+        if request.transfers is not None:
+            for transfer in request.transfers:
+                if transfer.amount <= 0:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Settlement amount must be positive",
+                    )
+                if transfer.from_user_id == transfer.to_user_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Cannot create settlement between same user",
+                    )
+            transfers = [
+                (t.from_user_id, t.to_user_id, t.amount) for t in request.transfers
+            ]
+
+        try:
+            balances = self.settlement_service.settle_up(
+                db, group_id, current_user.id, transfers=transfers, mode=request.mode
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to settle up group",
+            )
+
+        return self._format_group_balances(group_id, balances)
+
     def get_settlement_history(
         self,
         group_id: int,
+        response: Response,
+        limit: int = Query(50, ge=1, le=200),
+        cursor: Optional[str] = None,
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user),
     ):
         try:
-            history = self.settlement_service.get_settlement_history(
-                db, group_id, current_user.id
+            history, next_cursor = self.settlement_service.get_settlement_history(
+                db, group_id, current_user.id, limit=limit, cursor=cursor
             )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except ValueError as e:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
         except Exception as e:
@@ -183,11 +366,14 @@ class SettlementRoutes:
                 detail="Failed to get settlement history",
             )
 
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return history
 
     def get_group_balances(
         self,
         group_id: int,
+        as_of: Optional[datetime] = None,
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user),
     ):
@@ -200,7 +386,14 @@ class SettlementRoutes:
                     detail="User does not have access to this group",
                 )
 
-            balances = self.settlement_service.calculate_group_balances(db, group_id)
+            if as_of is not None:
+                balances = self.settlement_service.calculate_group_balances_as_of(
+                    db, group_id, as_of
+                )
+            else:
+                balances = self.settlement_service.get_cached_group_balances(
+                    db, group_id
+                )
         except HTTPException:
             raise
         except Exception as e:
@@ -215,6 +408,9 @@ class SettlementRoutes:
                 detail="No balances found for this group",
             )
 
+        return self._format_group_balances(group_id, balances)
+
+    def _format_group_balances(self, group_id: int, balances: dict):
         return {
             "group_id": group_id,
             "balances": [
@@ -230,6 +426,13 @@ class SettlementRoutes:
             ],
         }
 
+    def get_friend_balances(
+        self,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user),
+    ):
+        return self.settlement_service.get_friend_balances(db, current_user.id)
+
     def get_user_balances(
         self,
         user_id: int,
@@ -0,0 +1,17 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from app.models.activity import ActivityType
+
+
+class ActivityOut(BaseModel):
+    id: int
+    group_id: int
+    actor_id: Optional[int]
+    event_type: ActivityType
+    expense_id: Optional[int]
+    data: Optional[Dict[str, Any]]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class MonthlySpending(BaseModel):
+    month: str  # YYYY-MM
+    total: float
+    expense_count: int
+
+
+class PayerSpending(BaseModel):
+    user_id: int
+    paid: float
+    expense_count: int
+
+
+class MemberShare(BaseModel):
+    user_id: int
+    share: float
+    percentage: float
+
+
+class GroupSpendingOut(BaseModel):
+    group_id: int
+    currency: Optional[str]
+    monthly: List[MonthlySpending]
+    top_payers: List[PayerSpending]
+    member_shares: List[MemberShare]
+
+
+class UserMonthlySpending(BaseModel):
+    month: str  # YYYY-MM
+    currency: Optional[str]
+    paid: float
+    share: float
+
+
+class UserSpendingOut(BaseModel):
+    user_id: int
+    monthly: List[UserMonthlySpending]
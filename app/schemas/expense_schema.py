@@ -1,5 +1,7 @@
+from datetime import date, datetime
 from pydantic import BaseModel, Field
 from typing import List, Optional
+from app.models.expense import ExpenseType
 
 
 class ExpenseShareInput(BaseModel):
@@ -18,6 +20,10 @@ class ExpenseOut(BaseModel):
     amount: float
     paid_by: int
     group_id: Optional[int]
+    currency: Optional[str] = None
+    original_amount: Optional[float] = None
+    fx_rate: Optional[float] = None
+    occurrence_date: Optional[date] = None
 
     class Config:
         from_attributes = True
@@ -36,6 +42,7 @@ class EqualExpenseCreate(BaseModel):
     amount: float
     paid_by: int
     group_id: Optional[int] = None
+    currency: Optional[str] = Field(None, pattern="^[A-Z]{3}$")
     participant_ids: List[int]
 
 
@@ -44,6 +51,7 @@ class ExactExpenseCreate(BaseModel):
     amount: float
     paid_by: int
     group_id: Optional[int] = None
+    currency: Optional[str] = Field(None, pattern="^[A-Z]{3}$")
     shares: List[ExpenseShareInput]
 
 
@@ -52,9 +60,27 @@ class PercentageExpenseCreate(BaseModel):
     amount: float
     paid_by: int
     group_id: Optional[int] = None
+    currency: Optional[str] = Field(None, pattern="^[A-Z]{3}$")
     shares: List[ExpensePercentageInput]
 
 
+CREATE_SCHEMAS = {
+    ExpenseType.EQUAL: EqualExpenseCreate,
+    ExpenseType.EXACT: ExactExpenseCreate,
+    ExpenseType.PERCENTAGE: PercentageExpenseCreate,
+}
+
+
+class ExpenseFilters(BaseModel):
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    paid_by: Optional[int] = None
+    participant_id: Optional[int] = None
+    expense_type: Optional[ExpenseType] = None
+    min_amount: Optional[float] = Field(None, ge=0)
+    max_amount: Optional[float] = Field(None, ge=0)
+
+
 class ExpenseWithSharesOut(BaseModel):
     expense: ExpenseOut
     shares: List[ExpenseShareOut]
@@ -76,6 +102,7 @@ class EqualExpenseUpdate(BaseModel):
     paid_by: int
     participant_ids: List[int]
     group_id: Optional[int] = None
+    currency: Optional[str] = Field(None, pattern="^[A-Z]{3}$")
 
 
 class ExactExpenseUpdate(BaseModel):
@@ -84,6 +111,7 @@ class ExactExpenseUpdate(BaseModel):
     paid_by: int
     shares: List[ExactShareUpdate]
     group_id: Optional[int] = None
+    currency: Optional[str] = Field(None, pattern="^[A-Z]{3}$")
 
 
 class PercentageExpenseUpdate(BaseModel):
@@ -92,3 +120,17 @@ class PercentageExpenseUpdate(BaseModel):
     paid_by: int
     shares: List[PercentageShareUpdate]
     group_id: Optional[int] = None
+    currency: Optional[str] = Field(None, pattern="^[A-Z]{3}$")
+
+
+class ExpenseBatchDelete(BaseModel):
+    expense_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
+class ExpenseBatchMove(BaseModel):
+    expense_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    group_id: int
+
+
+class ExpenseBatchResult(BaseModel):
+    expense_ids: List[int]
@@ -1,16 +1,25 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 
 class GroupCreate(BaseModel):
     name: str
     description: Optional[str] = None
+    base_currency: Optional[str] = Field(None, pattern="^[A-Z]{3}$")
 
 
 class GroupOut(BaseModel):
     id: int
     name: str
     description: Optional[str]
+    base_currency: str
 
     class Config:
         from_attributes = True
+
+
+class GroupListItem(GroupOut):
+    # Only filled in when requested
+    member_count: Optional[int] = None
+    # The caller's balance in the group, in its base currency
+    balance: Optional[float] = None
@@ -0,0 +1,30 @@
+from datetime import date
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from app.models.expense import ExpenseType
+from app.models.recurring_expense import RecurrenceCadence
+
+
+class RecurringExpenseCreate(BaseModel):
+    group_id: int
+    expense_type: ExpenseType
+    cadence: RecurrenceCadence
+    start_date: date
+    end_date: Optional[date] = None
+    # Fields of the matching expense create schema, without group_id
+    expense: Dict[str, Any]
+
+
+class RecurringExpenseOut(BaseModel):
+    id: int
+    group_id: int
+    expense_type: ExpenseType
+    cadence: RecurrenceCadence
+    start_date: date
+    end_date: Optional[date]
+    next_run_on: date
+    is_active: bool
+    payload: Dict[str, Any]
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from datetime import datetime
+from app.services.settlement_optimizers import SettlementMode
 
 
 class BalanceResponse(BaseModel):
@@ -30,29 +31,72 @@ class GroupSettlementResponse(BaseModel):
     settlements: List[SettlementResponse]
     total_expenses: float
     total_settlements_needed: float
+    algorithm: str
 
     class Config:
         from_attributes = True
 
 
-class UserSettlementSummaryResponse(BaseModel):
-    user_id: int
-    username: str
+class CurrencyTotals(BaseModel):
+    currency: str
     total_owed_to_user: float
     total_user_owes: float
     net_balance: float
+
+
+class UserSettlementSummaryResponse(BaseModel):
+    user_id: int
+    username: str
+    totals: List[CurrencyTotals]
     group_balances: List[dict]
 
     class Config:
         from_attributes = True
 
 
+class FriendBalanceResponse(BaseModel):
+    user_id: int
+    username: str
+    currency: str
+    balance: float
+    status: str
+
+
+class FriendBalancesResponse(BaseModel):
+    user_id: int
+    totals: List[CurrencyTotals]
+    friends: List[FriendBalanceResponse]
+
+
 class MarkSettlementRequest(BaseModel):
     from_user_id: int
     to_user_id: int
     amount: float
 
 
+class NetPaymentResponse(SettlementResponse):
+    currency: str
+
+
+class UserNetPositionsResponse(BaseModel):
+    user_id: int
+    username: str
+    counterparties: List[dict]
+    payments: List[NetPaymentResponse]
+
+    class Config:
+        from_attributes = True
+
+
+class NetSettleRequest(BaseModel):
+    counterparty_ids: Optional[List[int]] = None
+
+
+class SettleUpRequest(BaseModel):
+    transfers: Optional[List[MarkSettlementRequest]] = None
+    mode: SettlementMode = SettlementMode.GREEDY
+
+
 class SettlementHistoryResponse(BaseModel):
     id: int
     description: str
@@ -0,0 +1,70 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.core.pagination import decode_id_cursor, encode_id_cursor
+from app.models.activity import ActivityType
+from app.repositories.activity_repository import ActivityRepository
+from app.repositories.group_repository import GroupRepository
+
+
+class ActivityService:
+    """Writes group events into every member's feed (fan-out on write), so
+    reading a feed never touches the groups themselves."""
+
+    def __init__(self, activity_repo: ActivityRepository, group_repo: GroupRepository):
+        self.activity_repo = activity_repo
+        self.group_repo = group_repo
+
+    def record(
+        self,
+        db,
+        group_id: Optional[int],
+        event_type: ActivityType,
+        actor_id: Optional[int],
+        expense_id: Optional[int] = None,
+        data: Optional[Dict] = None,
+        extra_user_ids: Iterable[int] = (),
+    ):
+        self.record_many(
+            db, [(group_id, event_type, actor_id, expense_id, data)], extra_user_ids
+        )
+
+    def record_many(
+        self,
+        db,
+        events: Iterable[Tuple],
+        extra_user_ids: Iterable[int] = (),
+    ):
+        """Fan out (group_id, event_type, actor_id, expense_id, data) events
+        to the current members of each group, plus ``extra_user_ids``. Runs in
+        the caller's transaction; events without a group are skipped."""
+        member_ids: Dict[int, set] = {}
+        rows = []
+        for group_id, event_type, actor_id, expense_id, data in events:
+            if group_id is None:
+                continue
+            if group_id not in member_ids:
+                member_ids[group_id] = self.group_repo.get_member_ids(
+                    db, group_id
+                ) | set(extra_user_ids)
+            rows.extend(
+                {
+                    "user_id": user_id,
+                    "group_id": group_id,
+                    "actor_id": actor_id,
+                    "event_type": event_type,
+                    "expense_id": expense_id,
+                    "data": data,
+                }
+                for user_id in sorted(member_ids[group_id])
+            )
+        self.activity_repo.add_bulk(db, rows)
+
+    def get_feed(
+        self, db, user_id: int, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List, Optional[str]]:
+        before_id = decode_id_cursor(cursor) if cursor else None
+        items = self.activity_repo.list_for_user(db, user_id, limit + 1, before_id)
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_id_cursor(items[-1].id)
+        return items, next_cursor
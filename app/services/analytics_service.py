@@ -0,0 +1,132 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Optional
+from app.repositories.group_repository import GroupRepository
+from app.repositories.spending_rollup_repository import SpendingRollupRepository
+
+
+def _month(day) -> str:
+    if isinstance(day, str):
+        return day[:7]
+    return day.strftime("%Y-%m")
+
+
+class AnalyticsService:
+    """Spending reports, read from the daily rollups only."""
+
+    def __init__(
+        self, rollup_repo: SpendingRollupRepository, group_repo: GroupRepository
+    ):
+        self.rollup_repo = rollup_repo
+        self.group_repo = group_repo
+
+    def get_group_spending(
+        self,
+        db,
+        group_id: int,
+        requester_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        top: int = 5,
+    ) -> Dict:
+        if not self.group_repo.is_user_in_group(db, group_id, requester_id):
+            raise ValueError("You are not a member of this group")
+        group = self.group_repo.get_group(db, group_id)
+
+        monthly = defaultdict(lambda: {"total": 0.0, "expense_count": 0})
+        for day, total, expense_count in self.rollup_repo.get_group_daily_totals(
+            db, group_id, start, end
+        ):
+            monthly[_month(day)]["total"] += total
+            monthly[_month(day)]["expense_count"] += expense_count
+
+        members = self.rollup_repo.get_group_member_totals(db, group_id, start, end)
+        payers = sorted(
+            (m for m in members if m.expense_count > 0),
+            key=lambda m: (-m.paid, m.user_id),
+        )
+        total_share = sum(m.share for m in members)
+
+        return {
+            "group_id": group_id,
+            "currency": group.base_currency,
+            "monthly": [
+                {
+                    "month": month,
+                    "total": round(values["total"], 2),
+                    "expense_count": values["expense_count"],
+                }
+                for month, values in sorted(monthly.items())
+            ],
+            "top_payers": [
+                {
+                    "user_id": m.user_id,
+                    "paid": round(m.paid, 2),
+                    "expense_count": m.expense_count,
+                }
+                for m in payers[:top]
+            ],
+            "member_shares": [
+                {
+                    "user_id": m.user_id,
+                    "share": round(m.share, 2),
+                    "percentage": round(m.share / total_share * 100, 2),
+                }
+                for m in sorted(members, key=lambda m: (-m.share, m.user_id))
+                if round(m.share, 2)
+            ],
+        }
+
+    def get_user_spending(
+        self,
+        db,
+        user_id: int,
+        requester_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict:
+        if user_id != requester_id:
+            raise ValueError("You can only view your own spending")
+
+        # Groups keep their own base currency, so totals are per currency
+        monthly = defaultdict(lambda: {"paid": 0.0, "share": 0.0})
+        for day, currency, paid, share in self.rollup_repo.get_user_daily_totals(
+            db, user_id, start, end
+        ):
+            monthly[(_month(day), currency)]["paid"] += paid
+            monthly[(_month(day), currency)]["share"] += share
+
+        return {
+            "user_id": user_id,
+            "monthly": [
+                {
+                    "month": month,
+                    "currency": currency,
+                    "paid": round(values["paid"], 2),
+                    "share": round(values["share"], 2),
+                }
+                for (month, currency), values in sorted(
+                    monthly.items(), key=lambda item: (item[0][0], item[0][1] or "")
+                )
+            ],
+        }
+
+    def backfill_group(self, db, group_id: int, chunk_size: int) -> int:
+        """Rebuild one group's rollups from its expenses, reading them in
+        id-ordered chunks. Returns the number of expenses aggregated."""
+        first_id, last_id = self.rollup_repo.get_expense_id_range(db, group_id)
+        try:
+            self.rollup_repo.delete_for_group(db, group_id)
+            count = 0
+            if first_id is not None:
+                for chunk_start in range(first_id, last_id + 1, chunk_size):
+                    rows = self.rollup_repo.aggregate_expenses(
+                        db, group_id, chunk_start, chunk_start + chunk_size - 1
+                    )
+                    self.rollup_repo.apply_deltas(db, rows)
+                    count += sum(row["expense_count"] for row in rows)
+            self.rollup_repo.commit(db)
+        except Exception:
+            self.rollup_repo.rollback(db)
+            raise
+        return count
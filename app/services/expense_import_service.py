@@ -0,0 +1,179 @@
+import codecs
+import csv
+import enum
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from app.models.expense import ExpenseType
+from app.repositories.group_repository import GroupRepository
+from app.schemas.expense_schema import CREATE_SCHEMAS
+from app.services.expense_service import ExpenseService
+
+logger = logging.getLogger(__name__)
+
+CSV_COLUMNS = ("expense_type", "description", "amount", "paid_by", "currency")
+
+
+class GroupNotFoundError(ValueError):
+    pass
+
+
+class ImportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in (value or "").split(";") if item.strip()]
+
+
+def _parse_csv_record(header: List[str], line: str) -> Dict:
+    values = next(csv.reader([line]))
+    if len(values) > len(header):
+        raise ValueError(f"Expected {len(header)} columns, got {len(values)}")
+    row = dict(zip(header, values))
+
+    record = {key: row.get(key) or None for key in CSV_COLUMNS}
+    if row.get("participant_ids"):
+        record["participant_ids"] = _split_list(row["participant_ids"])
+    if row.get("shares"):
+        # "user_id:value;user_id:value", value being an amount or a percentage
+        record["shares"] = []
+        for item in _split_list(row["shares"]):
+            user_id, _, value = item.partition(":")
+            record["shares"].append(
+                {"user_id": user_id, "share_amount": value, "percentage": value}
+            )
+    return record
+
+
+class ExpenseImportService:
+    def __init__(self, expense_service: ExpenseService, group_repo: GroupRepository):
+        self.expense_service = expense_service
+        self.group_repo = group_repo
+
+    async def import_expenses(
+        self,
+        db,
+        group_id: int,
+        chunks: AsyncIterator[bytes],
+        import_format: ImportFormat,
+        requester_id: int,
+        batch_size: int,
+        max_errors: int,
+    ) -> Dict:
+        member_ids, base_currency = await run_in_threadpool(
+            self._load_group, db, group_id, requester_id
+        )
+
+        imported, failed, errors = 0, 0, []
+        batch: List[Tuple[int, Tuple]] = []
+
+        def fail(line_no: int, error: str):
+            nonlocal failed
+            failed += 1
+            if len(errors) < max_errors:
+                errors.append({"line": line_no, "error": error})
+
+        async def flush():
+            nonlocal imported
+            try:
+                await run_in_threadpool(
+                    self._insert_batch,
+                    db,
+                    [entry for _, entry in batch],
+                    requester_id,
+                )
+                imported += len(batch)
+            except Exception:
+                logger.exception(
+                    "Import into group %s: batch of %d rows failed",
+                    group_id,
+                    len(batch),
+                )
+                for line_no, _ in batch:
+                    fail(line_no, "Batch insert failed")
+            batch.clear()
+
+        header: Optional[List[str]] = None
+        line_no = 0
+        async for line in iter_lines(chunks):
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                if import_format == ImportFormat.CSV:
+                    if header is None:
+                        header = [col.strip() for col in next(csv.reader([line]))]
+                        continue
+                    record = _parse_csv_record(header, line)
+                else:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError("Expected a JSON object")
+
+                entry = await run_in_threadpool(
+                    self._build, db, record, group_id, member_ids, base_currency
+                )
+                batch.append((line_no, entry))
+            except (ValueError, ValidationError) as e:
+                fail(line_no, str(e))
+                continue
+
+            if len(batch) >= batch_size:
+                await flush()
+
+        if batch:
+            await flush()
+
+        return {"imported": imported, "failed": failed, "errors": errors}
+
+    def _load_group(self, db, group_id: int, requester_id: int):
+        member_ids = self.group_repo.get_member_ids(db, group_id)
+        if not member_ids:
+            raise GroupNotFoundError("Group not found")
+        if requester_id not in member_ids:
+            raise ValueError("You are not a member of this group")
+        return member_ids, self.expense_service.get_base_currency(db, group_id)
+
+    def _build(self, db, record: Dict, group_id: int, member_ids, base_currency):
+        try:
+            expense_type = ExpenseType(record.pop("expense_type", None))
+        except ValueError:
+            raise ValueError(
+                f"expense_type must be one of: {', '.join(t.value for t in ExpenseType)}"
+            )
+
+        if record.get("group_id") not in (None, group_id):
+            raise ValueError(f"Row belongs to group {record['group_id']}")
+        record["group_id"] = group_id
+
+        payload = CREATE_SCHEMAS[expense_type](**record)
+        return self.expense_service.build_expense(
+            db, payload, expense_type, member_ids, base_currency
+        )
+
+    def _insert_batch(self, db, entries, requester_id: int):
+        try:
+            self.expense_service.insert_expenses_bulk(
+                db, entries, actor_id=requester_id
+            )
+            self.expense_service.expense_repo.commit(db)
+        except Exception:
+            self.expense_service.expense_repo.rollback(db)
+            raise
@@ -1,44 +1,282 @@
-from typing import Dict
+import re
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from app.core.cache import fx_rate_cache
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
 from app.repositories.expense_repository import ExpenseRepository
 from app.repositories.group_repository import GroupRepository
+from app.repositories.balance_repository import BalanceRepository
+from app.repositories.fx_rate_repository import FxRateRepository
+from app.repositories.spending_rollup_repository import SpendingRollupRepository
+from app.repositories.activity_repository import ActivityRepository
+from app.models.activity import ActivityType
 from app.models.expense import Expense, ExpenseType
+from app.models.expense_share import ExpenseShare
+from app.models.spending_rollup import rollup_day
+from app.schemas.expense_schema import ExpenseFilters
 from app.services.expense_splitters import (
     EqualExpenseSplitter,
     ExactExpenseSplitter,
     PercentageExpenseSplitter,
 )
+from app.services.activity_service import ActivityService
+from app.services.fx_service import FxService
+from app.services.settlement_service import friend_pair_delta
 
 
 class ExpenseService:
-    def __init__(self, expense_repo: ExpenseRepository, group_repo: GroupRepository):
+    def __init__(
+        self,
+        expense_repo: ExpenseRepository,
+        group_repo: GroupRepository,
+        balance_repo: BalanceRepository,
+    ):
         self.expense_repo = expense_repo
         self.group_repo = group_repo
+        self.balance_repo = balance_repo
         self.splitters: Dict[ExpenseType, object] = {
             ExpenseType.EQUAL: EqualExpenseSplitter(expense_repo, group_repo),
             ExpenseType.EXACT: ExactExpenseSplitter(expense_repo, group_repo),
             ExpenseType.PERCENTAGE: PercentageExpenseSplitter(expense_repo, group_repo),
         }
+        self.fx = FxService(
+            FxRateRepository(), settings.FX_REFERENCE_CURRENCY, cache=fx_rate_cache
+        )
+        self.rollup_repo = SpendingRollupRepository()
+        self.activity = ActivityService(ActivityRepository(), group_repo)
+
+    def _apply_to_ledger(self, db, entries: Iterable[Tuple], sign: int = 1):
+        # entries: (group_id, paid_by, amount, [(user_id, share_amount), ...], day,
+        # currency) with day None for settlements, which stay out of the spending
+        # rollups. Expenses without a group go to the pairwise friend ledger
+        # instead, in the currency they were entered in, since there is no
+        # group base currency to convert them to.
+        deltas = defaultdict(lambda: defaultdict(float))
+        friend_deltas = defaultdict(float)
+        rollups = defaultdict(lambda: {"paid": 0.0, "share": 0.0, "expense_count": 0})
+        for group_id, paid_by, amount, shares, day, currency in entries:
+            if group_id is None:
+                for user_id, share_amount in shares:
+                    if user_id != paid_by:
+                        (low, high), delta = friend_pair_delta(
+                            user_id, paid_by, sign * share_amount
+                        )
+                        friend_deltas[
+                            (low, high, currency or settings.DEFAULT_CURRENCY)
+                        ] += delta
+                continue
+            deltas[group_id][paid_by] += sign * amount
+            for user_id, share_amount in shares:
+                deltas[group_id][user_id] -= sign * share_amount
+
+            if day is None:
+                continue
+            rollups[(group_id, paid_by, day)]["paid"] += sign * amount
+            rollups[(group_id, paid_by, day)]["expense_count"] += sign
+            for user_id, share_amount in shares:
+                rollups[(group_id, user_id, day)]["share"] += sign * share_amount
 
-    def create_expense(self, db, payload, expense_type: ExpenseType, requester_id: int):
+        for group_id, group_deltas in deltas.items():
+            self.balance_repo.apply_deltas(db, group_id, group_deltas)
+            self.group_repo.bump_version(db, group_id)
+        self.balance_repo.apply_friend_deltas(db, friend_deltas)
+        self.rollup_repo.apply_deltas(
+            db,
+            [
+                {"group_id": group_id, "user_id": user_id, "day": day, **values}
+                for (group_id, user_id, day), values in rollups.items()
+            ],
+        )
+
+    def _activity_data(self, description, amount: float, paid_by: int) -> Dict:
+        return {"description": description, "amount": amount, "paid_by": paid_by}
+
+    def _rollup_day(self, expense: Expense) -> Optional[date]:
+        if expense.is_settlement:
+            return None
+        return rollup_day(expense.created_at, expense.occurrence_date)
+
+    def get_base_currency(self, db, group_id: Optional[int]) -> Optional[str]:
+        if group_id is None:
+            return None
+        group = self.group_repo.get_group(db, group_id)
+        if not group:
+            raise ValueError("Group not found")
+        return group.base_currency
+
+    def _to_base_currency(
+        self,
+        db,
+        payload,
+        shares: List[Tuple[int, float]],
+        base_currency: Optional[str],
+        rate: Optional[float] = None,
+    ) -> Tuple[Dict, List[Tuple[int, float]]]:
+        """Convert the entered amount and shares into the group's base currency
+        once, at write time, so balances stay plain sums."""
+        currency = payload.currency or base_currency
+        if rate is None:
+            rate = (
+                1.0
+                if base_currency is None or currency == base_currency
+                else self.fx.get_rate(db, currency, base_currency, date.today())
+            )
+        amount, shares = self.fx.convert(payload.amount, shares, rate)
+        values = {
+            "amount": amount,
+            "currency": currency,
+            "original_amount": payload.amount,
+            "fx_rate": rate,
+        }
+        return values, shares
+
+    def _invalidate_checkpoints(self, db, expense_id: int, *group_ids):
+        for group_id in set(group_ids) - {None}:
+            self.balance_repo.invalidate_checkpoints(db, group_id, expense_id)
+
+    def create_expense(
+        self,
+        db,
+        payload,
+        expense_type: ExpenseType,
+        requester_id: int,
+        commit: bool = True,
+    ):
+        """With ``commit=False`` the writes are left flushed for the caller to
+        commit with its own, e.g. a stored idempotent response."""
 
         if getattr(payload, "group_id", None) is not None:
             if not self.group_repo.is_user_in_group(db, payload.group_id, requester_id):
                 raise ValueError("You are not a member of this group")
 
+        splitter = self.splitters.get(expense_type)
+        if not splitter:
+            raise ValueError("Unsupported expense type")
+
+        computed = splitter.prepare_shares(db, payload, requester_id=requester_id)
+        money, computed = self._to_base_currency(
+            db,
+            payload,
+            computed,
+            self.get_base_currency(db, getattr(payload, "group_id", None)),
+        )
+
         expense = Expense(
             description=payload.description,
-            amount=payload.amount,
             paid_by=payload.paid_by,
             group_id=getattr(payload, "group_id", None),
             expense_type=expense_type,
+            **money,
         )
-        expense = self.expense_repo.create(db, expense)
+        try:
+            expense = self.expense_repo.create(db, expense)
+            shares = splitter.create_shares(db, expense, computed)
+            self._apply_to_ledger(
+                db,
+                [
+                    (
+                        expense.group_id,
+                        expense.paid_by,
+                        expense.amount,
+                        [(s.user_id, s.share_amount) for s in shares],
+                        self._rollup_day(expense),
+                        expense.currency,
+                    )
+                ],
+            )
+            self.activity.record(
+                db,
+                expense.group_id,
+                ActivityType.EXPENSE_CREATED,
+                requester_id,
+                expense.id,
+                self._activity_data(
+                    expense.description, expense.amount, expense.paid_by
+                ),
+            )
+            if commit:
+                self.expense_repo.commit(db)
+        except Exception:
+            self.expense_repo.rollback(db)
+            raise
+        return {"expense": expense, "shares": shares}
 
+    def build_expense(
+        self,
+        db,
+        payload,
+        expense_type: ExpenseType,
+        member_ids: Optional[Set[int]] = None,
+        base_currency: Optional[str] = None,
+    ) -> Tuple[Dict, List[Tuple[int, float]]]:
         splitter = self.splitters.get(expense_type)
         if not splitter:
             raise ValueError("Unsupported expense type")
-        shares = splitter.create_shares(db, expense, payload, requester_id=requester_id)
-        return {"expense": expense, "shares": shares}
+
+        shares = splitter.compute_shares(payload)
+        if member_ids is not None:
+            splitter.check_members(
+                member_ids, payload.paid_by, [uid for uid, _ in shares]
+            )
+
+        money, shares = self._to_base_currency(db, payload, shares, base_currency)
+        values = {
+            "description": payload.description,
+            "paid_by": payload.paid_by,
+            "group_id": getattr(payload, "group_id", None),
+            "expense_type": expense_type,
+            **money,
+        }
+        return values, shares
+
+    def insert_expenses_bulk(
+        self,
+        db,
+        entries: List[Tuple[Dict, List[Tuple[int, float]]]],
+        actor_id: Optional[int] = None,
+    ) -> List[int]:
+        created = self.expense_repo.create_bulk(db, [values for values, _ in entries])
+        expense_ids = [expense_id for expense_id, _ in created]
+        self.expense_repo.add_shares_bulk(
+            db,
+            [
+                {"expense_id": expense_id, "user_id": uid, "share_amount": amount}
+                for expense_id, (_, shares) in zip(expense_ids, entries)
+                for uid, amount in shares
+            ],
+        )
+        self._apply_to_ledger(
+            db,
+            [
+                (
+                    values["group_id"],
+                    values["paid_by"],
+                    values["amount"],
+                    shares,
+                    rollup_day(created_at, values.get("occurrence_date")),
+                    values["currency"],
+                )
+                for (_, created_at), (values, shares) in zip(created, entries)
+            ],
+        )
+        self.activity.record_many(
+            db,
+            [
+                (
+                    values["group_id"],
+                    ActivityType.EXPENSE_CREATED,
+                    actor_id,
+                    expense_id,
+                    self._activity_data(
+                        values["description"], values["amount"], values["paid_by"]
+                    ),
+                )
+                for expense_id, (values, _) in zip(expense_ids, entries)
+            ],
+        )
+        return expense_ids
 
     def get_expense_with_shares(self, db, expense_id: int, requester_id: int):
         result = self.expense_repo.get_expense_with_shares(db, expense_id)
@@ -55,50 +293,364 @@ class ExpenseService:
                 raise ValueError("You do not have access to this expense")
         return {"expense": expense, "shares": shares_out}
 
-    def list_expenses_for_group(self, db, group_id: int, requester_id: int):
+    def list_expenses_for_group(
+        self,
+        db,
+        group_id: int,
+        requester_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[ExpenseFilters] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
         if not self.group_repo.is_user_in_group(db, group_id, requester_id):
             raise ValueError("You are not a member of this group")
-        return self.expense_repo.list_for_group(db, group_id)
+
+        after = decode_cursor(cursor) if cursor else None
+        expenses = self.expense_repo.list_for_group(
+            db, group_id, limit=limit + 1, after=after, filters=filters
+        )
+        next_cursor = None
+        if len(expenses) > limit:
+            expenses = expenses[:limit]
+            next_cursor = encode_cursor(expenses[-1].created_at, expenses[-1].id)
+
+        return [
+            {"expense": expense, "shares": expense.shares} for expense in expenses
+        ], next_cursor
+
+    def search_expenses(
+        self,
+        db,
+        query: str,
+        requester_id: int,
+        limit: int = 20,
+        group_id: Optional[int] = None,
+    ) -> List[Dict]:
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return []
+        expenses = self.expense_repo.search(
+            db, requester_id, terms, limit=limit, group_id=group_id
+        )
+        return [{"expense": expense, "shares": expense.shares} for expense in expenses]
+
+    def stream_expenses_for_group(
+        self,
+        db,
+        group_id: int,
+        batch_size: int,
+        filters: Optional[ExpenseFilters] = None,
+    ) -> Iterator[Dict]:
+        for expense in self.expense_repo.stream_for_group(
+            db, group_id, batch_size, filters=filters
+        ):
+            yield {"expense": expense, "shares": expense.shares}
 
     def update_expense(
-        self, db, expense_id: int, payload, expense_type: ExpenseType, requester_id: int
+        self,
+        db,
+        expense_id: int,
+        payload,
+        expense_type: ExpenseType,
+        requester_id: int,
+        existing_result: Optional[Dict] = None,
     ):
-        existing_result = self.get_expense_with_shares(db, expense_id, requester_id)
+        """``existing_result`` is what get_expense_with_shares returned for
+        this requester, when the caller already fetched it."""
+        if existing_result is None:
+            existing_result = self.get_expense_with_shares(db, expense_id, requester_id)
         if not existing_result:
             raise ValueError("Expense not found or access denied")
 
         expense = existing_result["expense"]
-
-        if getattr(payload, "group_id", None) is not None:
-            if not self.group_repo.is_user_in_group(db, payload.group_id, requester_id):
-                raise ValueError("You are not a member of this group")
-
-        expense.description = payload.description
-        expense.amount = payload.amount
-        expense.paid_by = payload.paid_by
-        expense.group_id = getattr(payload, "group_id", None)
-        expense.expense_type = expense_type
-
-        updated_expense = self.expense_repo.update(db, expense)
+        old_group_id, old_paid_by, old_amount, old_currency = (
+            expense.group_id,
+            expense.paid_by,
+            expense.amount,
+            expense.currency,
+        )
+        old_shares = [(s.user_id, s.share_amount) for s in existing_result["shares"]]
+        day = self._rollup_day(expense)
 
         splitter = self.splitters.get(expense_type)
         if not splitter:
             raise ValueError("Unsupported expense type")
 
-        shares = splitter.update_shares(
-            db, updated_expense, payload, requester_id=requester_id
+        computed = splitter.prepare_shares(db, payload, requester_id=requester_id)
+        base_currency = self.get_base_currency(db, getattr(payload, "group_id", None))
+        # Keep the rate the expense was recorded at unless its currency or
+        # group changes, so edits do not silently re-price it.
+        rate = None
+        if (payload.currency or base_currency) == (
+            expense.currency or base_currency
+        ) and getattr(payload, "group_id", None) == old_group_id:
+            rate = expense.fx_rate or 1.0
+        money, computed = self._to_base_currency(
+            db, payload, computed, base_currency, rate=rate
         )
+
+        try:
+            expense.description = payload.description
+            expense.amount = money["amount"]
+            expense.currency = money["currency"]
+            expense.original_amount = money["original_amount"]
+            expense.fx_rate = money["fx_rate"]
+            expense.paid_by = payload.paid_by
+            expense.group_id = getattr(payload, "group_id", None)
+            expense.expense_type = expense_type
+
+            updated_expense = self.expense_repo.update(db, expense)
+
+            shares = splitter.update_shares(
+                db, updated_expense, existing_result["shares"], computed
+            )
+            new_shares = [(s.user_id, s.share_amount) for s in shares]
+            if (
+                old_group_id,
+                old_paid_by,
+                old_amount,
+                old_currency,
+                sorted(old_shares),
+            ) != (
+                updated_expense.group_id,
+                updated_expense.paid_by,
+                updated_expense.amount,
+                updated_expense.currency,
+                sorted(new_shares),
+            ):
+                self._apply_to_ledger(
+                    db,
+                    [
+                        (
+                            old_group_id,
+                            old_paid_by,
+                            old_amount,
+                            old_shares,
+                            day,
+                            old_currency,
+                        )
+                    ],
+                    sign=-1,
+                )
+                self._invalidate_checkpoints(
+                    db, expense_id, old_group_id, updated_expense.group_id
+                )
+                self._apply_to_ledger(
+                    db,
+                    [
+                        (
+                            updated_expense.group_id,
+                            updated_expense.paid_by,
+                            updated_expense.amount,
+                            new_shares,
+                            day,
+                            updated_expense.currency,
+                        )
+                    ],
+                )
+            data = self._activity_data(
+                updated_expense.description,
+                updated_expense.amount,
+                updated_expense.paid_by,
+            )
+            events = [
+                (
+                    updated_expense.group_id,
+                    ActivityType.EXPENSE_UPDATED,
+                    requester_id,
+                    expense_id,
+                    data,
+                )
+            ]
+            if old_group_id != updated_expense.group_id:
+                # Moved out of old_group_id, which sees it as removed
+                events.append(
+                    (
+                        old_group_id,
+                        ActivityType.EXPENSE_DELETED,
+                        requester_id,
+                        expense_id,
+                        data,
+                    )
+                )
+            self.activity.record_many(db, events)
+            self.expense_repo.commit(db)
+        except Exception:
+            self.expense_repo.rollback(db)
+            raise
+        # The persistent share rows are expired by the commit; answer with
+        # detached copies rather than reloading each one.
+        shares = [
+            ExpenseShare(expense_id=expense_id, user_id=user_id, share_amount=amount)
+            for user_id, amount in new_shares
+        ]
         return {"expense": updated_expense, "shares": shares}
 
+    def _load_batch(self, db, expense_ids: List[int], requester_id: int):
+        expenses = self.expense_repo.get_accessible_with_shares(
+            db, expense_ids, requester_id
+        )
+        missing = sorted(set(expense_ids) - {expense.id for expense in expenses})
+        if missing:
+            raise ValueError(
+                f"Expenses not found or access denied: {', '.join(map(str, missing))}"
+            )
+        return expenses
+
+    def _invalidate_checkpoints_bulk(self, db, expenses: List[Expense], *group_ids):
+        """Drop checkpoints at or after the lowest affected expense id, in the
+        expenses' own groups and in ``group_ids``."""
+        if not expenses:
+            return
+        first_id = min(expense.id for expense in expenses)
+        self._invalidate_checkpoints(
+            db, first_id, *(expense.group_id for expense in expenses), *group_ids
+        )
+
+    def _ledger_entry(self, expense: Expense, group_id: Optional[int]) -> Tuple:
+        return (
+            group_id,
+            expense.paid_by,
+            expense.amount,
+            [(s.user_id, s.share_amount) for s in expense.shares],
+            self._rollup_day(expense),
+            expense.currency,
+        )
+
+    def delete_expenses_bulk(
+        self, db, expense_ids: List[int], requester_id: int
+    ) -> List[int]:
+        """Delete all the expenses or none of them, in one transaction."""
+        expense_ids = sorted(set(expense_ids))
+        expenses = self._load_batch(db, expense_ids, requester_id)
+
+        try:
+            self._apply_to_ledger(
+                db, [self._ledger_entry(e, e.group_id) for e in expenses], sign=-1
+            )
+            self._invalidate_checkpoints_bulk(db, expenses)
+            self.activity.record_many(
+                db,
+                [
+                    (
+                        e.group_id,
+                        ActivityType.EXPENSE_DELETED,
+                        requester_id,
+                        e.id,
+                        self._activity_data(e.description, e.amount, e.paid_by),
+                    )
+                    for e in expenses
+                ],
+            )
+            self.expense_repo.delete_bulk(db, expense_ids)
+            self.expense_repo.commit(db)
+        except Exception:
+            self.expense_repo.rollback(db)
+            raise
+        return expense_ids
+
+    def move_expenses_bulk(
+        self, db, expense_ids: List[int], group_id: int, requester_id: int
+    ) -> List[int]:
+        """Move all the expenses into ``group_id`` or none of them. Amounts are
+        stored in the base currency of their group, so expenses only move
+        between groups that share one."""
+        member_ids = self.group_repo.get_member_ids(db, group_id)
+        if requester_id not in member_ids:
+            raise ValueError("You are not a member of this group")
+
+        expense_ids = sorted(set(expense_ids))
+        expenses = [
+            e
+            for e in self._load_batch(db, expense_ids, requester_id)
+            if e.group_id != group_id
+        ]
+
+        source_groups = {e.group_id for e in expenses} - {None}
+        currencies = self.group_repo.get_base_currencies(db, source_groups | {group_id})
+        base_currency = currencies[group_id]
+        for e in expenses:
+            # Non-group amounts are stored as entered, and no currency means
+            # DEFAULT_CURRENCY, as in the friend ledger
+            currency = (
+                currencies[e.group_id]
+                if e.group_id is not None
+                else e.currency or settings.DEFAULT_CURRENCY
+            )
+            if currency != base_currency:
+                raise ValueError(
+                    f"Expense {e.id} is in {currency}, not the group's base "
+                    f"currency {base_currency}"
+                )
+            self.splitters[e.expense_type].check_members(
+                member_ids, e.paid_by, [s.user_id for s in e.shares]
+            )
+
+        try:
+            self._apply_to_ledger(
+                db, [self._ledger_entry(e, e.group_id) for e in expenses], sign=-1
+            )
+            self._apply_to_ledger(
+                db, [self._ledger_entry(e, group_id) for e in expenses]
+            )
+            self._invalidate_checkpoints_bulk(db, expenses, group_id)
+            events = []
+            for e in expenses:
+                data = self._activity_data(e.description, e.amount, e.paid_by)
+                events.append(
+                    (group_id, ActivityType.EXPENSE_UPDATED, requester_id, e.id, data)
+                )
+                events.append(
+                    (e.group_id, ActivityType.EXPENSE_DELETED, requester_id, e.id, data)
+                )
+            self.activity.record_many(db, events)
+            self.expense_repo.move_bulk(db, [e.id for e in expenses], group_id)
+            self.expense_repo.commit(db)
+        except Exception:
+            self.expense_repo.rollback(db)
+            raise
+        return expense_ids
+
     def delete_expense(self, db, expense_id: int, requester_id: int):
         existing_result = self.get_expense_with_shares(db, expense_id, requester_id)
         if not existing_result:
             return False
 
         expense = existing_result["expense"]
+        old_shares = [(s.user_id, s.share_amount) for s in existing_result["shares"]]
 
-        self.expense_repo.delete_shares_for_expense(db, expense_id)
+        try:
+            self._apply_to_ledger(
+                db,
+                [
+                    (
+                        expense.group_id,
+                        expense.paid_by,
+                        expense.amount,
+                        old_shares,
+                        self._rollup_day(expense),
+                        expense.currency,
+                    )
+                ],
+                sign=-1,
+            )
+            self._invalidate_checkpoints(db, expense_id, expense.group_id)
+            self.activity.record(
+                db,
+                expense.group_id,
+                ActivityType.EXPENSE_DELETED,
+                requester_id,
+                expense_id,
+                self._activity_data(
+                    expense.description, expense.amount, expense.paid_by
+                ),
+            )
+            self.expense_repo.delete_shares_for_expense(db, expense_id)
 
-        self.expense_repo.delete(db, expense)
+            self.expense_repo.delete(db, expense)
+            self.expense_repo.commit(db)
+        except Exception:
+            self.expense_repo.rollback(db)
+            raise
 
         return True
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import List, Set, Tuple
 from sqlalchemy.orm import Session
 from app.models.expense import Expense
 from app.models.expense_share import ExpenseShare
@@ -12,187 +14,110 @@ class ExpenseSplitter(ABC):
         self.group_repo = group_repo
 
     @abstractmethod
-    def create_shares(self, db: Session, expense: Expense, payload, requester_id: int):
+    def compute_shares(self, payload) -> List[Tuple[int, float]]:
         pass
 
-    @abstractmethod
-    def update_shares(self, db: Session, expense: Expense, payload, requester_id: int):
-        pass
+    def prepare_shares(
+        self, db: Session, payload, requester_id: int
+    ) -> List[Tuple[int, float]]:
+        shares = self.compute_shares(payload)
+        self.ensure_membership(
+            db,
+            getattr(payload, "group_id", None),
+            payload.paid_by,
+            [uid for uid, _ in shares],
+            requester_id,
+        )
+        return shares
+
+    def create_shares(
+        self, db: Session, expense: Expense, shares: List[Tuple[int, float]]
+    ) -> List[ExpenseShare]:
+        rows = [
+            {"expense_id": expense.id, "user_id": uid, "share_amount": share_amount}
+            for uid, share_amount in shares
+        ]
+        self.expense_repo.add_shares_bulk(db, rows)
+        return [ExpenseShare(**row) for row in rows]
+
+    def update_shares(
+        self,
+        db: Session,
+        expense: Expense,
+        existing: List[ExpenseShare],
+        shares: List[Tuple[int, float]],
+    ) -> List[ExpenseShare]:
+        # Reuse existing rows per participant: changed amounts are updated in
+        # place, and only added/removed participants are inserted/deleted.
+        existing_by_user = defaultdict(list)
+        for share in existing:
+            existing_by_user[share.user_id].append(share)
+
+        kept, added = [], []
+        for uid, share_amount in shares:
+            if existing_by_user[uid]:
+                share = existing_by_user[uid].pop(0)
+                if share.share_amount != share_amount:
+                    share.share_amount = share_amount
+                kept.append(share)
+            else:
+                added.append((uid, share_amount))
+
+        removed_ids = [s.id for rows in existing_by_user.values() for s in rows]
+        self.expense_repo.delete_shares(db, removed_ids)
+        return kept + self.create_shares(db, expense, added)
 
     def ensure_membership(
         self, db: Session, group_id, payer_id, participant_ids, requester_id
     ):
         if group_id is None:
             return
-        group = self.group_repo.get_group(db, group_id)
-        if not group:
+        member_ids = self.group_repo.get_member_ids(db, group_id)
+        if not member_ids:
             raise ValueError("Group not found")
-        if not self.group_repo.is_user_in_group(db, group_id, requester_id):
+        if requester_id not in member_ids:
             raise ValueError("Requester not in group")
-        if not self.group_repo.is_user_in_group(db, group_id, payer_id):
-            raise ValueError("Payer not in group")
-        for uid in participant_ids:
-            if not self.group_repo.is_user_in_group(db, group_id, uid):
-                raise ValueError(f"User {uid} not in group")
+        self.check_members(member_ids, payer_id, participant_ids)
 
+    def check_members(self, member_ids: Set[int], payer_id, participant_ids):
+        non_members = sorted({payer_id, *participant_ids} - member_ids)
+        if non_members:
+            raise ValueError(f"Users not in group: {', '.join(map(str, non_members))}")
 
-class EqualExpenseSplitter(ExpenseSplitter):
-    def create_shares(self, db: Session, expense: Expense, payload, requester_id: int):
-        participant_ids = payload.participant_ids
-        if not participant_ids:
-            raise ValueError("No participants provided")
 
-        self.ensure_membership(
-            db,
-            getattr(payload, "group_id", None),
-            payload.paid_by,
-            participant_ids,
-            requester_id,
-        )
-
-        n = len(participant_ids)
-        share_amount = round(payload.amount / n, 2)
-
-        shares = []
-        for uid in participant_ids:
-            es = ExpenseShare(
-                expense_id=expense.id, user_id=uid, share_amount=share_amount
-            )
-            shares.append(self.expense_repo.add_share(db, es))
-        return shares
-
-    def update_shares(self, db: Session, expense: Expense, payload, requester_id: int):
+class EqualExpenseSplitter(ExpenseSplitter):
+    def compute_shares(self, payload) -> List[Tuple[int, float]]:
         participant_ids = payload.participant_ids
         if not participant_ids:
             raise ValueError("No participants provided")
 
-        self.ensure_membership(
-            db,
-            getattr(payload, "group_id", None),
-            payload.paid_by,
-            participant_ids,
-            requester_id,
-        )
-
-        self.expense_repo.delete_shares_for_expense(db, expense.id)
-
         n = len(participant_ids)
         share_amount = round(payload.amount / n, 2)
-
-        shares = []
-        for uid in participant_ids:
-            es = ExpenseShare(
-                expense_id=expense.id, user_id=uid, share_amount=share_amount
-            )
-            shares.append(self.expense_repo.add_share(db, es))
-        return shares
+        return [(uid, share_amount) for uid in participant_ids]
 
 
 class ExactExpenseSplitter(ExpenseSplitter):
-    def create_shares(self, db: Session, expense: Expense, payload, requester_id: int):
-        participant_ids = [s.user_id for s in payload.shares]
-        if not participant_ids:
+    def compute_shares(self, payload) -> List[Tuple[int, float]]:
+        if not payload.shares:
             raise ValueError("No participants provided")
 
-        self.ensure_membership(
-            db,
-            getattr(payload, "group_id", None),
-            payload.paid_by,
-            participant_ids,
-            requester_id,
-        )
-
         if round(sum(s.share_amount for s in payload.shares), 2) != round(
             payload.amount, 2
         ):
             raise ValueError("Shares do not sum up to total amount")
 
-        shares = []
-        for s in payload.shares:
-            es = ExpenseShare(
-                expense_id=expense.id, user_id=s.user_id, share_amount=s.share_amount
-            )
-            shares.append(self.expense_repo.add_share(db, es))
-        return shares
-
-    def update_shares(self, db: Session, expense: Expense, payload, requester_id: int):
-        participant_ids = [s.user_id for s in payload.shares]
-        if not participant_ids:
-            raise ValueError("No participants provided")
-
-        self.ensure_membership(
-            db,
-            getattr(payload, "group_id", None),
-            payload.paid_by,
-            participant_ids,
-            requester_id,
-        )
-
-        if round(sum(s.share_amount for s in payload.shares), 2) != round(
-            payload.amount, 2
-        ):
-            raise ValueError("Shares do not sum up to total amount")
-
-        self.expense_repo.delete_shares_for_expense(db, expense.id)
-
-        shares = []
-        for s in payload.shares:
-            es = ExpenseShare(
-                expense_id=expense.id, user_id=s.user_id, share_amount=s.share_amount
-            )
-            shares.append(self.expense_repo.add_share(db, es))
-        return shares
+        return [(s.user_id, s.share_amount) for s in payload.shares]
 
 
 class PercentageExpenseSplitter(ExpenseSplitter):
-    def create_shares(self, db: Session, expense: Expense, payload, requester_id: int):
-        participant_ids = [s.user_id for s in payload.shares]
-        if not participant_ids:
-            raise ValueError("No participants provided")
-
-        self.ensure_membership(
-            db,
-            getattr(payload, "group_id", None),
-            payload.paid_by,
-            participant_ids,
-            requester_id,
-        )
-
-        if round(sum(s.percentage for s in payload.shares), 2) != 100:
-            raise ValueError("Total percentage must be 100")
-
-        shares = []
-        for s in payload.shares:
-            share_amount = round(payload.amount * (s.percentage / 100), 2)
-            es = ExpenseShare(
-                expense_id=expense.id, user_id=s.user_id, share_amount=share_amount
-            )
-            shares.append(self.expense_repo.add_share(db, es))
-        return shares
-
-    def update_shares(self, db: Session, expense: Expense, payload, requester_id: int):
-        participant_ids = [s.user_id for s in payload.shares]
-        if not participant_ids:
+    def compute_shares(self, payload) -> List[Tuple[int, float]]:
+        if not payload.shares:
             raise ValueError("No participants provided")
 
-        self.ensure_membership(
-            db,
-            getattr(payload, "group_id", None),
-            payload.paid_by,
-            participant_ids,
-            requester_id,
-        )
-
         if round(sum(s.percentage for s in payload.shares), 2) != 100:
             raise ValueError("Total percentage must be 100")
 
-        self.expense_repo.delete_shares_for_expense(db, expense.id)
-
-        shares = []
-        for s in payload.shares:
-            share_amount = round(payload.amount * (s.percentage / 100), 2)
-            es = ExpenseShare(
-                expense_id=expense.id, user_id=s.user_id, share_amount=share_amount
-            )
-            shares.append(self.expense_repo.add_share(db, es))
-        return shares
+        return [
+            (s.user_id, round(payload.amount * (s.percentage / 100), 2))
+            for s in payload.shares
+        ]
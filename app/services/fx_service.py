@@ -0,0 +1,89 @@
+import csv
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+from app.core.cache import LRUCache
+from app.repositories.fx_rate_repository import FxRateRepository
+
+
+class FxService:
+    def __init__(
+        self,
+        fx_repo: FxRateRepository,
+        reference_currency: str,
+        cache: Optional[LRUCache] = None,
+    ):
+        self.fx_repo = fx_repo
+        self.reference_currency = reference_currency
+        self.cache = cache
+
+    def _reference_rate(self, db, currency: str, on_date: date) -> float:
+        if currency == self.reference_currency:
+            return 1.0
+
+        key = (currency, on_date)
+        if self.cache is not None:
+            rate = self.cache.get(key)
+            if rate is not None:
+                return rate
+
+        fx_rate = self.fx_repo.get_latest(db, currency, on_date)
+        if fx_rate is None:
+            raise ValueError(f"No exchange rate for {currency} on or before {on_date}")
+        # Only an exact-date rate is final; a fallback to an earlier day may be
+        # superseded once that day's rates are loaded.
+        if self.cache is not None and fx_rate.rate_date == on_date:
+            self.cache.set(key, fx_rate.rate)
+        return fx_rate.rate
+
+    def get_rate(self, db, from_currency: str, to_currency: str, on_date: date):
+        """Units of ``to_currency`` per unit of ``from_currency``."""
+        if from_currency == to_currency:
+            return 1.0
+        return self._reference_rate(db, to_currency, on_date) / self._reference_rate(
+            db, from_currency, on_date
+        )
+
+    def convert(
+        self, amount: float, shares: List[Tuple[int, float]], rate: float
+    ) -> Tuple[float, List[Tuple[int, float]]]:
+        if rate == 1.0:
+            return amount, shares
+
+        converted = [(uid, round(share * rate, 2)) for uid, share in shares]
+        # Put the rounding difference on the largest share so the converted
+        # shares add up to the converted total of the original shares.
+        residual = round(
+            round(sum(share for _, share in shares) * rate, 2)
+            - sum(share for _, share in converted),
+            2,
+        )
+        if residual and converted:
+            index = max(range(len(converted)), key=lambda i: converted[i][1])
+            uid, share = converted[index]
+            converted[index] = (uid, round(share + residual, 2))
+        return round(amount * rate, 2), converted
+
+    def load_rates(self, db, rows: Iterable[dict], batch_size: int = 1000) -> int:
+        """Upsert rates from ``date,currency,rate`` records."""
+        batch, count = [], 0
+        for row in rows:
+            batch.append(
+                {
+                    "rate_date": date.fromisoformat(row["date"].strip()),
+                    "currency": row["currency"].strip().upper(),
+                    "rate": float(row["rate"]),
+                }
+            )
+            if len(batch) >= batch_size:
+                self.fx_repo.upsert_rates(db, batch)
+                count += len(batch)
+                batch = []
+        self.fx_repo.upsert_rates(db, batch)
+        count += len(batch)
+        if self.cache is not None:
+            self.cache.clear()
+        return count
+
+    def load_rates_file(self, db, path: str) -> int:
+        with open(path, newline="") as f:
+            return self.load_rates(db, csv.DictReader(f))
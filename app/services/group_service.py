@@ -1,15 +1,21 @@
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.pagination import decode_id_cursor, encode_id_cursor
+from app.repositories.activity_repository import ActivityRepository
 from app.repositories.group_repository import GroupRepository
 from app.models.group import Group
 from app.models.user import User
+from app.models.activity import ActivityType
 from app.models.group_member import GroupMember
 from app.schemas.group_schema import GroupCreate
-from typing import List, Optional
+from app.services.activity_service import ActivityService
+from typing import Dict, List, Optional, Tuple
 
 
 class GroupService:
     def __init__(self, repo: GroupRepository):
         self.repo = repo
+        self.activity = ActivityService(ActivityRepository(), repo)
 
     def create_group(
         self, db: Session, payload: GroupCreate, current_user: User
@@ -18,6 +24,7 @@ class GroupService:
             name=payload.name,
             description=payload.description,
             creator_id=current_user.id,
+            base_currency=payload.base_currency or settings.DEFAULT_CURRENCY,
         )
         group = self.repo.create(db, group)
 
@@ -34,13 +41,46 @@ class GroupService:
     ) -> List[Group]:
         return self.repo.list(db, skip=skip, limit=limit)
 
-    def get_groups_for_user(self, db: Session, user_id: int) -> List[Group]:
-        all_groups = self.repo.list(db)
-        return [g for g in all_groups if self.repo.is_user_in_group(db, g.id, user_id)]
+    def get_groups_for_user(
+        self,
+        db: Session,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        with_member_count: bool = False,
+        with_balance: bool = False,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        after_id = decode_id_cursor(cursor) if cursor else None
+        rows = self.repo.list_for_user(
+            db,
+            user_id,
+            limit + 1,
+            after_id,
+            with_member_count=with_member_count,
+            with_balance=with_balance,
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_id_cursor(rows[-1][0].id)
+
+        groups = [
+            {
+                "id": group.id,
+                "name": group.name,
+                "description": group.description,
+                "base_currency": group.base_currency,
+                "member_count": member_count,
+                "balance": round(balance, 2) if balance is not None else None,
+            }
+            for group, member_count, balance in rows
+        ]
+        return groups, next_cursor
 
     def update_group(
         self, db: Session, group_id: int, payload: GroupCreate
     ) -> Optional[Group]:
+        self.repo.bump_version(db, group_id)
         return self.repo.update(
             db, group_id, name=payload.name, description=payload.description
         )
@@ -63,10 +103,38 @@ class GroupService:
             raise ValueError("User already a member of this group")
 
         gm = GroupMember(group_id=group_id, user_id=user_id, role=role)
+        self.repo.bump_version(db, group_id)
+        self.activity.record(
+            db,
+            group_id,
+            ActivityType.MEMBER_ADDED,
+            added_by,
+            data={"user_id": user_id},
+            extra_user_ids=[user_id],
+        )
         return self.repo.add_member(db, gm)
 
     def get_all_members(self, db: Session, group_id: int) -> List[GroupMember]:
         return self.repo.get_members(db, group_id)
 
-    def remove_member(self, db: Session, group_id: int, user_id: int) -> bool:
-        return self.repo.remove_member_by_ids(db, group_id, user_id)
+    def remove_member(
+        self,
+        db: Session,
+        group_id: int,
+        user_id: int,
+        removed_by: Optional[int] = None,
+    ) -> bool:
+        gm = self.repo.get_member(db, group_id, user_id)
+        if not gm:
+            return False
+        self.repo.bump_version(db, group_id)
+        # Recorded while user_id is still a member, so they see it too
+        self.activity.record(
+            db,
+            group_id,
+            ActivityType.MEMBER_REMOVED,
+            removed_by,
+            data={"user_id": user_id},
+        )
+        self.repo.remove_member(db, gm)
+        return True
@@ -0,0 +1,87 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Tuple
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+
+class IdempotencyKeyMismatchError(ValueError):
+    pass
+
+
+class IdempotencyInProgressError(Exception):
+    pass
+
+
+def request_fingerprint(method: str, path: str, body: Any) -> str:
+    raw = json.dumps([method, path, body], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class IdempotencyService:
+    def __init__(
+        self,
+        repo: IdempotencyRepository,
+        ttl_seconds: int,
+        lock_timeout_seconds: int,
+    ):
+        self.repo = repo
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.lock_timeout = timedelta(seconds=lock_timeout_seconds)
+
+    def execute(
+        self,
+        db,
+        user_id: int,
+        key: str,
+        request_hash: str,
+        handler: Callable[[], Tuple[int, Any]],
+    ) -> Tuple[int, Any, bool]:
+        """Run ``handler`` at most once per (user, key) and return
+        ``(status_code, body, replayed)``.
+
+        ``handler`` must flush its writes without committing them: they are
+        committed in one transaction with the stored response, so a crash in
+        between cannot leave a write whose key a retry would reclaim.
+
+        A duplicate that arrives while the first request is still running
+        raises IdempotencyInProgressError at once rather than holding a
+        worker while it waits; the client retries and gets the stored
+        response.
+        """
+        now = datetime.now(timezone.utc)
+        if self.repo.claim(
+            db, user_id, key, request_hash, now, now + self.ttl
+        ) or self.repo.reclaim(
+            db, user_id, key, request_hash, now, now + self.ttl, now - self.lock_timeout
+        ):
+            return self._run(db, user_id, key, handler)
+
+        record = self.repo.get(db, user_id, key)
+        if record is None:
+            # The first request failed and released the key
+            now = datetime.now(timezone.utc)
+            if self.repo.claim(db, user_id, key, request_hash, now, now + self.ttl):
+                return self._run(db, user_id, key, handler)
+            record = self.repo.get(db, user_id, key)
+        if record is not None and record.request_hash != request_hash:
+            raise IdempotencyKeyMismatchError(
+                "Idempotency-Key was already used for a different request"
+            )
+        if record is not None and record.response_status is not None:
+            return record.response_status, record.response_body, True
+        raise IdempotencyInProgressError(
+            "A request with this Idempotency-Key is still in progress"
+        )
+
+    def _run(self, db, user_id: int, key: str, handler) -> Tuple[int, Any, bool]:
+        try:
+            status_code, body = handler()
+            self.repo.complete(db, user_id, key, status_code, body)
+        except Exception:
+            self.repo.release(db, user_id, key)
+            raise
+        return status_code, body, False
+
+    def purge_expired(self, db) -> int:
+        return self.repo.purge_expired(db, datetime.now(timezone.utc))
@@ -0,0 +1,190 @@
+import calendar
+from datetime import date, timedelta
+from typing import Dict, List
+from pydantic import ValidationError
+from app.models.recurring_expense import RecurrenceCadence, RecurringExpense
+from app.repositories.recurring_expense_repository import RecurringExpenseRepository
+from app.schemas.expense_schema import CREATE_SCHEMAS
+from app.schemas.recurring_expense_schema import RecurringExpenseCreate
+from app.services.expense_service import ExpenseService
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def next_period(start_date: date, cadence: RecurrenceCadence, period: date) -> date:
+    if cadence == RecurrenceCadence.DAILY:
+        return period + timedelta(days=1)
+    if cadence == RecurrenceCadence.WEEKLY:
+        return period + timedelta(weeks=1)
+
+    # Step from start_date rather than from period, so a schedule starting on
+    # the 31st comes back to the 31st after a short month.
+    step = 1 if cadence == RecurrenceCadence.MONTHLY else 12
+    elapsed = (period.year - start_date.year) * 12 + period.month - start_date.month
+    return _add_months(start_date, elapsed + step)
+
+
+class RecurringExpenseService:
+    def __init__(
+        self,
+        recurring_repo: RecurringExpenseRepository,
+        expense_service: ExpenseService,
+    ):
+        self.recurring_repo = recurring_repo
+        self.expense_service = expense_service
+        self.group_repo = expense_service.group_repo
+
+    def _build_payload(self, template_payload: Dict, expense_type, group_id: int):
+        return CREATE_SCHEMAS[expense_type](
+            **{**template_payload, "group_id": group_id}
+        )
+
+    def create_template(
+        self, db, payload: RecurringExpenseCreate, requester_id: int
+    ) -> RecurringExpense:
+        if payload.end_date is not None and payload.end_date < payload.start_date:
+            raise ValueError("end_date must not be before start_date")
+
+        member_ids = self.group_repo.get_member_ids(db, payload.group_id)
+        if requester_id not in member_ids:
+            raise ValueError("You are not a member of this group")
+
+        expense_payload = self._build_payload(
+            payload.expense, payload.expense_type, payload.group_id
+        )
+        self.expense_service.build_expense(
+            db,
+            expense_payload,
+            payload.expense_type,
+            member_ids,
+            self.expense_service.get_base_currency(db, payload.group_id),
+        )
+
+        template = RecurringExpense(
+            group_id=payload.group_id,
+            created_by=requester_id,
+            expense_type=payload.expense_type,
+            payload=expense_payload.model_dump(mode="json", exclude={"group_id"}),
+            cadence=payload.cadence,
+            start_date=payload.start_date,
+            end_date=payload.end_date,
+            next_run_on=payload.start_date,
+        )
+        return self.recurring_repo.create(db, template)
+
+    def list_templates(self, db, group_id: int, requester_id: int):
+        if not self.group_repo.is_user_in_group(db, group_id, requester_id):
+            raise ValueError("You are not a member of this group")
+        return self.recurring_repo.list_for_group(db, group_id)
+
+    def deactivate_template(self, db, template_id: int, requester_id: int) -> bool:
+        template = self.recurring_repo.get_by_id(db, template_id)
+        if not template:
+            return False
+        if not self.group_repo.is_user_in_group(db, template.group_id, requester_id):
+            raise ValueError("You are not a member of this group")
+        self.recurring_repo.deactivate(db, template)
+        return True
+
+    def run_due(self, db, today: date, batch_size: int) -> Dict:
+        """Create every occurrence due on or before ``today``, one committed
+        batch of templates at a time.
+
+        Each (template, period) is claimed in recurring_expense_occurrences
+        before its expense is inserted, so re-running or overlapping runs
+        never create an occurrence twice.
+        """
+        result = {"templates": 0, "created": 0, "skipped": 0, "errors": []}
+        after_id = 0
+        while True:
+            templates = self.recurring_repo.get_due(
+                db, today, limit=batch_size, after_id=after_id
+            )
+            if not templates:
+                break
+            after_id = templates[-1].id
+            try:
+                self._materialize(db, templates, today, result)
+                self.recurring_repo.commit(db)
+            except Exception:
+                self.recurring_repo.rollback(db)
+                raise
+            result["templates"] += len(templates)
+        return result
+
+    def _materialize(
+        self, db, templates: List[RecurringExpense], today: date, result: Dict
+    ):
+        occurrences, schedules = [], []
+        for template in templates:
+            last_day = min(today, template.end_date or today)
+            period = template.next_run_on
+            while period <= last_day:
+                occurrences.append((template, period))
+                period = next_period(template.start_date, template.cadence, period)
+            schedules.append(
+                {
+                    "id": template.id,
+                    "next_run_on": period,
+                    "is_active": template.end_date is None
+                    or period <= template.end_date,
+                }
+            )
+
+        claimed = self.recurring_repo.claim_occurrences(
+            db,
+            [
+                {"template_id": template.id, "period": period}
+                for template, period in occurrences
+            ],
+        )
+
+        member_ids, base_currencies, entries, keys = {}, {}, [], []
+        for template, period in occurrences:
+            if (template.id, period) not in claimed:
+                continue
+            if template.group_id not in member_ids:
+                member_ids[template.group_id] = self.group_repo.get_member_ids(
+                    db, template.group_id
+                )
+                base_currencies[template.group_id] = (
+                    self.expense_service.get_base_currency(db, template.group_id)
+                )
+            try:
+                payload = self._build_payload(
+                    template.payload, template.expense_type, template.group_id
+                )
+                values, shares = self.expense_service.build_expense(
+                    db,
+                    payload,
+                    template.expense_type,
+                    member_ids[template.group_id],
+                    base_currencies[template.group_id],
+                )
+                # Roll the expense up on its period, not on the day the run
+                # caught up with it; created_at stays the insert time.
+                values["occurrence_date"] = period
+                entries.append((values, shares))
+                keys.append((template.id, period))
+            except (ValueError, ValidationError) as e:
+                # Still claimed, so a template that no longer validates (e.g.
+                # a participant left the group) is not retried every run.
+                result["skipped"] += 1
+                result["errors"].append(
+                    {"template_id": template.id, "period": period, "error": str(e)}
+                )
+
+        expense_ids = self.expense_service.insert_expenses_bulk(db, entries)
+        self.recurring_repo.set_occurrence_expenses(
+            db,
+            [
+                {"template_id": template_id, "period": period, "expense_id": expense_id}
+                for (template_id, period), expense_id in zip(keys, expense_ids)
+            ],
+        )
+        self.recurring_repo.update_schedules(db, schedules)
+        result["created"] += len(expense_ids)
@@ -0,0 +1,128 @@
+import enum
+import heapq
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+# (from_user_id, to_user_id, amount)
+Transfer = Tuple[int, int, float]
+
+
+class SettlementMode(str, enum.Enum):
+    GREEDY = "greedy"
+    MINIMAL = "minimal"
+
+
+def _to_cents(balances: Dict[int, float]) -> Dict[int, int]:
+    cents = {user_id: int(round(amount * 100)) for user_id, amount in balances.items()}
+    return {user_id: amount for user_id, amount in cents.items() if abs(amount) > 1}
+
+
+def _greedy_transfers(cents: Dict[int, int]) -> List[Transfer]:
+    creditors = [(-amount, user_id) for user_id, amount in cents.items() if amount > 0]
+    debtors = [(amount, user_id) for user_id, amount in cents.items() if amount < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers = []
+    while creditors and debtors:
+        credit, creditor_id = heapq.heappop(creditors)
+        debt, debtor_id = heapq.heappop(debtors)
+        credit, debt = -credit, -debt
+
+        amount = min(credit, debt)
+        if amount > 1:
+            transfers.append((debtor_id, creditor_id, amount / 100))
+
+        if credit - amount > 1:
+            heapq.heappush(creditors, (-(credit - amount), creditor_id))
+        if debt - amount > 1:
+            heapq.heappush(debtors, (-(debt - amount), debtor_id))
+
+    return transfers
+
+
+class SettlementOptimizer(ABC):
+    mode: SettlementMode
+
+    def can_optimize(self, balances: Dict[int, float]) -> bool:
+        return True
+
+    @abstractmethod
+    def optimize(self, balances: Dict[int, float]) -> List[Transfer]:
+        pass
+
+
+class GreedySettlementOptimizer(SettlementOptimizer):
+    mode = SettlementMode.GREEDY
+
+    def optimize(self, balances: Dict[int, float]) -> List[Transfer]:
+        return _greedy_transfers(_to_cents(balances))
+
+
+# n non-zero balances split into k disjoint zero-sum subsets need exactly
+# n - k transfers, so maximise k over all subsets (O(2^n * n)) and settle
+# each subset greedily.
+class MinimalTransfersOptimizer(SettlementOptimizer):
+    mode = SettlementMode.MINIMAL
+
+    def __init__(self, max_balances: int = 20):
+        self.max_balances = max_balances
+
+    def can_optimize(self, balances: Dict[int, float]) -> bool:
+        return len(_to_cents(balances)) <= self.max_balances
+
+    def optimize(self, balances: Dict[int, float]) -> List[Transfer]:
+        cents = _to_cents(balances)
+        user_ids = list(cents.keys())
+        values = [cents[user_id] for user_id in user_ids]
+
+        transfers = []
+        for subset in self._zero_sum_partition(values):
+            transfers.extend(
+                _greedy_transfers({user_ids[i]: values[i] for i in subset})
+            )
+        return transfers
+
+    def _zero_sum_partition(self, values: List[int]) -> List[List[int]]:
+        n = len(values)
+        full = (1 << n) - 1
+        sums = [0] * (full + 1)
+        # best[mask]: the most zero-sum blocks any ordering of mask can be cut into
+        best = [0] * (full + 1)
+
+        for mask in range(1, full + 1):
+            low = mask & -mask
+            sums[mask] = sums[mask ^ low] + values[low.bit_length() - 1]
+            top = 0
+            remaining = mask
+            while remaining:
+                bit = remaining & -remaining
+                if best[mask ^ bit] > top:
+                    top = best[mask ^ bit]
+                remaining ^= bit
+            best[mask] = top + (abs(sums[mask]) <= 1)
+
+        order = []
+        mask = full
+        while mask:
+            target = best[mask] - (abs(sums[mask]) <= 1)
+            remaining = mask
+            while remaining:
+                bit = remaining & -remaining
+                if best[mask ^ bit] == target:
+                    break
+                remaining ^= bit
+            order.append(bit.bit_length() - 1)
+            mask ^= bit
+        order.reverse()
+
+        subsets, current, prefix = [], [], 0
+        for index in order:
+            current.append(index)
+            prefix |= 1 << index
+            if abs(sums[prefix]) <= 1:
+                subsets.append(current)
+                current = []
+        if current:
+            subsets.append(current)
+        return subsets
@@ -1,8 +1,52 @@
 from sqlalchemy.orm import Session
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
-from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, replace
 from app.repositories.settlement_repository import SettlementRepository
+from app.repositories.balance_repository import BalanceRepository
+from app.repositories.activity_repository import ActivityRepository
+from app.repositories.group_repository import GroupRepository
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.models.activity import ActivityType
+from app.services.activity_service import ActivityService
+from app.services.settlement_optimizers import (
+    SettlementMode,
+    GreedySettlementOptimizer,
+    MinimalTransfersOptimizer,
+)
+
+
+def friend_pair_delta(
+    debtor_id: int, creditor_id: int, amount: float
+) -> Tuple[Tuple[int, int], float]:
+    """Key and signed delta of a debt in the friend ledger, which stores each
+    pair once as (user_low, user_high) with positive meaning user_high owes."""
+    if creditor_id < debtor_id:
+        return (creditor_id, debtor_id), amount
+    return (debtor_id, creditor_id), -amount
+
+
+def currency_totals(balances) -> List[Dict]:
+    """Owed/owes/net totals for (currency, balance) pairs, one entry per
+    currency; balances in different currencies are never added together."""
+    totals = defaultdict(lambda: {"owed": 0.0, "owes": 0.0})
+    for currency, balance in balances:
+        if balance > 0:
+            totals[currency]["owed"] += balance
+        else:
+            totals[currency]["owes"] -= balance
+    return [
+        {
+            "currency": currency,
+            "total_owed_to_user": round(values["owed"], 2),
+            "total_user_owes": round(values["owes"], 2),
+            "net_balance": round(values["owed"] - values["owes"], 2),
+        }
+        for currency, values in sorted(totals.items())
+    ]
 
 
 @dataclass
@@ -21,6 +65,11 @@ class Settlement:
     amount: float
 
 
+@dataclass
+class NetPayment(Settlement):
+    currency: str
+
+
 @dataclass
 class GroupSettlement:
     group_id: int
@@ -29,11 +78,24 @@ class GroupSettlement:
     settlements: List[Settlement]
     total_expenses: float
     total_settlements_needed: float
+    algorithm: str
 
 
 class SettlementService:
-    def __init__(self, settlement_repo: SettlementRepository):
+    def __init__(
+        self,
+        settlement_repo: SettlementRepository,
+        balance_repo: BalanceRepository,
+        cache: Optional[LRUCache] = None,
+    ):
         self.settlement_repo = settlement_repo
+        self.balance_repo = balance_repo
+        self.cache = cache
+        self.optimizers = {
+            SettlementMode.GREEDY: GreedySettlementOptimizer(),
+            SettlementMode.MINIMAL: MinimalTransfersOptimizer(),
+        }
+        self.activity = ActivityService(ActivityRepository(), GroupRepository())
 
     def validate_group_access(self, db: Session, user_id: int, group_id: int) -> bool:
         return self.settlement_repo.is_user_group_member(db, user_id, group_id)
@@ -45,35 +107,156 @@ class SettlementService:
         return all(user_id in group_members for user_id in user_ids)
 
     def calculate_group_balances(self, db, group_id: int) -> Dict[int, float]:
-        balances = defaultdict(float)
+        return self.balance_repo.get_group_balances(db, group_id)
+
+    def get_cached_group_balances(self, db, group_id: int) -> Dict[int, float]:
+        if self.cache is None:
+            return self.calculate_group_balances(db, group_id)
+
+        version = self.settlement_repo.get_group_version(db, group_id)
+        cache_key = ("balances", group_id, version)
+        balances = self.cache.get(cache_key)
+        if balances is None:
+            balances = self.calculate_group_balances(db, group_id)
+            self.cache.set(cache_key, balances)
+        return balances
+
+    def calculate_group_balances_as_of(
+        self, db, group_id: int, as_of: datetime
+    ) -> Dict[int, float]:
+        as_of_expense_id, balances = self.balance_repo.get_latest_checkpoint(
+            db, group_id, until=as_of
+        )
+        movements = self.settlement_repo.get_group_net_balances(
+            db, group_id, after_expense_id=as_of_expense_id, until=as_of
+        )
+        return self._merge_balances(balances, movements)
 
-        expenses = self.settlement_repo.get_group_expenses(db, group_id)
+    def recompute_group_balances(
+        self, db, group_id: int, from_checkpoint: bool = True
+    ) -> Dict[int, float]:
+        as_of_expense_id, balances = 0, {}
+        if from_checkpoint:
+            as_of_expense_id, balances = self.balance_repo.get_latest_checkpoint(
+                db, group_id
+            )
+        movements = self.settlement_repo.get_group_net_balances(
+            db, group_id, after_expense_id=as_of_expense_id
+        )
+        return self._merge_balances(balances, movements)
 
-        for expense in expenses:
-            balances[expense.paid_by] += expense.amount
+    def _merge_balances(
+        self, balances: Dict[int, float], movements: Dict[int, float]
+    ) -> Dict[int, float]:
+        merged = defaultdict(float, balances)
+        for user_id, amount in movements.items():
+            merged[user_id] += amount
+        return dict(merged)
+
+    def create_group_checkpoint(
+        self, db, group_id: int, min_expenses: int = 1
+    ) -> Optional[int]:
+        as_of_expense_id, balances = self.balance_repo.get_latest_checkpoint(
+            db, group_id
+        )
+        settled_before = datetime.now(timezone.utc) - timedelta(
+            seconds=settings.BALANCE_CHECKPOINT_LAG_SECONDS
+        )
+        candidate = self.settlement_repo.get_checkpoint_candidate(
+            db, group_id, as_of_expense_id, settled_before
+        )
+        if candidate.expense_id is None or candidate.expense_count < min_expenses:
+            return None
 
-            for share in expense.shares:
-                balances[share.user_id] -= share.share_amount
+        movements = self.settlement_repo.get_group_net_balances(
+            db,
+            group_id,
+            after_expense_id=as_of_expense_id,
+            up_to_expense_id=candidate.expense_id,
+        )
+        try:
+            self.balance_repo.create_checkpoint(
+                db,
+                group_id,
+                candidate.expense_id,
+                self._merge_balances(balances, movements),
+            )
+            self.settlement_repo.commit(db)
+        except Exception:
+            self.settlement_repo.rollback(db)
+            raise
+        return candidate.expense_id
 
-        return dict(balances)
+    def rebuild_group_ledger(
+        self, db, group_id: int, from_checkpoint: bool = True
+    ) -> Dict[int, float]:
+        balances = self.recompute_group_balances(db, group_id, from_checkpoint)
+        try:
+            self.balance_repo.replace_group_balances(db, group_id, balances)
+            self.settlement_repo.bump_group_version(db, group_id)
+            self.settlement_repo.commit(db)
+        except Exception:
+            self.settlement_repo.rollback(db)
+            raise
+        return balances
+
+    def rebuild_friend_ledger(self, db) -> int:
+        balances = defaultdict(float)
+        for row in self.settlement_repo.get_friend_debts(db, settings.DEFAULT_CURRENCY):
+            (low, high), delta = friend_pair_delta(
+                row.debtor_id, row.creditor_id, row.amount
+            )
+            balances[(low, high, row.currency)] += delta
+        try:
+            self.balance_repo.replace_friend_balances(db, balances)
+            self.settlement_repo.commit(db)
+        except Exception:
+            self.settlement_repo.rollback(db)
+            raise
+        return sum(1 for balance in balances.values() if round(balance, 2) != 0)
+
+    def get_friend_balances(self, db, user_id: int) -> Dict:
+        friends = [
+            {
+                "user_id": row.friend_id,
+                "username": row.username,
+                "currency": row.currency,
+                "balance": round(row.balance, 2),
+                "status": "owed" if row.balance > 0 else "owes",
+            }
+            for row in self.balance_repo.get_user_friend_balances(db, user_id)
+            if round(row.balance, 2) != 0
+        ]
+        friends.sort(
+            key=lambda friend: (
+                friend["currency"],
+                -abs(friend["balance"]),
+                friend["user_id"],
+            )
+        )
+        return {
+            "user_id": user_id,
+            "totals": currency_totals(
+                (friend["currency"], friend["balance"]) for friend in friends
+            ),
+            "friends": friends,
+        }
 
     def calculate_user_balances_across_groups(
         self, db, user_id: int
     ) -> Dict[int, float]:
-        group_balances = {}
-
-        memberships = self.settlement_repo.get_user_group_memberships(db, user_id)
-
-        for membership in memberships:
-            group_balance = self.calculate_group_balances(db, membership.group_id)
-            user_balance = group_balance.get(user_id, 0.0)
-            if user_balance != 0:
-                group_balances[membership.group_id] = user_balance
-
-        return group_balances
+        return {
+            row.group_id: row.balance
+            for row in self.balance_repo.get_user_group_balances(db, user_id)
+            if round(row.balance, 2) != 0
+        }
 
     def get_group_settlement_summary(
-        self, db, group_id: int, requesting_user_id: int
+        self,
+        db,
+        group_id: int,
+        requesting_user_id: int,
+        mode: SettlementMode = SettlementMode.GREEDY,
     ) -> Optional[GroupSettlement]:
         if not self.validate_group_access(db, requesting_user_id, group_id):
             raise ValueError("User does not have access to this group")
@@ -82,6 +265,47 @@ class SettlementService:
         if not group:
             return None
 
+        # Group.version only tracks balances, so the cached summary leaves out
+        # names; they are looked up on every read and renames show at once.
+        cache_key = ("summary", group_id, group.version, mode)
+        summary = self.cache.get(cache_key) if self.cache is not None else None
+        if summary is None:
+            summary = self._build_group_settlement_summary(db, group, mode)
+            if self.cache is not None:
+                self.cache.set(cache_key, summary)
+        return self._with_names(db, group, summary)
+
+    def _with_names(self, db, group, summary: GroupSettlement) -> GroupSettlement:
+        user_ids = {balance.user_id for balance in summary.balances}
+        user_ids.update(s.from_user_id for s in summary.settlements)
+        user_ids.update(s.to_user_id for s in summary.settlements)
+        users = self.settlement_repo.get_users_by_ids(db, list(user_ids))
+        user_map = {user.id: user.username for user in users}
+
+        def name(user_id: int) -> str:
+            return user_map.get(user_id, f"User {user_id}")
+
+        return replace(
+            summary,
+            group_name=group.name,
+            balances=[
+                replace(balance, username=name(balance.user_id))
+                for balance in summary.balances
+            ],
+            settlements=[
+                replace(
+                    s,
+                    from_username=name(s.from_user_id),
+                    to_username=name(s.to_user_id),
+                )
+                for s in summary.settlements
+            ],
+        )
+
+    def _build_group_settlement_summary(
+        self, db, group, mode: SettlementMode
+    ) -> GroupSettlement:
+        group_id = group.id
         balance_dict = self.calculate_group_balances(db, group_id)
 
         user_ids = list(balance_dict.keys())
@@ -93,10 +317,11 @@ class SettlementService:
                 settlements=[],
                 total_expenses=0.0,
                 total_settlements_needed=0.0,
+                algorithm=mode.value,
             )
 
-        users = self.settlement_repo.get_users_by_ids(db, user_ids)
-        user_map = {user.id: user.username for user in users}
+        # Names are filled in by _with_names when the summary is read
+        user_map: Dict[int, str] = {}
 
         balances = [
             Balance(
@@ -108,7 +333,9 @@ class SettlementService:
             if abs(amount) > 0.01
         ]
 
-        settlements = self._calculate_optimal_settlements(db, balance_dict, user_map)
+        settlements, algorithm = self._calculate_optimal_settlements(
+            db, balance_dict, user_map, mode
+        )
 
         total_expenses = self.settlement_repo.get_group_total_expenses(db, group_id)
         total_settlements_needed = sum(
@@ -122,52 +349,31 @@ class SettlementService:
             settlements=settlements,
             total_expenses=round(total_expenses, 2),
             total_settlements_needed=round(total_settlements_needed, 2),
+            algorithm=algorithm,
         )
 
     def _calculate_optimal_settlements(
-        self, db, balances: Dict[int, float], user_map: Dict[int, str]
-    ) -> List[Settlement]:
-        settlements = []
-
-        creditors = [
-            (user_id, amount) for user_id, amount in balances.items() if amount > 0.01
-        ]
-        debtors = [
-            (user_id, -amount) for user_id, amount in balances.items() if amount < -0.01
+        self,
+        db,
+        balances: Dict[int, float],
+        user_map: Dict[int, str],
+        mode: SettlementMode = SettlementMode.GREEDY,
+    ) -> Tuple[List[Settlement], str]:
+        optimizer = self.optimizers[mode]
+        if not optimizer.can_optimize(balances):
+            optimizer = self.optimizers[SettlementMode.GREEDY]
+
+        settlements = [
+            Settlement(
+                from_user_id=debtor_id,
+                from_username=user_map.get(debtor_id, f"User {debtor_id}"),
+                to_user_id=creditor_id,
+                to_username=user_map.get(creditor_id, f"User {creditor_id}"),
+                amount=round(amount, 2),
+            )
+            for debtor_id, creditor_id, amount in optimizer.optimize(balances)
         ]
-
-        creditors.sort(key=lambda x: x[1], reverse=True)
-        debtors.sort(key=lambda x: x[1], reverse=True)
-
-        creditor_list = [[user_id, amount] for user_id, amount in creditors]
-        debtor_list = [[user_id, amount] for user_id, amount in debtors]
-
-        while creditor_list and debtor_list:
-            creditor_id, creditor_amount = creditor_list[0]
-            debtor_id, debtor_amount = debtor_list[0]
-
-            settlement_amount = min(creditor_amount, debtor_amount)
-
-            if settlement_amount > 0.01:
-                settlements.append(
-                    Settlement(
-                        from_user_id=debtor_id,
-                        from_username=user_map.get(debtor_id, f"User {debtor_id}"),
-                        to_user_id=creditor_id,
-                        to_username=user_map.get(creditor_id, f"User {creditor_id}"),
-                        amount=round(settlement_amount, 2),
-                    )
-                )
-
-            creditor_list[0][1] -= settlement_amount
-            debtor_list[0][1] -= settlement_amount
-
-            if creditor_list[0][1] <= 0.01:
-                creditor_list.pop(0)
-            if debtor_list[0][1] <= 0.01:
-                debtor_list.pop(0)
-
-        return settlements
+        return settlements, optimizer.mode.value
 
     def get_user_settlements_summary(
         self, db, user_id: int, requesting_user_id: int
@@ -179,38 +385,32 @@ class SettlementService:
         if not user:
             return None
 
-        group_balances = self.calculate_user_balances_across_groups(db, user_id)
-
-        total_owed_to_user = sum(
-            balance for balance in group_balances.values() if balance > 0
-        )
-        total_user_owes = sum(
-            abs(balance) for balance in group_balances.values() if balance < 0
-        )
-
-        group_details = {}
-        if group_balances:
-            groups = self.settlement_repo.get_groups_by_ids(
-                db, list(group_balances.keys())
-            )
-            group_details = {group.id: group.name for group in groups}
+        group_balances = [
+            row
+            for row in self.balance_repo.get_user_group_balances(db, user_id)
+            if round(row.balance, 2) != 0
+        ]
 
+        # Each group's balances are in its base currency
         return {
             "user_id": user_id,
             "username": user.username,
-            "total_owed_to_user": round(total_owed_to_user, 2),
-            "total_user_owes": round(total_user_owes, 2),
-            "net_balance": round(total_owed_to_user - total_user_owes, 2),
+            "totals": currency_totals(
+                (row.base_currency, row.balance) for row in group_balances
+            ),
             "group_balances": [
                 {
-                    "group_id": group_id,
-                    "group_name": group_details.get(group_id, f"Group {group_id}"),
-                    "balance": round(balance, 2),
+                    "group_id": row.group_id,
+                    "group_name": row.name,
+                    "currency": row.base_currency,
+                    "balance": round(row.balance, 2),
                     "status": (
-                        "owed" if balance > 0 else "owes" if balance < 0 else "settled"
+                        "owed"
+                        if row.balance > 0
+                        else "owes" if row.balance < 0 else "settled"
                     ),
                 }
-                for group_id, balance in group_balances.items()
+                for row in group_balances
             ],
         }
 
@@ -222,6 +422,7 @@ class SettlementService:
         to_user_id: int,
         amount: float,
         requesting_user_id: int,
+        commit: bool = True,
     ) -> bool:
         if not self.validate_group_access(db, requesting_user_id, group_id):
             raise ValueError("User does not have access to this group")
@@ -252,20 +453,278 @@ class SettlementService:
                 db, expense_id=settlement_expense.id, user_id=to_user_id, amount=amount
             )
 
-            self.settlement_repo.commit(db)
+            self.balance_repo.apply_deltas(
+                db, group_id, {from_user_id: amount, to_user_id: -amount}
+            )
+            self.settlement_repo.bump_group_version(db, group_id)
+            self.activity.record(
+                db,
+                group_id,
+                ActivityType.SETTLEMENT_RECORDED,
+                requesting_user_id,
+                settlement_expense.id,
+                {
+                    "from_user_id": from_user_id,
+                    "to_user_id": to_user_id,
+                    "amount": amount,
+                },
+            )
+
+            if commit:
+                self.settlement_repo.commit(db)
             return True
 
         except Exception:
             self.settlement_repo.rollback(db)
             return False
 
+    def settle_up(
+        self,
+        db,
+        group_id: int,
+        requesting_user_id: int,
+        transfers: Optional[List[Tuple[int, int, float]]] = None,
+        mode: SettlementMode = SettlementMode.GREEDY,
+    ) -> Dict[int, float]:
+        members = set(self.settlement_repo.get_group_members(db, group_id))
+        if requesting_user_id not in members:
+            raise ValueError("User does not have access to this group")
+
+        if transfers is None:
+            balances = self.calculate_group_balances(db, group_id)
+            optimizer = self.optimizers[mode]
+            if not optimizer.can_optimize(balances):
+                optimizer = self.optimizers[SettlementMode.GREEDY]
+            transfers = optimizer.optimize(balances)
+
+        user_ids = {user_id for f, t, _ in transfers for user_id in (f, t)}
+        non_members = sorted(user_ids - members)
+        if non_members:
+            raise ValueError(
+                f"Users not in this group: {', '.join(map(str, non_members))}"
+            )
+        if not transfers:
+            return self.calculate_group_balances(db, group_id)
+
+        users = self.settlement_repo.get_users_by_ids(db, list(user_ids))
+        user_map = {user.id: user.username for user in users}
+
+        try:
+            self._record_settlements(
+                db, group_id, transfers, user_map, requesting_user_id
+            )
+            self.settlement_repo.commit(db)
+        except Exception:
+            self.settlement_repo.rollback(db)
+            raise
+
+        return self.calculate_group_balances(db, group_id)
+
+    def _record_settlements(
+        self,
+        db,
+        group_id: int,
+        transfers: List[Tuple[int, int, float]],
+        user_map: Dict[int, str],
+        requesting_user_id: int,
+    ):
+        deltas = defaultdict(float)
+        rows = []
+        for from_user_id, to_user_id, amount in transfers:
+            description = (
+                f"Settlement payment from {user_map.get(from_user_id)} "
+                f"to {user_map.get(to_user_id)}"
+            )
+            rows.append((from_user_id, to_user_id, amount, description))
+            deltas[from_user_id] += amount
+            deltas[to_user_id] -= amount
+
+        expense_ids = self.settlement_repo.create_settlements_bulk(db, group_id, rows)
+        self.balance_repo.apply_deltas(db, group_id, deltas)
+        self.settlement_repo.bump_group_version(db, group_id)
+        self.activity.record_many(
+            db,
+            [
+                (
+                    group_id,
+                    ActivityType.SETTLEMENT_RECORDED,
+                    requesting_user_id,
+                    expense_id,
+                    {
+                        "from_user_id": from_user_id,
+                        "to_user_id": to_user_id,
+                        "amount": amount,
+                    },
+                )
+                for expense_id, (from_user_id, to_user_id, amount) in zip(
+                    expense_ids, transfers
+                )
+            ],
+        )
+
+    def _user_pairwise_positions(self, db, user_id: int):
+        """What each counterparty owes the user (negative: what the user owes
+        them) per group, keyed by (counterparty, currency) so that only
+        groups sharing a base currency are netted. Read from the transfers
+        that would settle each group's current ledger; raw expense sums would
+        ignore how the group has already been settled."""
+        balances = defaultdict(dict)
+        group_names = {}
+        currencies = {}
+        for row in self.balance_repo.get_balances_in_user_groups(db, user_id):
+            balances[row.group_id][row.user_id] = row.balance
+            group_names[row.group_id] = row.group_name
+            currencies[row.group_id] = row.base_currency
+
+        optimizer = self.optimizers[SettlementMode.GREEDY]
+        positions = defaultdict(lambda: defaultdict(float))
+        for group_id, group_balances in balances.items():
+            currency = currencies[group_id]
+            for debtor_id, creditor_id, amount in optimizer.optimize(group_balances):
+                if creditor_id == user_id:
+                    positions[(debtor_id, currency)][group_id] += amount
+                elif debtor_id == user_id:
+                    positions[(creditor_id, currency)][group_id] -= amount
+        return positions, group_names
+
+    def get_user_net_positions(
+        self,
+        db,
+        user_id: int,
+        requesting_user_id: int,
+        counterparty_ids: Optional[List[int]] = None,
+    ) -> Optional[Dict]:
+        if user_id != requesting_user_id:
+            raise ValueError("Users can only view their own settlement summary")
+
+        positions, group_names = self._user_pairwise_positions(db, user_id)
+        if counterparty_ids is not None:
+            positions = {
+                (other_id, currency): groups
+                for (other_id, currency), groups in positions.items()
+                if other_id in counterparty_ids
+            }
+
+        users = self.settlement_repo.get_users_by_ids(
+            db, [user_id, *{other_id for other_id, _ in positions}]
+        )
+        user_map = {user.id: user.username for user in users}
+        if user_id not in user_map:
+            return None
+
+        counterparties = []
+        payments = []
+        for (other_id, currency), groups in sorted(positions.items()):
+            net = round(sum(groups.values()), 2)
+            group_balances = [
+                {
+                    "group_id": group_id,
+                    "group_name": group_names[group_id],
+                    "balance": round(balance, 2),
+                }
+                for group_id, balance in groups.items()
+                if abs(balance) > 0.01
+            ]
+            if not group_balances:
+                continue
+            counterparties.append(
+                {
+                    "user_id": other_id,
+                    "username": user_map.get(other_id, f"User {other_id}"),
+                    "currency": currency,
+                    "net_balance": net,
+                    "status": "owed" if net > 0 else "owes" if net < 0 else "settled",
+                    "group_balances": group_balances,
+                }
+            )
+            if abs(net) > 0.01:
+                debtor_id, creditor_id = (
+                    (other_id, user_id) if net > 0 else (user_id, other_id)
+                )
+                payments.append(
+                    NetPayment(
+                        from_user_id=debtor_id,
+                        from_username=user_map.get(debtor_id, f"User {debtor_id}"),
+                        to_user_id=creditor_id,
+                        to_username=user_map.get(creditor_id, f"User {creditor_id}"),
+                        amount=abs(net),
+                        currency=currency,
+                    )
+                )
+
+        return {
+            "user_id": user_id,
+            "username": user_map[user_id],
+            "counterparties": counterparties,
+            "payments": payments,
+        }
+
+    def settle_user_net_positions(
+        self,
+        db,
+        user_id: int,
+        requesting_user_id: int,
+        counterparty_ids: Optional[List[int]] = None,
+    ) -> Optional[Dict]:
+        if user_id != requesting_user_id:
+            raise ValueError("Users can only settle their own balances")
+
+        positions, _ = self._user_pairwise_positions(db, user_id)
+        transfers_by_group = defaultdict(list)
+        for (other_id, _), groups in positions.items():
+            if counterparty_ids is not None and other_id not in counterparty_ids:
+                continue
+            for group_id, balance in groups.items():
+                amount = round(abs(balance), 2)
+                if amount <= 0.01:
+                    continue
+                if balance > 0:
+                    transfers_by_group[group_id].append((other_id, user_id, amount))
+                else:
+                    transfers_by_group[group_id].append((user_id, other_id, amount))
+
+        if transfers_by_group:
+            user_ids = {
+                uid
+                for transfers in transfers_by_group.values()
+                for f, t, _ in transfers
+                for uid in (f, t)
+            }
+            users = self.settlement_repo.get_users_by_ids(db, list(user_ids))
+            user_map = {user.id: user.username for user in users}
+            try:
+                for group_id, transfers in transfers_by_group.items():
+                    self._record_settlements(
+                        db, group_id, transfers, user_map, requesting_user_id
+                    )
+                self.settlement_repo.commit(db)
+            except Exception:
+                self.settlement_repo.rollback(db)
+                raise
+
+        return self.get_user_net_positions(
+            db, user_id, requesting_user_id, counterparty_ids
+        )
+
     def get_settlement_history(
-        self, db, group_id: int, requesting_user_id: int
-    ) -> List[Dict]:
+        self,
+        db,
+        group_id: int,
+        requesting_user_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
         if not self.validate_group_access(db, requesting_user_id, group_id):
             raise ValueError("User does not have access to this group")
 
-        settlements = self.settlement_repo.get_settlement_history(db, group_id)
+        after = decode_cursor(cursor) if cursor else None
+        settlements = self.settlement_repo.get_settlement_history(
+            db, group_id, limit=limit + 1, after=after
+        )
+        next_cursor = None
+        if len(settlements) > limit:
+            settlements = settlements[:limit]
+            next_cursor = encode_cursor(settlements[-1].created_at, settlements[-1].id)
 
         history = []
         for settlement in settlements:
@@ -287,4 +746,4 @@ class SettlementService:
                 }
             )
 
-        return history
+        return history, next_cursor
@@ -0,0 +1,112 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+_db_dir = tempfile.mkdtemp(prefix="splitwise-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+import pytest
+from sqlalchemy import event
+
+import app.models  # noqa: F401  (registers every table)
+from app.core.cache import fx_rate_cache, settlement_cache
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.models.expense import Expense, ExpenseType
+from app.models.expense_share import ExpenseShare
+from app.models.group import Group
+from app.models.group_member import GroupMember
+from app.models.user import User
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+        # Ids are reused once the tables are emptied
+        settlement_cache.clear()
+        fx_rate_cache.clear()
+
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def auth(user):
+    return {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+
+@contextmanager
+def count_queries():
+    """Collect the SQL statements run on the engine inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def make_users(db, count):
+    offset = db.query(User).count()
+    users = [
+        User(
+            username=f"user{offset + i}",
+            email=f"user{offset + i}@example.com",
+            password_hash="x",
+        )
+        for i in range(count)
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def make_group(db, creator, members=()):
+    group = Group(name="group", creator_id=creator.id)
+    db.add(group)
+    db.flush()
+    for user in (creator, *members):
+        db.add(GroupMember(group_id=group.id, user_id=user.id))
+    db.commit()
+    return group
+
+
+def make_expense(db, group, paid_by, amount, participants):
+    expense = Expense(
+        description="expense",
+        amount=amount,
+        paid_by=paid_by.id,
+        group_id=group.id if group is not None else None,
+        expense_type=ExpenseType.EQUAL,
+    )
+    db.add(expense)
+    db.flush()
+    share = round(amount / len(participants), 2)
+    for user in participants:
+        db.add(ExpenseShare(expense_id=expense.id, user_id=user.id, share_amount=share))
+    db.commit()
+    return expense
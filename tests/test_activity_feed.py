@@ -0,0 +1,93 @@
+from tests.conftest import auth, make_group, make_users
+
+
+def _feed(client, user, **params):
+    response = client.get("/activity/", params=params, headers=auth(user))
+    assert response.status_code == 200, response.text
+    return response
+
+
+def _events(client, user):
+    return [
+        (item["event_type"], (item["data"] or {}).get("user_id"))
+        for item in _feed(client, user).json()
+    ]
+
+
+def test_member_changes_fan_out_to_current_members(db, client):
+    a, b, c = make_users(db, 3)
+    group_id = make_group(db, a, [b]).id
+
+    added = client.post(
+        f"/groups/{group_id}/members", params={"user_id": c.id}, headers=auth(a)
+    )
+    assert added.status_code == 201, added.text
+    removed = client.delete(f"/groups/{group_id}/members/{b.id}", headers=auth(a))
+    assert removed.status_code == 204, removed.text
+    response = client.post(
+        "/expenses/create/equal",
+        json={
+            "amount": 10,
+            "paid_by": a.id,
+            "group_id": group_id,
+            "participant_ids": [a.id, c.id],
+        },
+        headers=auth(a),
+    )
+    assert response.status_code == 201, response.text
+
+    assert _events(client, a) == [
+        ("expense_created", None),
+        ("member_removed", b.id),
+        ("member_added", c.id),
+    ]
+    assert _events(client, c) == [
+        ("expense_created", None),
+        ("member_removed", b.id),
+        ("member_added", c.id),
+    ]
+    # b sees their own removal but nothing after it
+    assert _events(client, b) == [
+        ("member_removed", b.id),
+        ("member_added", c.id),
+    ]
+
+
+def test_feed_pages_follow_the_cursor(db, client):
+    a, b = make_users(db, 2)
+    group_id = make_group(db, a, [b]).id
+    for amount in range(1, 6):
+        response = client.post(
+            "/expenses/create/equal",
+            json={
+                "amount": amount,
+                "paid_by": a.id,
+                "group_id": group_id,
+                "participant_ids": [a.id, b.id],
+            },
+            headers=auth(a),
+        )
+        assert response.status_code == 201, response.text
+
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = _feed(client, b, **params)
+        ids.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    everything = [item["id"] for item in _feed(client, b).json()]
+    assert len(everything) == 5
+    assert ids == everything == sorted(everything, reverse=True)
+
+
+def test_invalid_cursor_is_rejected(db, client):
+    (a,) = make_users(db, 1)
+
+    response = client.get("/activity/", params={"cursor": "x"}, headers=auth(a))
+
+    assert response.status_code == 400, response.text
@@ -0,0 +1,131 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.balance_checkpoint import BalanceCheckpoint
+from app.models.expense import Expense
+from app.models.user import User
+from app.repositories.balance_repository import BalanceRepository
+from app.repositories.settlement_repository import SettlementRepository
+from app.services.settlement_service import SettlementService
+from tests.conftest import auth, make_group, make_users
+
+
+@pytest.fixture
+def service():
+    return SettlementService(SettlementRepository(), BalanceRepository())
+
+
+def _expense_on(db, client, payer, other, group_id, amount, created_at):
+    response = client.post(
+        "/expenses/create/equal",
+        json={
+            "amount": amount,
+            "paid_by": payer.id,
+            "group_id": group_id,
+            "participant_ids": [other.id],
+        },
+        headers=auth(payer),
+    )
+    assert response.status_code == 201, response.text
+    expense_id = response.json()["expense"]["id"]
+    db.query(Expense).filter(Expense.id == expense_id).update(
+        {"created_at": created_at}
+    )
+    db.commit()
+    return expense_id
+
+
+def _rounded(balances):
+    return {user_id: round(v, 2) for user_id, v in balances.items() if round(v, 2)}
+
+
+def _checkpoint_ids(db, group_id):
+    return {
+        row.as_of_expense_id
+        for row in db.query(BalanceCheckpoint).filter_by(group_id=group_id)
+    }
+
+
+@pytest.fixture
+def january(db, client, service):
+    """A pays 100 for B on Jan 1 and B pays 30 for A on Jan 10, checkpointed;
+    then A pays 10 for B on Jan 20."""
+    a, b = make_users(db, 2)
+    group_id = make_group(db, a, [b]).id
+    first = _expense_on(db, client, a, b, group_id, 100, datetime(2026, 1, 1))
+    second = _expense_on(db, client, b, a, group_id, 30, datetime(2026, 1, 10))
+    assert service.create_group_checkpoint(db, group_id) == second
+    _expense_on(db, client, a, b, group_id, 10, datetime(2026, 1, 20))
+    return (a.id, b.id), group_id, first, second
+
+
+def test_as_of_before_and_after_checkpoint(db, service, january):
+    (a, b), group_id, _, _ = january
+
+    def as_of(day):
+        return _rounded(
+            service.calculate_group_balances_as_of(db, group_id, datetime(2026, 1, day))
+        )
+
+    assert as_of(5) == {a: 100.0, b: -100.0}
+    assert as_of(15) == {a: 70.0, b: -70.0}
+    assert as_of(25) == {a: 80.0, b: -80.0}
+    assert _rounded(service.recompute_group_balances(db, group_id)) == _rounded(
+        BalanceRepository().get_group_balances(db, group_id)
+    )
+
+
+def test_as_of_route_uses_checkpoint(db, client, january):
+    (a, b), group_id, _, _ = january
+
+    response = client.get(
+        f"/settlements/groups/{group_id}/balances",
+        params={"as_of": "2026-01-15T00:00:00"},
+        headers=auth(db.get(User, a)),
+    )
+
+    assert response.status_code == 200, response.text
+    assert {row["user_id"]: row["balance"] for row in response.json()["balances"]} == {
+        a: 70.0,
+        b: -70.0,
+    }
+
+
+def test_updating_expense_before_checkpoint_invalidates_it(
+    db, client, service, january
+):
+    (a, b), group_id, first, second = january
+    assert _checkpoint_ids(db, group_id) == {second}
+
+    response = client.put(
+        f"/expenses/{first}/update/equal",
+        json={
+            "description": "corrected",
+            "amount": 50,
+            "paid_by": a,
+            "group_id": group_id,
+            "participant_ids": [b],
+        },
+        headers=auth(db.get(User, a)),
+    )
+
+    assert response.status_code == 200, response.text
+    assert _checkpoint_ids(db, group_id) == set()
+    assert _rounded(
+        service.calculate_group_balances_as_of(db, group_id, datetime(2026, 1, 15))
+    ) == {a: 20.0, b: -20.0}
+
+
+def test_deleting_expense_before_checkpoint_invalidates_it(
+    db, client, service, january
+):
+    (a, b), group_id, first, second = january
+
+    response = client.delete(f"/expenses/{first}", headers=auth(db.get(User, a)))
+
+    assert response.status_code in (200, 204), response.text
+    assert _checkpoint_ids(db, group_id) == set()
+    assert _rounded(
+        service.calculate_group_balances_as_of(db, group_id, datetime(2026, 1, 15))
+    ) == {a: -30.0, b: 30.0}
@@ -0,0 +1,25 @@
+from app.core import cache
+from app.core.cache import LRUCache
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    lru = LRUCache(max_size=4, ttl_seconds=10)
+    lru.set("USD", 1.0)
+
+    now[0] = 109.0
+    assert lru.get("USD") == 1.0
+    now[0] = 110.0
+    assert lru.get("USD") is None
+    assert lru.stats()["size"] == 0
+
+
+def test_entries_without_ttl_do_not_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    lru = LRUCache(max_size=4)
+    lru.set("USD", 1.0)
+
+    now[0] = 1e9
+    assert lru.get("USD") == 1.0
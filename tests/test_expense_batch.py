@@ -0,0 +1,190 @@
+import pytest
+
+from app.core.config import settings
+from app.models.balance_checkpoint import BalanceCheckpoint
+from app.models.expense import Expense
+from app.models.friend_balance import FriendBalance
+from app.models.group import Group
+from app.models.spending_rollup import SpendingRollup
+from app.repositories.balance_repository import BalanceRepository
+from app.repositories.settlement_repository import SettlementRepository
+from app.services.settlement_service import SettlementService
+from tests.conftest import auth, make_group, make_users
+
+
+def _create(client, payer, users, group_id=None, amount=30):
+    response = client.post(
+        "/expenses/create/equal",
+        json={
+            "amount": amount,
+            "paid_by": payer.id,
+            "group_id": group_id,
+            "participant_ids": [user.id for user in users],
+        },
+        headers=auth(payer),
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["expense"]["id"]
+
+
+def _balances(db, group_id):
+    return {
+        user_id: round(balance, 2)
+        for user_id, balance in BalanceRepository()
+        .get_group_balances(db, group_id)
+        .items()
+        if round(balance, 2)
+    }
+
+
+def _paid_by_group(db):
+    paid = {}
+    for row in db.query(SpendingRollup):
+        paid[row.group_id] = round(paid.get(row.group_id, 0) + row.paid, 2)
+    return {group_id: total for group_id, total in paid.items() if total}
+
+
+def _friend_balances(db):
+    return [
+        (row.user_low, row.user_high, round(row.balance, 2))
+        for row in db.query(FriendBalance)
+        if round(row.balance, 2)
+    ]
+
+
+def _version(db, group_id):
+    return db.query(Group.version).filter_by(id=group_id).scalar()
+
+
+def _checkpoints(db, group_id):
+    return db.query(BalanceCheckpoint).filter_by(group_id=group_id).count()
+
+
+@pytest.fixture
+def ledger(db, client, monkeypatch):
+    """Two groups of a and b: the first has a 30 and a 10 expense paid by a
+    and a checkpoint after both; a also paid 20 for b outside any group."""
+    monkeypatch.setattr(settings, "BALANCE_CHECKPOINT_LAG_SECONDS", -60)
+    a, b = make_users(db, 2)
+    source_id = make_group(db, a, [b]).id
+    target_id = make_group(db, a, [b]).id
+    first = _create(client, a, [a, b], source_id, 30)
+    second = _create(client, a, [a, b], source_id, 10)
+    friend = _create(client, a, [a, b], None, 20)
+    service = SettlementService(SettlementRepository(), BalanceRepository())
+    assert service.create_group_checkpoint(db, source_id) == second
+    return (a, b), source_id, target_id, (first, second, friend)
+
+
+def test_delete_batch_reverses_every_ledger(db, client, ledger):
+    (a, b), source_id, _, (first, second, friend) = ledger
+    version = _version(db, source_id)
+    assert _friend_balances(db) == [(a.id, b.id, 10.0)]
+
+    response = client.post(
+        "/expenses/batch/delete",
+        json={"expense_ids": [first, friend]},
+        headers=auth(a),
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["expense_ids"] == sorted([first, friend])
+    db.expire_all()
+    assert _balances(db, source_id) == {a.id: 5.0, b.id: -5.0}
+    assert _friend_balances(db) == []
+    assert _paid_by_group(db) == {source_id: 10.0}
+    assert _version(db, source_id) > version
+    assert _checkpoints(db, source_id) == 0
+    assert db.query(Expense).filter(Expense.id.in_([first, friend])).count() == 0
+
+
+def test_move_batch_reverses_the_source_and_applies_to_the_target(db, client, ledger):
+    (a, b), source_id, target_id, (first, second, friend) = ledger
+    versions = (_version(db, source_id), _version(db, target_id))
+
+    response = client.post(
+        "/expenses/batch/move",
+        json={"expense_ids": [first, friend], "group_id": target_id},
+        headers=auth(a),
+    )
+
+    assert response.status_code == 200, response.text
+    db.expire_all()
+    assert _balances(db, source_id) == {a.id: 5.0, b.id: -5.0}
+    assert _balances(db, target_id) == {a.id: 25.0, b.id: -25.0}
+    assert _friend_balances(db) == []
+    assert _paid_by_group(db) == {source_id: 10.0, target_id: 50.0}
+    assert _version(db, source_id) > versions[0]
+    assert _version(db, target_id) > versions[1]
+    assert _checkpoints(db, source_id) == 0
+    assert {
+        group_id
+        for (group_id,) in db.query(Expense.group_id).filter(
+            Expense.id.in_([first, friend])
+        )
+    } == {target_id}
+
+
+@pytest.mark.parametrize(
+    "path, extra",
+    [("/expenses/batch/delete", False), ("/expenses/batch/move", True)],
+)
+def test_batch_is_rejected_whole_when_one_expense_is_not_accessible(
+    db, client, ledger, path, extra
+):
+    (a, b), source_id, target_id, (first, second, friend) = ledger
+    (outsider,) = make_users(db, 1)
+    foreign = _create(
+        client, outsider, [outsider], make_group(db, outsider).id, amount=5
+    )
+    before = (
+        _balances(db, source_id),
+        _friend_balances(db),
+        _paid_by_group(db),
+        _version(db, source_id),
+        _checkpoints(db, source_id),
+    )
+    payload = {"expense_ids": [first, friend, foreign]}
+    if extra:
+        payload["group_id"] = target_id
+
+    response = client.post(path, json=payload, headers=auth(a))
+
+    assert response.status_code in (400, 403), response.text
+    assert str(foreign) in response.json()["detail"]
+    db.expire_all()
+    assert (
+        _balances(db, source_id),
+        _friend_balances(db),
+        _paid_by_group(db),
+        _version(db, source_id),
+        _checkpoints(db, source_id),
+    ) == before
+    assert _balances(db, target_id) == {}
+    assert db.query(Expense).filter(Expense.id.in_([first, friend])).count() == 2
+
+
+def test_move_rejects_non_group_expense_without_currency_into_other_currency(
+    db, client
+):
+    a, b = make_users(db, 2)
+    group = make_group(db, a, [b])
+    group.base_currency = "EUR"
+    group_id = group.id
+    db.commit()
+    response = client.post(
+        "/expenses/create/equal",
+        json={"amount": 10, "paid_by": a.id, "participant_ids": [a.id, b.id]},
+        headers=auth(a),
+    )
+    assert response.status_code == 201, response.text
+    expense_id = response.json()["expense"]["id"]
+
+    response = client.post(
+        "/expenses/batch/move",
+        json={"expense_ids": [expense_id], "group_id": group_id},
+        headers=auth(a),
+    )
+
+    assert response.status_code == 400, response.text
+    assert db.get(Expense, expense_id).group_id is None
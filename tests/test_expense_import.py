@@ -0,0 +1,37 @@
+from app.services.expense_import_service import ExpenseImportService
+from tests.conftest import auth, make_group, make_users
+
+NDJSON_ROW = (
+    '{"expense_type": "equal", "amount": 30, "paid_by": %d, "participant_ids": [%d]}\n'
+)
+
+
+def test_import_into_missing_group_returns_404(db, client):
+    (user,) = make_users(db, 1)
+
+    response = client.post(
+        "/expenses/import/999?format=ndjson", content=b"", headers=auth(user)
+    )
+
+    assert response.status_code == 404
+
+
+def test_failed_batch_does_not_leak_database_errors(db, client, monkeypatch):
+    (user,) = make_users(db, 1)
+    group_id = make_group(db, user).id
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("duplicate key value violates unique constraint")
+
+    monkeypatch.setattr(ExpenseImportService, "_insert_batch", fail)
+
+    response = client.post(
+        f"/expenses/import/{group_id}?format=ndjson",
+        content=(NDJSON_ROW % (user.id, user.id)).encode(),
+        headers=auth(user),
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["imported"] == 0
+    assert body["errors"] == [{"line": 1, "error": "Batch insert failed"}]
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from sqlalchemy import event
+
+from app.core.database import engine
+from app.repositories.expense_repository import ExpenseRepository
+from app.models.expense import ExpenseType
+from app.schemas.expense_schema import ExpenseFilters
+from tests.conftest import make_expense, make_group, make_users
+
+
+def _query_plans(db, run):
+    """EXPLAIN QUERY PLAN for every SELECT ``run`` sends, with its parameters."""
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        return [
+            " | ".join(
+                row[-1]
+                for row in cursor.execute(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                ).fetchall()
+            )
+            for statement, parameters in executed
+        ]
+    finally:
+        cursor.close()
+
+
+def test_group_payer_date_listing_uses_composite_index(db):
+    users = make_users(db, 3)
+    group = make_group(db, users[0], users[1:])
+    for i in range(6):
+        make_expense(db, group, users[i % 3], 30.0, users)
+    group_id, payer_id = group.id, users[1].id
+    now = datetime.now(timezone.utc)
+    filters = ExpenseFilters(
+        paid_by=payer_id,
+        start_date=now - timedelta(days=1),
+        end_date=now + timedelta(days=1),
+    )
+
+    plans = _query_plans(
+        db,
+        lambda: ExpenseRepository().list_for_group(
+            db, group_id, limit=20, filters=filters
+        ),
+    )
+
+    assert "ix_expenses_group_payer_created_at" in plans[0]
+
+
+def test_share_lookup_uses_expense_user_index(db):
+    users = make_users(db, 3)
+    group = make_group(db, users[0], users[1:])
+    expense_id = make_expense(db, group, users[0], 30.0, users).id
+    group_id = group.id
+
+    # The second statement is the selectinload of the listed expenses' shares
+    listing_plans = _query_plans(
+        db, lambda: ExpenseRepository().list_for_group(db, group_id, limit=20)
+    )
+    share_plans = _query_plans(
+        db, lambda: ExpenseRepository().list_shares(db, expense_id)
+    )
+
+    assert "ix_expense_shares_expense_user" in listing_plans[1]
+    assert "ix_expense_shares_expense_user" in share_plans[0]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"paid_by": 2},
+        {"start_date": datetime(2026, 1, 1), "end_date": datetime(2027, 1, 1)},
+        {"participant_id": 2},
+        {"expense_type": ExpenseType.EXACT},
+        {"min_amount": 10, "max_amount": 100},
+    ],
+    ids=["payer", "dates", "participant", "type", "amount"],
+)
+def test_filtered_listing_never_scans_a_table(db, filters):
+    users = make_users(db, 3)
+    group = make_group(db, users[0], users[1:])
+    for i in range(6):
+        make_expense(db, group, users[i % 3], 30.0, users)
+    group_id = group.id
+
+    plans = _query_plans(
+        db,
+        lambda: ExpenseRepository().list_for_group(
+            db, group_id, limit=20, filters=ExpenseFilters(**filters)
+        ),
+    )
+
+    for plan in plans:
+        assert "SCAN expenses" not in plan, plan
+        assert "SCAN expense_shares" not in plan, plan
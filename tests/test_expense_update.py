@@ -0,0 +1,47 @@
+from tests.conftest import auth, count_queries, make_group, make_users
+
+
+def _create_expense(client, users, group_id):
+    response = client.post(
+        "/expenses/create/equal",
+        json={
+            "description": "dinner",
+            "amount": 60,
+            "paid_by": users[0].id,
+            "group_id": group_id,
+            "participant_ids": [user.id for user in users],
+        },
+        headers=auth(users[0]),
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["expense"]["id"]
+
+
+def test_metadata_only_edit_does_not_reload_shares(db, client):
+    users = make_users(db, 6)
+    group_id = make_group(db, users[0], users[1:]).id
+    expense_id = _create_expense(client, users, group_id)
+    headers = auth(users[0])
+
+    with count_queries() as queries:
+        response = client.put(
+            f"/expenses/{expense_id}/update/equal",
+            json={
+                "description": "team dinner",
+                "amount": 60,
+                "paid_by": users[0].id,
+                "group_id": group_id,
+                "participant_ids": [user.id for user in users],
+            },
+            headers=headers,
+        )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["expense"]["description"] == "team dinner"
+    assert len(response.json()["shares"]) == 6
+    share_selects = [
+        q
+        for q in queries
+        if q.lstrip().startswith("SELECT") and "FROM expense_shares" in q
+    ]
+    assert len(share_selects) == 1, share_selects
@@ -0,0 +1,51 @@
+from app.repositories.balance_repository import BalanceRepository
+from app.repositories.settlement_repository import SettlementRepository
+from app.services.settlement_service import SettlementService
+from tests.conftest import auth, make_users
+
+
+def _friend_expense(client, payer, other, amount, currency=None):
+    response = client.post(
+        "/expenses/create/equal",
+        json={
+            "amount": amount,
+            "paid_by": payer.id,
+            "currency": currency,
+            "participant_ids": [payer.id, other.id],
+        },
+        headers=auth(payer),
+    )
+    assert response.status_code == 201, response.text
+
+
+def test_friend_balances_are_kept_per_currency(db, client):
+    a, b = make_users(db, 2)
+    _friend_expense(client, a, b, 20, "EUR")
+    _friend_expense(client, a, b, 30, "USD")
+    _friend_expense(client, b, a, 10)
+
+    response = client.get("/settlements/friends", headers=auth(a))
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [(f["currency"], f["balance"]) for f in body["friends"]] == [
+        ("EUR", 10.0),
+        ("USD", 10.0),
+    ]
+    assert [(t["currency"], t["net_balance"]) for t in body["totals"]] == [
+        ("EUR", 10.0),
+        ("USD", 10.0),
+    ]
+
+
+def test_rebuild_matches_the_live_friend_ledger(db, client):
+    a, b, c = make_users(db, 3)
+    user_id = a.id
+    _friend_expense(client, a, b, 20, "EUR")
+    _friend_expense(client, c, a, 12)
+    service = SettlementService(SettlementRepository(), BalanceRepository())
+    live = service.get_friend_balances(db, user_id)
+
+    service.rebuild_friend_ledger(db)
+
+    assert service.get_friend_balances(db, user_id) == live
@@ -0,0 +1,72 @@
+from app.models.group import Group
+from app.models.group_member import GroupMember
+from app.repositories.balance_repository import BalanceRepository
+from app.repositories.group_repository import GroupRepository
+from tests.conftest import count_queries, make_group, make_users
+
+
+def _creator_only_group(db, creator, members):
+    """A group whose creator has no membership row of their own."""
+    group = Group(name="group", creator_id=creator.id)
+    db.add(group)
+    db.flush()
+    for user in members:
+        db.add(GroupMember(group_id=group.id, user_id=user.id))
+    db.commit()
+    return group.id
+
+
+def test_pages_cover_every_group_once_in_id_order(db):
+    a, b, c = make_users(db, 3)
+    mine = [make_group(db, a, [b]).id for _ in range(3)]
+    make_group(db, b, [c])
+    mine.append(make_group(db, b, [a]).id)
+    mine.append(_creator_only_group(db, a, [b]))
+    user_id = a.id
+    repo = GroupRepository()
+
+    seen, after_id = [], None
+    while True:
+        with count_queries() as queries:
+            rows = repo.list_for_user(db, user_id, 2, after_id)
+        assert len(queries) == 1
+        seen.extend(group.id for group, _, _ in rows)
+        if len(rows) < 2:
+            break
+        after_id = rows[-1][0].id
+
+    assert seen == sorted(mine)
+
+
+def test_member_count_counts_the_creator_once(db):
+    a, b, c = make_users(db, 3)
+    member_id = make_group(db, a, [b, c]).id
+    creator_only_id = _creator_only_group(db, a, [b])
+
+    rows = GroupRepository().list_for_user(db, a.id, 10, with_member_count=True)
+
+    assert [(group.id, count) for group, count, _ in rows] == [
+        (member_id, 3),
+        (creator_only_id, 2),
+    ]
+
+
+def test_balance_is_the_users_own_and_defaults_to_zero(db):
+    a, b = make_users(db, 2)
+    owed_id = make_group(db, a, [b]).id
+    empty_id = make_group(db, a, [b]).id
+    BalanceRepository().apply_deltas(db, owed_id, {a.id: 12.5, b.id: -12.5})
+    db.commit()
+    repo = GroupRepository()
+
+    rows = repo.list_for_user(db, a.id, 10, with_balance=True)
+    plain = repo.list_for_user(db, b.id, 10)
+
+    assert [(group.id, balance) for group, _, balance in rows] == [
+        (owed_id, 12.5),
+        (empty_id, 0.0),
+    ]
+    assert [(count, balance) for _, count, balance in plain] == [
+        (None, None),
+        (None, None),
+    ]
@@ -0,0 +1,58 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models.expense import Expense
+from app.models.idempotency_key import IdempotencyKey
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.routes.idempotency import idempotent_response
+from tests.conftest import auth, make_group, make_users
+
+
+def test_duplicate_of_running_request_gets_409_with_retry_after(db):
+    (user,) = make_users(db, 1)
+    user_id = user.id
+    seen = {}
+
+    def handler():
+        # A duplicate arriving while this request still runs
+        try:
+            idempotent_response(db, user_id, "k", "POST", "/x", {}, lambda: (201, {}))
+        except HTTPException as e:
+            seen["error"] = e
+        return 201, {"ok": True}
+
+    response = idempotent_response(db, user_id, "k", "POST", "/x", {}, handler)
+    replay = idempotent_response(db, user_id, "k", "POST", "/x", {}, lambda: (500, {}))
+
+    assert response.status_code == 201
+    assert seen["error"].status_code == 409
+    assert seen["error"].headers["Retry-After"] == "1"
+    assert replay.status_code == 201
+    assert replay.headers["Idempotent-Replayed"] == "true"
+
+
+def test_expense_and_stored_response_commit_together(db, client, monkeypatch):
+    a, b = make_users(db, 2)
+    group_id, a_id, b_id = make_group(db, a, [b]).id, a.id, b.id
+    headers = {**auth(a), "Idempotency-Key": "crash"}
+    body = {
+        "amount": 10,
+        "paid_by": a_id,
+        "group_id": group_id,
+        "participant_ids": [a_id, b_id],
+    }
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("process died before storing the response")
+
+    monkeypatch.setattr(IdempotencyRepository, "complete", crash)
+    with pytest.raises(RuntimeError):
+        client.post("/expenses/create/equal", json=body, headers=headers)
+    db.expire_all()
+    assert db.query(Expense).count() == 0
+    assert db.query(IdempotencyKey).count() == 0
+
+    monkeypatch.undo()
+    retry = client.post("/expenses/create/equal", json=body, headers=headers)
+    assert retry.status_code == 201, retry.text
+    assert db.query(Expense).count() == 1
@@ -0,0 +1,84 @@
+from app.repositories.balance_repository import BalanceRepository
+from tests.conftest import auth, make_group, make_users
+
+
+def _pay_for(client, payer, participant, group_id, amount):
+    response = client.post(
+        "/expenses/create/equal",
+        json={
+            "amount": amount,
+            "paid_by": payer.id,
+            "group_id": group_id,
+            "participant_ids": [participant.id],
+        },
+        headers=auth(payer),
+    )
+    assert response.status_code == 201, response.text
+
+
+def _chain(db, client):
+    """A pays 10 for B, B pays 10 for C: C owes A 10 and B is square."""
+    a, b, c = make_users(db, 3)
+    group_id = make_group(db, a, [b, c]).id
+    _pay_for(client, a, b, group_id, 10)
+    _pay_for(client, b, c, group_id, 10)
+    return (a, b, c), group_id
+
+
+def test_net_positions_follow_the_group_ledger(db, client):
+    (a, b, c), _ = _chain(db, client)
+
+    response = client.get(f"/settlements/users/{a.id}/net", headers=auth(a))
+
+    assert response.status_code == 200, response.text
+    assert [
+        (row["user_id"], row["net_balance"])
+        for row in response.json()["counterparties"]
+    ] == [(c.id, 10.0)]
+
+
+def test_net_settle_after_group_settle_up_changes_nothing(db, client):
+    (a, b, c), group_id = _chain(db, client)
+    response = client.post(
+        f"/settlements/groups/{group_id}/settle-up", json={}, headers=auth(a)
+    )
+    assert response.status_code == 200, response.text
+
+    net = client.get(f"/settlements/users/{a.id}/net", headers=auth(a))
+    settle = client.post(
+        f"/settlements/users/{a.id}/net/settle", json={}, headers=auth(a)
+    )
+
+    assert net.json()["counterparties"] == []
+    assert settle.status_code == 200, settle.text
+    assert settle.json()["payments"] == []
+    balances = BalanceRepository().get_group_balances(db, group_id)
+    assert all(abs(balance) < 0.01 for balance in balances.values())
+
+
+def test_positions_and_totals_are_kept_per_base_currency(db, client):
+    a, b = make_users(db, 2)
+    usd_id = make_group(db, a, [b]).id
+    eur = make_group(db, a, [b])
+    eur.base_currency = "EUR"
+    eur_id = eur.id
+    db.commit()
+    _pay_for(client, a, b, usd_id, 10)
+    _pay_for(client, b, a, eur_id, 10)
+
+    net = client.get(f"/settlements/users/{a.id}/net", headers=auth(a))
+    summary = client.get(f"/settlements/users/{a.id}", headers=auth(a))
+
+    assert net.status_code == 200, net.text
+    assert [
+        (row["user_id"], row["currency"], row["net_balance"])
+        for row in net.json()["counterparties"]
+    ] == [(b.id, "EUR", -10.0), (b.id, "USD", 10.0)]
+    assert [
+        (p["from_user_id"], p["currency"], p["amount"]) for p in net.json()["payments"]
+    ] == [(a.id, "EUR", 10.0), (b.id, "USD", 10.0)]
+    assert summary.status_code == 200, summary.text
+    assert [
+        (t["currency"], t["total_owed_to_user"], t["total_user_owes"])
+        for t in summary.json()["totals"]
+    ] == [("EUR", 0.0, 10.0), ("USD", 10.0, 0.0)]
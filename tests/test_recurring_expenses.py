@@ -0,0 +1,98 @@
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.models.expense import Expense, ExpenseType
+from app.models.recurring_expense import RecurrenceCadence
+from app.models.spending_rollup import SpendingRollup
+from app.repositories.balance_repository import BalanceRepository
+from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.group_repository import GroupRepository
+from app.repositories.recurring_expense_repository import RecurringExpenseRepository
+from app.repositories.settlement_repository import SettlementRepository
+from app.schemas.recurring_expense_schema import RecurringExpenseCreate
+from app.services.expense_service import ExpenseService
+from app.services.recurring_expense_service import RecurringExpenseService
+from app.services.settlement_service import SettlementService
+from tests.conftest import auth, make_group, make_users
+
+
+def _service():
+    return RecurringExpenseService(
+        RecurringExpenseRepository(),
+        ExpenseService(ExpenseRepository(), GroupRepository(), BalanceRepository()),
+    )
+
+
+def _weekly_template(db, service, group_id, payer_id, other_id, amount):
+    service.create_template(
+        db,
+        RecurringExpenseCreate(
+            group_id=group_id,
+            expense_type=ExpenseType.EXACT,
+            cadence=RecurrenceCadence.WEEKLY,
+            start_date=date(2026, 1, 5),
+            expense={
+                "amount": amount,
+                "paid_by": payer_id,
+                "shares": [{"user_id": other_id, "share_amount": amount}],
+            },
+        ),
+        requester_id=payer_id,
+    )
+    db.commit()
+
+
+def test_backlogged_occurrences_roll_up_on_their_period(db):
+    a, b = make_users(db, 2)
+    a_id, b_id = a.id, b.id
+    group_id = make_group(db, a, [b]).id
+    service = _service()
+    _weekly_template(db, service, group_id, a_id, b_id, 20.0)
+    started = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+    result = service.run_due(db, today=date(2026, 1, 20), batch_size=10)
+
+    periods = [date(2026, 1, 5), date(2026, 1, 12), date(2026, 1, 19)]
+    assert result["created"] == 3
+    rows = db.query(Expense.occurrence_date, Expense.created_at).order_by(Expense.id)
+    assert [occurrence_date for occurrence_date, _ in rows] == periods
+    # created_at stays the insert time, in id order
+    assert all(created_at >= started for _, created_at in rows)
+    rollup_days = sorted(
+        day for (day,) in db.query(SpendingRollup.day).filter_by(user_id=a_id)
+    )
+    assert rollup_days == periods
+
+
+def test_backlogged_occurrences_keep_checkpoints_in_id_order(db, client, monkeypatch):
+    monkeypatch.setattr(settings, "BALANCE_CHECKPOINT_LAG_SECONDS", -60)
+    a, b = make_users(db, 2)
+    a_id, b_id = a.id, b.id
+    group_id = make_group(db, a, [b]).id
+    response = client.post(
+        "/expenses/create/exact",
+        json={
+            "amount": 100,
+            "paid_by": a_id,
+            "group_id": group_id,
+            "shares": [{"user_id": b_id, "share_amount": 100}],
+        },
+        headers=auth(a),
+    )
+    assert response.status_code == 201, response.text
+    service = _service()
+    _weekly_template(db, service, group_id, b_id, a_id, 10.0)
+    service.run_due(db, today=date(2026, 1, 6), batch_size=10)
+    settlements = SettlementService(SettlementRepository(), BalanceRepository())
+    assert settlements.create_group_checkpoint(db, group_id) is not None
+
+    now = datetime.now(timezone.utc)
+    before = settlements.calculate_group_balances_as_of(
+        db, group_id, now - timedelta(days=1)
+    )
+    after = settlements.calculate_group_balances_as_of(
+        db, group_id, now + timedelta(days=1)
+    )
+
+    assert {k: v for k, v in before.items() if round(v, 2)} == {}
+    assert after == {a_id: 90.0, b_id: -90.0}
@@ -0,0 +1,103 @@
+import itertools
+import random
+
+from app.repositories.balance_repository import BalanceRepository
+from app.repositories.settlement_repository import SettlementRepository
+from app.services.settlement_optimizers import (
+    GreedySettlementOptimizer,
+    MinimalTransfersOptimizer,
+    SettlementMode,
+)
+from app.services.settlement_service import SettlementService
+
+
+def _brute_force_min_transfers(cents):
+    """n - (most disjoint zero-sum blocks), found over every set partition."""
+    values = [v for v in cents if abs(v) > 1]
+
+    def most_blocks(remaining):
+        if not remaining:
+            return 0
+        first, rest = remaining[0], remaining[1:]
+        best = -len(values)
+        for size in range(len(rest) + 1):
+            for others in itertools.combinations(range(len(rest)), size):
+                block = [first] + [rest[i] for i in others]
+                if abs(sum(block)) <= 1:
+                    left = [rest[i] for i in range(len(rest)) if i not in others]
+                    best = max(best, 1 + most_blocks(left))
+        return best
+
+    return len(values) - most_blocks(values)
+
+
+def _residual(balances, transfers):
+    left = dict(balances)
+    for debtor_id, creditor_id, amount in transfers:
+        left[debtor_id] += amount
+        left[creditor_id] -= amount
+    return max(abs(v) for v in left.values())
+
+
+def _random_balances(rng, n):
+    cents = [rng.randint(-5000, 5000) for _ in range(n - 1)]
+    cents.append(-sum(cents))
+    return {user_id: c / 100 for user_id, c in enumerate(cents, start=1)}
+
+
+def test_minimal_matches_brute_force_on_small_inputs():
+    rng = random.Random(7)
+    optimizer = MinimalTransfersOptimizer()
+    for n in range(2, 8):
+        for _ in range(20):
+            balances = _random_balances(rng, n)
+            transfers = optimizer.optimize(balances)
+
+            expected = _brute_force_min_transfers(
+                [int(round(v * 100)) for v in balances.values()]
+            )
+            assert len(transfers) == expected, balances
+            assert _residual(balances, transfers) < 0.02
+
+
+def test_minimal_settles_zero_sum_subsets_separately():
+    # {1, 4} and {2, 3, 5} each sum to zero: 1 + 2 transfers, where greedy
+    # pairs the largest balances across the subsets and needs 4.
+    balances = {1: -7.0, 2: -5.0, 3: -5.0, 4: 7.0, 5: 10.0}
+
+    transfers = MinimalTransfersOptimizer().optimize(balances)
+
+    assert len(GreedySettlementOptimizer().optimize(balances)) == 4
+    assert len(transfers) == 3
+    assert (1, 4, 7.0) in transfers
+    assert _residual(balances, transfers) < 0.01
+
+
+def test_minimal_absorbs_rounding_residue():
+    # A cent of rounding left over is neither a transfer nor a blocker
+    balances = {1: 33.34, 2: -33.33, 3: -0.01, 4: 10.0, 5: -10.0}
+
+    transfers = MinimalTransfersOptimizer().optimize(balances)
+
+    assert sorted(transfers) == [(2, 1, 33.33), (5, 4, 10.0)]
+
+
+def test_falls_back_to_greedy_above_size_limit():
+    service = SettlementService(SettlementRepository(), BalanceRepository())
+    rng = random.Random(3)
+    limit = MinimalTransfersOptimizer().max_balances
+    small = _random_balances(rng, limit)
+    large = _random_balances(rng, limit + 1)
+
+    _, small_mode = service._calculate_optimal_settlements(
+        None, small, {}, SettlementMode.MINIMAL
+    )
+    settlements, large_mode = service._calculate_optimal_settlements(
+        None, large, {}, SettlementMode.MINIMAL
+    )
+
+    assert small_mode == SettlementMode.MINIMAL.value
+    assert large_mode == SettlementMode.GREEDY.value
+    assert [(s.from_user_id, s.to_user_id, s.amount) for s in settlements] == (
+        GreedySettlementOptimizer().optimize(large)
+    )
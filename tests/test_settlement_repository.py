@@ -0,0 +1,35 @@
+from app.repositories.settlement_repository import SettlementRepository
+from tests.conftest import count_queries, make_expense, make_group, make_users
+
+
+def _group_with_expenses(db, member_count, expense_count):
+    users = make_users(db, member_count)
+    group = make_group(db, users[0], users[1:])
+    for i in range(expense_count):
+        make_expense(db, group, users[i % member_count], 10.0 * member_count, users)
+    return group, users
+
+
+def test_group_net_balances(db):
+    group, (a, b, c) = _group_with_expenses(db, 3, 3)
+
+    balances = SettlementRepository().get_group_net_balances(db, group.id)
+
+    assert {user_id: round(v, 2) for user_id, v in balances.items()} == {
+        a.id: 0.0,
+        b.id: 0.0,
+        c.id: 0.0,
+    }
+
+
+def test_group_net_balances_query_count_is_constant(db):
+    repo = SettlementRepository()
+    small_id = _group_with_expenses(db, 2, 3)[0].id
+    large_id = _group_with_expenses(db, 8, 40)[0].id
+
+    with count_queries() as small_queries:
+        repo.get_group_net_balances(db, small_id)
+    with count_queries() as large_queries:
+        repo.get_group_net_balances(db, large_id)
+
+    assert len(small_queries) == len(large_queries) == 1
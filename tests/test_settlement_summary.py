@@ -0,0 +1,43 @@
+from app.models.user import User
+from tests.conftest import auth, make_group, make_users
+
+
+def test_cached_summary_shows_renamed_users(db, client):
+    a, b = make_users(db, 2)
+    group_id, a_id, b_id = make_group(db, a, [b]).id, a.id, b.id
+    response = client.post(
+        "/expenses/create/equal",
+        json={
+            "amount": 20,
+            "paid_by": a_id,
+            "group_id": group_id,
+            "participant_ids": [a_id, b_id],
+        },
+        headers=auth(a),
+    )
+    assert response.status_code == 201, response.text
+
+    first = client.get(f"/settlements/groups/{group_id}", headers=auth(a))
+    db.query(User).filter(User.id == b_id).update({"username": "renamed"})
+    db.commit()
+    second = client.get(f"/settlements/groups/{group_id}", headers=auth(a))
+
+    assert first.status_code == second.status_code == 200
+    assert second.json()["settlements"] == [
+        {
+            "from_user_id": b_id,
+            "from_username": "renamed",
+            "to_user_id": a_id,
+            "to_username": first.json()["settlements"][0]["to_username"],
+            "amount": 10.0,
+        }
+    ]
+    assert "renamed" in {row["username"] for row in second.json()["balances"]}
+
+
+def test_cache_stats_route_is_gone(db, client):
+    (a,) = make_users(db, 1)
+
+    response = client.get("/settlements/cache/stats", headers=auth(a))
+
+    assert response.status_code in (404, 405, 422)
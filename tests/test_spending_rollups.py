@@ -0,0 +1,57 @@
+from app.models.expense import Expense
+from app.models.spending_rollup import SpendingRollup, rollup_day
+from app.repositories.group_repository import GroupRepository
+from app.repositories.spending_rollup_repository import SpendingRollupRepository
+from app.services.analytics_service import AnalyticsService
+from tests.conftest import auth, make_group, make_users
+
+
+def _rollups(db):
+    return sorted(
+        (row.user_id, row.day, round(row.paid, 2), round(row.share, 2))
+        for row in db.query(SpendingRollup)
+    )
+
+
+def _create_expense(client, users, group_id):
+    response = client.post(
+        "/expenses/create/equal",
+        json={
+            "amount": 30,
+            "paid_by": users[0].id,
+            "group_id": group_id,
+            "participant_ids": [user.id for user in users],
+        },
+        headers=auth(users[0]),
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["expense"]["id"]
+
+
+def test_live_rollups_match_backfill_and_use_created_at_day(db, client):
+    users = make_users(db, 3)
+    group_id = make_group(db, users[0], users[1:]).id
+    expense_id = _create_expense(client, users, group_id)
+    _create_expense(client, users, group_id)
+
+    (created_at,) = db.query(Expense.created_at).filter_by(id=expense_id).one()
+    live = _rollups(db)
+    assert {day for _, day, _, _ in live} == {rollup_day(created_at)}
+
+    AnalyticsService(SpendingRollupRepository(), GroupRepository()).backfill_group(
+        db, group_id, chunk_size=1
+    )
+    assert _rollups(db) == live
+
+
+def test_deleting_last_expense_of_a_day_removes_its_rollup_rows(db, client):
+    users = make_users(db, 3)
+    group_id = make_group(db, users[0], users[1:]).id
+    expense_id = _create_expense(client, users, group_id)
+    assert len(_rollups(db)) == 3
+
+    response = client.delete(f"/expenses/{expense_id}", headers=auth(users[0]))
+
+    assert response.status_code in (200, 204), response.text
+    db.expire_all()
+    assert _rollups(db) == []
@@ -0,0 +1,55 @@
+"""Split creation cost against participant count.
+
+Run with ``python -m pytest -q -s tests/test_split_benchmark.py`` to print the
+timings. The assertion only covers the statement count, which must not grow
+with the number of participants; wall-clock numbers are too noisy to assert.
+"""
+
+import time
+
+from app.models.expense import ExpenseType
+from app.repositories.balance_repository import BalanceRepository
+from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.group_repository import GroupRepository
+from app.schemas.expense_schema import EqualExpenseCreate
+from app.services.expense_service import ExpenseService
+from tests.conftest import count_queries, make_group, make_users
+
+PARTICIPANT_COUNTS = (2, 10, 50, 200)
+ROUNDS = 5
+
+
+def test_split_creation_scales_with_participants(db):
+    service = ExpenseService(
+        ExpenseRepository(), GroupRepository(), BalanceRepository()
+    )
+    users = make_users(db, max(PARTICIPANT_COUNTS))
+    user_ids = [user.id for user in users]
+    group_id = make_group(db, users[0], users[1:]).id
+
+    statements, timings = {}, {}
+    for count in PARTICIPANT_COUNTS:
+        payload = EqualExpenseCreate(
+            description="dinner",
+            amount=10.0 * count,
+            paid_by=user_ids[0],
+            group_id=group_id,
+            participant_ids=user_ids[:count],
+        )
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            with count_queries() as queries:
+                service.create_expense(
+                    db, payload, ExpenseType.EQUAL, requester_id=user_ids[0]
+                )
+        timings[count] = (time.perf_counter() - started) / ROUNDS
+        statements[count] = len(queries)
+
+    print()
+    for count in PARTICIPANT_COUNTS:
+        print(
+            f"{count:>4} participants: {timings[count] * 1000:7.2f} ms, "
+            f"{statements[count]} statements"
+        )
+
+    assert len(set(statements.values())) == 1, statements